@@ -1,1071 +1,1620 @@
-#!/usr/bin/env python
-# -*- coding: utf-8 -*-
-'''
-@author: Zachary Allen
-@supervisor: Tiege McCarthy
-@function: Main method of SVD. Calls all classes and relevant functions, as well as calls for user input and outputs status messages
-'''
-
-import os
-import math
-import argparse
-import importlib
-import astropy
-from astropy import coordinates
-from astropy.coordinates import Angle
-from decimal import Decimal
-from collections import Counter
-from astropy.table import Table
-from datetime import datetime
-from ftplib import FTP_TLS
-from numerical import NumberMethods
-from geodeticData import ExtractSourceCatalogue, ExtractStationCatalogue
-from extractFile import ExtractTGZ
-from extractData import ReadNetCDF4
-from secondaryData import ToBandwiseSNR, ToTimeMJD
-from formatData import CreateTextFile
-
-number_functions  = NumberMethods()
-
-# Geodetic source and station data
-source_data = ExtractSourceCatalogue()
-station_data = ExtractStationCatalogue()
-
-# Path to folder containing text files with all current session codes
-SESSION_CODE_FILE = os.path.join(os.path.dirname(__file__), 'Session Codes')
-
-# Server containing the VgosDB's
-SERVER = 'gdc.cddis.eosdis.nasa.gov'
-
-class MainMethod:
-
-    '''
-    @__init__: MainMethod class constructor
-
-    @param self: instance variable of the class, MainMethod
-    '''
-    def __init__(self):   
-
-        # Whether or not to allow for user input
-        allow_user_input = False
-
-        # List of VGOS DB file names that have been matched to session codes
-        matched_files= []
-
-        # Program boolean checks
-        continue_application = True
-        calculate_projection = False
-
-        # Stages of program completion
-        valid_session_code_entry = False
-        server_found = False
-        valid_server_recall_entry = False
-        matched_all_session_codes = False
-        download_successful = False
-        valid_download_retry_entry = False
-        valid_continue_application_entry = False
-
-        # User entry's
-        session_code_entry = ''
-        server_recall_entry = ''
-        download_retry_entry = ''
-        continue_application_entry = ''
-
-        # List of enterred session codes
-        enterred_session_code_list = []
-
-        # Command line argument specifications contructor
-        parser = argparse.ArgumentParser(
-            prog = 'SOURCE VARIABILITY DATA',
-            usage = f'\n  python "{os.path.dirname(__file__)}" [-h] [-p] [session codes...]',
-            description = 'description: \n  SVD Takes a Geodetic VLBI session code and extracts data from the relevant vgosDB \n  into a text file.',
-            epilog = 'Thankyou for using the SVD application',
-            formatter_class = argparse.RawTextHelpFormatter,
-            exit_on_error = False
-        )
-        
-        # Adding the session code argument to the command line. If nothing is enterred, the program asks for user input
-        parser.add_argument(
-            'session_codes', 
-            nargs='?',
-            const='',
-            help = 'name of the Geodetic VLBI session of which data is to be extracted \nSVD takes between zero and infinitely many session codes as input'
-        )
-        
-        # Adding the optional projection selection argument to the command line.
-        parser.add_argument(
-            '-p',
-            '--projection', 
-            help = 'specify calculation of projcted baseline angles and lengths',
-            action= 'store_true'
-        )
-        
-        # Running the parser. If there are more than one session codes added, these will be put into the spillover list
-        args, spillover = parser.parse_known_args()
-        
-        # Creating list of user enterred session codes if they exist
-        if args.session_codes:
-            enterred_session_code_list = [args.session_codes]
-        
-        # Adding remaining session codes to the list if they exist
-        if spillover:
-            enterred_session_code_list += spillover
-        
-        # Selecting projection to be calculated if selected
-        if args.projection:
-            calculate_projection = True
-
-        # If no session codes have been enterred the program proceeds to ask for user input
-        if args.session_codes == None:
-
-            # Allowing user input
-            allow_user_input = True
-
-            print('-' * 32 + 'SOURCE VARIABILITY DATA' + '-' * 32)
-            print('Type "help" for more information or type "quit" to end this application\n')
-            print('-' * 87)
-
-            # Only displaying text explaining projections if it has not already been specified
-            if calculate_projection == False:
-                print('Note that by default, SVD will not calculate baseline projection angles or lengths as \nthe computations take significant time. To enable calculation of projections, type \n"projection" after enterring the VgosDB session code(s).\n')
-            
-            # Otherwise reminding the user that projections have been specified
-            else:
-                print('Note that SVD will calculate baseline projection angles and lengths, of which the \ncomputations will take significant time.\n')
-
-            print('Warning, SVD only accepts session codes in the VGOS format.')
-            print('To compile data for multiple VgosDB sessions, separate individual entries by a space.')
-            print('-' * 87 + '\n')
-
-            # Passing the users entry through stage one of processing.
-            while valid_session_code_entry == False and continue_application == True:
-
-                session_code_entry = input('Enter VgosDB session code(s):\n> ').lower()
-
-                # Testing if the entry is "quit"
-                if 'quit' in session_code_entry or session_code_entry == '':
-                    continue_application = False
-
-                # Testing if the entry is "help"
-                elif 'help' in session_code_entry:
-                    HelpMethod()
-
-                # Testing if the entry specified "projection"
-                elif 'projection' in session_code_entry:
-                    calculate_projection = True
-                    valid_session_code_entry = True
-
-                    # Removeing the text "projection" from the entry
-                    session_code_entry = session_code_entry.replace('projection','')
-
-                # If the entry is not "quit" or "help" the 
-                else:
-                    valid_session_code_entry = True
-
-            # Creating a list of session codes from the users entry
-            if continue_application == True:
-
-                # Splitting the entry over the spaces and removing empty entries to create a list of the selected sessions
-                enterred_session_code_list = [code for code in session_code_entry.upper().split(' ') if code != '']
-        
-        if continue_application == True:
-            
-            # Eliminating duplicate entries of enterred code list
-            enterred_session_code_list = [code for code, count in Counter(enterred_session_code_list).items() if count == 1]
-
-            # List of downloaded files
-            vgosDB_file_SVD_list = os.listdir(os.path.join(os.path.dirname(__file__), 'VgosDB'))
-
-            # Checking that the sessions VGOS DB file has not already been downloaded and extracted
-            for file in vgosDB_file_SVD_list:
-
-                # Looping through all enterred session codes
-                for enterred_session_code in enterred_session_code_list:
-
-                    # Determining if any of the enterred VgosDB codes lie in the list of files
-                    if enterred_session_code.lower() in file.lower() and file[-4:] != '.tgz': # TODO REMOVE .lower() ONCE CAPITISATION RENAME HAS WORKED
-
-                        print(f'Found match for {enterred_session_code} in VgosDB file folder')
-
-                        # Adding the file name to the list of matched files
-                        matched_files.append(file.lower())
-                                
-                        # Removing the matched code from the code_list
-                        enterred_session_code_list.remove(enterred_session_code)
-
-                    if len(enterred_session_code_list) == 0:
-                        break
-                    
-                if len(enterred_session_code_list) == 0:
-                    break
-            
-            # If all files have been already downloaded and extracted, the next stages of the program do not need to run
-            if len(enterred_session_code_list) == 0:
-                server_found = True
-                valid_server_recall_entry = True
-                matched_all_session_codes = True
-                download_successful = True
-                valid_download_retry_entry = True
-                valid_continue_application_entry = True 
-
-        # Requesting the server
-        while server_found == False and continue_application == True:
-
-            # Loading the required directory in the server
-            try:
-
-                print(f'Requesting the {SERVER} server...')
-                
-                # Requesting the server
-                ftps = FTP_TLS(host = SERVER)
-
-                # Anonymously logging into the ftp server        
-                ftps.login()
-                            
-                # Securing the data connection
-                ftps.prot_p()
-
-                # Sending a response string to the server, for all data to be converted to binary
-                ftps.sendcmd('TYPE I')
-
-                # Navigating to the directory of VgosDB's per year
-                ftps.cwd('pub/vlbi/ivsdata/vgosdb')
-                        
-                # If the server calls successfully run without error, the server is said to be found
-                server_found = True
-
-                # Finding the year in which the program is currently running
-                current_year = datetime.now().year
-                
-                # Adding missing session code files to the session code folder
-                for year in range(2023, current_year+1):
-                    
-                    session_code_file_path = os.path.join(os.path.dirname(__file__), 'Session Codes', 'session.codes.' + str(year) + '.catalogue')
-
-                    # As all the current years sessions are unlikely to be complete
-                    if year == current_year:
-                        session_code_file_path = os.path.join(os.path.dirname(__file__), 'Session Codes', 'session.codes.incomplete.' + str(year) + '.catalogue')
-                        
-                    # Checking if the years folder is incomplete
-                    if year != current_year and f'session.codes.incomplete.{year}.catalogue' in os.listdir(os.path.join(os.path.dirname(__file__), 'Session Codes')):
-                        
-                        # Removing the incomplete file
-                        os.remove(os.path.join(os.path.dirname(__file__), 'Session Codes', 'session.codes.incomplete.' + str(year) + '.catalogue'))
-                    
-                    # Determining if the session code folder for that year exists in the folder
-                    if f'session.codes.{year}.catalogue' not in os.listdir(os.path.join(os.path.dirname(__file__), 'Session Codes')):
-
-                        # Navigating to that years directory in the server
-                        ftps.cwd(str(year))
-                        
-                        # Writing an empty session code file
-                        with open(session_code_file_path, 'w') as file_write:
-                            file_write.write('')
-                        
-                        # List of files in that years directory
-                            file_list = ftps.nlst()
-                        
-                        # Opening the session code file for appending
-                        with open(session_code_file_path, 'a') as file_append:
-
-                            # Looping through all files in the list
-                            for session_code in file_list:
-                                
-                                # Making sure the session code is valid
-                                if len(session_code) >= 9 and session_code[:4] == str(year):
-
-                                    # Adding a new line if the session code is not the first one in the list
-                                    if session_code != file_list[0]:
-                                        file_append.write('\n')
-
-                                    # Appending the session code, and ommiting '.tgz' from the end of the file to get the session code
-                                    file_append.write(session_code[:-4].upper())
-
-                        # Changing the directory back from the specific year to the list of years
-                        ftps.cwd('..')
-            
-            except Exception as error:
-
-                print('~' * 87)
-                print(f'{error}!\n Internet connection failed, SVD could not request the required server.')
-                print('~' * 87)
-
-                # Only allowing user to recall the server if user input is specified
-                if allow_user_input == True:
-
-                    # Passing the users entry through stage two of processing
-                    while valid_server_recall_entry == False and continue_application == True:
-
-                        # Asking user if they want to re-request the server 
-                        server_recall_entry = input('To recall the server, type "recall", to end the application type "quit":\n>  ').lower()
-                                    
-                        # Testing if the entry is "quit"
-                        if 'quit' in server_recall_entry or server_recall_entry == '':
-                            continue_application = False
-
-                        # Testing if the entry is "help"
-                        elif 'help' in server_recall_entry:
-                            HelpMethod('4')
-
-                        # Testing if the entry is "recall"
-                        elif 'recall' in server_recall_entry:
-                            valid_server_recall_entry = True
-
-                        # Otherwise an error is thrown
-                        else:
-                            print('~' * 87)
-                            print('[Error 400] Invalid Request! Your entry is invalid.')
-                            print('~' * 87)
-
-                # If user input is not specified the program ends
-                else:
-                    continue_application = False
-
-        # Searching for a match for the enterred session codes
-        while matched_all_session_codes == False and continue_application == True:
-
-            print(f'Searching for a match for the session code(s) {MainMethod.concatList(enterred_session_code_list)}...')
-
-            # Creating list of session code catalogs loaded into SVD
-            session_code_catalogue_list = (os.listdir(SESSION_CODE_FILE))[::-1]
-            
-            # Looping through all the VgosDB's session codes in the directories to see if a match with the input is found
-            for session_code_catalogue in session_code_catalogue_list:
-                    
-                # Converting the specified session_code_catalogue ascii table to a single-column data frame
-                session_name_list = Table.read(
-                    os.path.join(SESSION_CODE_FILE, session_code_catalogue), 
-                    format='ascii.csv',
-                    delimiter = '\t',
-                    data_start= 0,
-                    names = ['VGOS DB format','Mk3 format']
-                )
-                
-                # Looping through all session codes in the list
-                for session_name_row in session_name_list:
-
-                    # Only finding a match for the VGOS DB format of session code
-                    session_name = str(session_name_row[0])
-                    
-                    # Looping through all the entered session codes
-                    for session_code in enterred_session_code_list:
-                        
-                        # Determining if any of the enterred VgosDB codes lie in that list.
-                        if session_code in session_name:
-
-                            print(f'Found match for {session_code}')
-
-                            # Extracting the year which the session comes from
-                            year = session_name[:4]
-                            
-                            # Setting the name of the downloaded file to be the same as the VgosDB name
-                            vgosDB_file_SVD_name = session_name
-                            
-                            # Setting path of the downloaded file
-                            vgosDB_file_SVD_path = os.path.join(os.path.dirname(__file__), 'VgosDB', vgosDB_file_SVD_name + '.tgz')
-
-                            # List of downloaded files
-                            vgosDB_file_SVD_list = os.listdir(os.path.join(os.path.dirname(__file__), 'VgosDB'))
-
-                            # Name of file in the server
-                            vgosDB_file_server_name = ''
-
-                            # Transforming session code to the old format if applicable and adding '.tgz' to turn into file name
-                            if int(year) <= 2022:
-                                vgosDB_file_server_name = session_name_row[1] + '.tgz'
-                            
-                            else:
-                                vgosDB_file_server_name = session_name.lower() + '.tgz'
-                            
-                            # Checking that the VgosDB has not already been downloaded
-                            if vgosDB_file_SVD_name + '.tgz' not in vgosDB_file_SVD_list and vgosDB_file_SVD_name not in vgosDB_file_SVD_list:
-                                
-                                download_successful = False
-
-                                # Checking if the VGOS DB can be downloaded without errors
-                                while download_successful == False and continue_application == True:
-                                    
-                                    # If the download has already been tried and failed, resetting
-                                    if valid_download_retry_entry == True:
-                                        valid_download_retry_entry = False
-
-                                    try: 
-                                        # Changing directory to the specified year
-                                        ftps.cwd(year)
-                                        
-                                        print(f'Downloading {session_code} as "{vgosDB_file_SVD_name}.tgz"...')
-                                        
-                                        # Downloading the VgosDB to the VgosDB directory
-                                        with open(vgosDB_file_SVD_path, 'wb') as download:
-                                            ftps.retrbinary(f"RETR {vgosDB_file_server_name}", download.write)
-                                        
-                                        # Changing the directory back from the specific year to the list of years
-                                        ftps.cwd('..')
-
-                                        download_successful = True
-
-                                    except Exception as error:
-
-                                        print('~' * 87)
-                                        print(f'{error}\n SVD failed to locate or download {vgosDB_file_SVD_name}')
-                                        print('~' * 87)
-
-                                        # Only allowing user to retry the download if user input is specified
-                                        if allow_user_input == True:
-
-                                            # Passing the users entry through stage four of processing
-                                            while valid_download_retry_entry == False and continue_application == True:
-
-                                                # Asking user if they want to re-request the server 
-                                                download_retry_entry = input('To retry the download, type "retry", to end the application type "quit":\n> ').lower()
-                                                            
-                                                # Testing if the entry is "quit"
-                                                if 'quit' in download_retry_entry or download_retry_entry == '':
-                                                    continue_application = False
-
-                                                # Testing if the entry is "help"
-                                                elif 'help' in download_retry_entry:
-                                                    HelpMethod('4')
-
-                                                # Testing if the entry is "recall"
-                                                elif 'retry' in download_retry_entry:
-                                                    print('Retrying download...')
-                                                    valid_download_retry_entry = True
-
-                                                # Otherwise an error is thrown
-                                                else:
-                                                    print('~' * 87)
-                                                    print('[Error 400] Invalid Request! Your entry is invalid.')
-                                                    print('~' * 87)
-
-                                        # If user input is not specified the program ends
-                                        else:
-                                            continue_application = False
-
-                            # Checking that the VgosDB has not already been extracted
-                            if vgosDB_file_SVD_name not in vgosDB_file_SVD_list and continue_application == True:
-                                    
-                                print(f'Extracting {vgosDB_file_SVD_name} from TGZ file format...')
-
-                                # Current .tgz file name
-                                vgosDB_tgzfile_SVD_name = vgosDB_file_server_name[:-4].upper()
-
-                                # Destination directory for extracted file
-                                vgosDB_folder_SVD_path = os.path.join(os.path.dirname(__file__), 'VgosDB')
-
-                                # Extracting the file from TGZ format into the same directory, under the same name
-                                ExtractTGZ(vgosDB_file_SVD_path, vgosDB_tgzfile_SVD_name, vgosDB_folder_SVD_path, vgosDB_file_SVD_name)
-
-                            if continue_application == True:
-
-                                # Adding the file name to the list of matched files
-                                matched_files.append(vgosDB_file_SVD_name.lower()) # TODO REMOVE .lower() ONCE CAPITISATION RENAME HAS WORKED
-                                
-                                # Removing the matched code from the code_list
-                                enterred_session_code_list.remove(session_code)
-
-                        # Determining if all the session codes have been matched
-                        if len(enterred_session_code_list) == 0 and continue_application == True:
-                            matched_all_session_codes = True
-                            break
-                        
-                        elif continue_application == False:
-                            break
-
-                    # Stopping the loop if all VgosDB's have been found
-                    if matched_all_session_codes == True or continue_application == False:
-                        break
-
-                # Stopping the loop if all VgosDB's have been found
-                if matched_all_session_codes == True or continue_application == False:
-                    break
-            
-            # Checking if all codes have been matched
-            if len(enterred_session_code_list) != 0 and continue_application == True:
-
-                print('~' * 87)
-                print(f'[Errno 2] No such file or directory! SVD could not match {MainMethod.concatList(enterred_session_code_list)}')
-                print('~' * 87)
-
-                # Only allowing the user to manually download if user input is specified
-                if allow_user_input == True:
-                            
-                    while valid_continue_application_entry == False and continue_application == True:
-                                
-                        # Asking the user if they want to continue the apllication
-                        continue_application_entry = input(f'To continue this application without these session(s) type "continue", to end the application type "quit":\n> ').lower()
-                                
-                        # Testing if the entry is "quit"
-                        if 'quit' in continue_application_entry or continue_application_entry == '':
-                            continue_application = False
-
-                        # Testing if the entry is "help"
-                        elif 'help' in continue_application_entry:
-                            HelpMethod('5')
-                                
-                        elif 'continue' in continue_application_entry:
-                            valid_continue_application_entry = True
-                            matched_all_session_codes = True
-
-                # If no user input is specified the program continues, skipping the unmatched session
-                else:
-                    matched_all_session_codes = True
-        
-        if continue_application == True:
-            
-            # Creating a text file of extracted relevant data for each sessions DB
-            for session_directory in os.scandir(os.path.join(os.path.dirname(__file__), 'VgosDB')):
-                
-                # Making sure the session_directory is actually a directory and not a file
-                if session_directory.is_dir() and session_directory.name.lower() in matched_files: # TODO REMOVE .lower() ONCE CAPITISATION RENAME HAS WORKED
-
-                    print(f'Extracting data from {session_directory.name}...')
-                    
-                    # Extracting the data from the relevant files in the sessions VgosDB
-                    extract = ReadNetCDF4(session_directory)
-                    
-                    # Scanning through all the status codes of the extracted lists to check if the data was all extracted successfully
-                    for status_code_name in extract.status_code:
-                        
-                        # An error message is displayed if a fatal error occoured in the data extraction
-                        if extract.status_code[status_code_name] == '2':
-                            print(f'Error! SVD could not extract the {status_code_name} data')
-
-                        # A warning message is displayed if some entries were errors
-                        elif extract.status_code[status_code_name] == '1':
-                            print(f'Warning! SVD detected invalid entries in the {status_code_name} data')
-                        
-                    # If a missing source was found adding it to the catalogue file
-                    if extract.status_code['missing data'] == '3' or extract.status_code['missing data'] == '5':
-                        
-                        # Only proceeding if all the data was successfully extracted
-                        if extract.status_code['missing source name'] == '0' and extract.status_code['missing source right ascension'] == '0' and extract.status_code['missing source declination'] == '0' and extract.status_code['missing source reference'] == '0':
-                            
-                            print('Formatting the missing sources...')
-
-                            # Creating list of source names that are missing
-                            missing_source_names = [name for name in extract.source_name if name not in source_data.name and name not in source_data.common]
-
-                            # Creating corresponding list of right ascension coordinates
-                            missing_source_right_ascensions = [extract.source_ra[extract.source_name.index(name)] for name in missing_source_names]
-
-                            # Creating corresponding list of declinations coordinates
-                            missing_source_declinations = [extract.source_dc[extract.source_name.index(name)] for name in missing_source_names]
-                            
-                            # Creating corresponding list of references
-                            missing_source_references = [extract.source_ref[extract.source_name.index(name)] for name in missing_source_names]
-
-                            # Opening the source text file for appending
-                            with open(os.path.join(os.path.dirname(__file__), 'geodetic.source.catalogue'), 'a') as source_file_append:
-
-                                # Appending a title line
-                                source_file_append.write(
-                                    f'* Sources used in {extract.session[9:].upper()}/{extract.session[:4]} added {datetime.now().strftime('%d/%m/%Y')}\n'
-                                )
-
-                                # Formatting the data into new lines for the geodetic source data text file
-                                for line in range(len(missing_source_names)):
-                                    
-                                    # Note that the common name will be used as the IAU name if only the common name is specified
-                                    formatted_IAU_name = str(missing_source_names[line]) + ''.join([' ' for white_space in range(8-len(str(missing_source_names[line])))])
-                                    
-                                    # Adding the common name if the source name is labelled under the common name, otherwise '$' is added
-                                    if '-' not in missing_source_names[line] and '+' not in missing_source_names[line]:
-                                        formatted_common_name = formatted_IAU_name
-
-                                    else:
-                                        formatted_common_name = '$' + ' '*7
-
-                                    # Converting right ascension from radians to hours-minutes-seconds
-                                    right_ascension_hour, right_ascension_minute, right_ascension_second = number_functions.hours_minutes_seconds(math.degrees(missing_source_right_ascensions[line]))
-
-                                    # Rounding the seconds to 6 decimal places
-                                    rounded_right_ascension_seconds = number_functions.roundNumber(right_ascension_second, 6)
-
-                                    # Formatting the right ascension coordinates
-                                    formatted_right_ascension_hour = ''.join(['0' for zeros in range(2-len(str(right_ascension_hour)))]) + str(right_ascension_hour)
-                                    formatted_right_ascension_minute = ''.join(['0' for zeros in range(2-len(str(right_ascension_minute)))]) + str(right_ascension_minute)
-                                    formatted_right_ascension_second = ''.join(['0' for zeros in range(2-len(str(int(rounded_right_ascension_seconds))))]) + str(rounded_right_ascension_seconds) + ''.join([' ' for white_space in range(8-len(str( float(Decimal(str(rounded_right_ascension_seconds)) % 1) )))])
-
-                                    # Converting declination from radians to hours-minutes-seconds
-                                    declination_degrees, declination_minute, declination_second = number_functions.degrees_minutes_seconds(math.degrees(missing_source_declinations[line]))
-                                    
-                                    # Formatting the sign of the integer degrees
-                                    if str(declination_degrees)[0] == '-': 
-                                        sign = '-'
-
-                                    # Otherwise a negative symbol is added
-                                    else:
-                                        sign = '+'
-
-                                    # Rounding the seconds to 5 decimal places
-                                    rounded_declination_seconds = number_functions.roundNumber(declination_second, 5)
-
-                                    # Formatting the declination coordinates
-                                    formatted_declination_degree = str(sign) + ''.join(['0' for zeros in range(2-len(str(abs(declination_degrees))))]) + str(abs(declination_degrees))
-                                    formatted_declination_minute = ''.join(['0' for zeros in range(2-len(str(declination_minute)))]) + str(declination_minute)
-                                    formatted_declination_second = ''.join(['0' for zeros in range(2-len(str(int(rounded_declination_seconds))))]) + str(rounded_declination_seconds) + ''.join([' ' for white_space in range(7-len(str( float(Decimal(str(rounded_declination_seconds)) % 1) )))]) 
-                                    
-                                    # Formatting the source reference
-                                    formatted_source_reference = missing_source_references[line].replace(' ','').replace('-',' ')
-
-                                    # Appending a new source line to the document
-                                    source_file_append.write(
-                                        ' ' 
-                                        + formatted_IAU_name 
-                                        + ' ' 
-                                        + formatted_common_name 
-                                        + '  ' 
-                                        + formatted_right_ascension_hour 
-                                        + ' ' 
-                                        + formatted_right_ascension_minute 
-                                        + ' ' 
-                                        + formatted_right_ascension_second 
-                                        + '     ' 
-                                        + formatted_declination_degree
-                                        + ' '
-                                        + formatted_declination_minute
-                                        + ' '
-                                        + formatted_declination_second
-                                        + ' 2000.0 0.0  '
-                                        + formatted_source_reference
-                                        + '\n'
-                                    )
-                                
-                        # If errors occoured in data extraction
-                        else:
-                            print('Error! could not formatt missing sources')
-
-                    # If a missing station was found adding it to the catalogue file
-                    if extract.status_code['missing data'] == '4' or extract.status_code['missing data'] == '5':
-                        
-                        # Only proceeding if all the data was successfully extracted
-                        if extract.status_code['missing station name'] == '0' and extract.status_code['missing station coordinate'] == '0':
-
-                            print('Formatting the missing stations...')
-
-                            # Creating list of station names that are missing
-                            missing_station_names = [name for name in extract.station_name if name not in station_data.name]
-
-                            # Creating corresponding list of station cartesian coordinates
-                            missing_station_xyz = [extract.station_xyz[extract.station_name.index(name)] for name in missing_station_names]
-
-                            # Opening the station text file for appending
-                            with open(os.path.join(os.path.dirname(__file__), 'geodetic.station.catalogue'), 'a') as station_file_append:
-
-                                # Formatting the data into new lines for the geodetic source data text file
-                                for line in range(len(missing_station_names)):
-
-                                    # Formatting the station name
-                                    formatted_name = str(missing_station_names[line]) + ''.join([' ' for white_space in range(8-len(str(missing_station_names[line])))])
-
-                                    # Extracting the individual cartesian coordinates
-                                    station_x, station_y, station_z = missing_station_xyz[line]
-
-                                    # Rounding the cartesian coordinates
-                                    rounded_station_x = number_functions.roundNumber(station_x, 4)
-                                    rounded_station_y = number_functions.roundNumber(station_y, 4)
-                                    rounded_station_z = number_functions.roundNumber(station_z, 4)
-
-                                    # Formatting the cartesian coordinates
-                                    formatted_station_x = ''.join([' ' for white_space in range(8-len(str(int(station_x))))]) + str(rounded_station_x) + ''.join(['0' for zeros in range(6-len(str( float(Decimal(str(abs(rounded_station_x))) % 1) )))])
-                                    formatted_station_y = ''.join([' ' for white_space in range(8-len(str(int(station_y))))]) + str(rounded_station_y) + ''.join(['0' for zeros in range(6-len(str( float(Decimal(str(abs(rounded_station_y))) % 1) )))])
-                                    formatted_station_z = ''.join([' ' for white_space in range(8-len(str(int(station_z))))]) + str(rounded_station_z) + ''.join(['0' for zeros in range(6-len(str( float(Decimal(str(abs(rounded_station_z))) % 1) )))])
-
-                                    # Converting the cartesian coordinates to geodetic coordinates
-                                    station_latitude, station_longitude = [float(Angle(coordinate).degree) for coordinate in coordinates.cartesian_to_spherical(*missing_station_xyz[line]) if type(coordinate) != astropy.units.quantity.Quantity]
-
-                                    # Rounding the geodetic coordinates
-                                    rounded_station_latitude = number_functions.roundNumber(station_latitude, 2)
-                                    rounded_station_longitude = number_functions.roundNumber(station_longitude, 2)
-
-                                    # Formatting the geodetic coordinates
-                                    formatted_station_latitude = ''.join([' ' for white_space in range(4-len(str(int(station_latitude))))]) + str(rounded_station_latitude) + ''.join(['0' for zeros in range(4-len(str( float(Decimal(str(abs(rounded_station_latitude))) % 1) )))])
-                                    formatted_station_longitude = ''.join([' ' for white_space in range(3-len(str(int(station_longitude))))]) + str(rounded_station_longitude) + ''.join(['0' for zeros in range(4-len(str( float(Decimal(str(abs(rounded_station_longitude))) % 1) )))])
-
-                                    # Appending a new station line to the document
-                                    station_file_append.write(
-                                        '-- '
-                                        + formatted_name
-                                        + '    '
-                                        + formatted_station_x
-                                        + '   '
-                                        + formatted_station_y
-                                        + '   '
-                                        + formatted_station_z
-                                        + '   --------  '
-                                        + formatted_station_longitude
-                                        + ' '
-                                        + formatted_station_latitude
-                                        + ' -------\n'
-                                    )
-                    
-                        # If errors occoured in data extraction
-                        else:
-                            print('Error! could not formatt missing stations')
-                    
-                    # Only calculating bandwise SNR if the bands have not already been separated
-                    if extract.mode == 'VGOS':
-
-                        print('Calculating bandwise SNR...')
-
-                        # Only proceeding if some of the required data exists
-                        if extract.status_code['signal to noise ratio (X)'] != '2' and extract.status_code['channelwise amplitude'] != '2' and extract.status_code['channelwise phase'] != '2':
-                        
-                            # Calculating a list of bandwise SNR for each observation
-                            snr = ToBandwiseSNR(
-                                extract.snr_bX,
-                                extract.chan_amp,
-                                extract.chan_phase
-                            )
-
-                            # Giving a warning message if not all values were successfully calculated
-                            if extract.status_code['signal to noise ratio (X)'] == '1' or extract.status_code['channelwise amplitude'] == '1' or extract.status_code['channelwise phase'] == '1':
-                                print('Warning! SVD detected invalid entries in the bandwise signal to noise ratio data')
-
-                        else:
-                            print('Error! insufficient data to calculate bandwise SNR')
-                    
-                    # Calculating projections only if specified
-                    if calculate_projection == True:
-                        
-                        print('Calculating projection angles and lengths...')
-
-                        # Only proceeding if some of the required data exists
-                        if extract.status_code['UTC time'] != '2' and extract.status_code['source'] != '2' and extract.status_code['baseline'] != '2':
-                            
-                            # Reimporting the FindProjection class from the secondaryData module as the geodetic text files might have been modified
-                            importlib.reload(importlib.import_module('secondaryData'))
-                            FindProjection = getattr(importlib.import_module('secondaryData'), 'FindProjection')
-
-                            # Calculating a list of projected baseline length and projected angle for each observation
-                            projection = FindProjection(
-                                extract.time_utc,
-                                extract.source,
-                                extract.baseline
-                            )
-
-                            # Giving a warning message if not all values were successfully calculated
-                            if extract.status_code['UTC time'] == '1' or extract.status_code['source'] == '1' or extract.status_code['baseline'] == '1':
-                                print('Warning! SVD detected invalid entries in the projection data')
-
-                        else:
-                            print('Error! insufficient data to calculate projections')
-
-                    print('Converting UTC time to MJD time...')
-
-                    # Only proceeding if some of the required data exists
-                    if extract.status_code['UTC time'] != '2':
-                        
-                        # Converting the UTC time into MJD time
-                        mjd = ToTimeMJD(
-                            extract.time_utc
-                        )
-
-                        # Giving a warning message if not all values were successfully calculated
-                        if extract.status_code['UTC time'] == '1':
-                            print('Warning! SVD detected invalid entries in the MJD time data')
-
-                    else:
-                        print('Error! insufficient data to convert time into MJD format')
-
-                    # Calculating the number of observations in the session
-                    observation_number = len(extract.source)
-
-                    # Creating list of data
-                    data_list = []
-
-                    # Creating header row
-                    header_row = []
-
-                    print('Formatting data...')
-                    
-                    # Formatting data into a list of lists
-                    for observation in range(observation_number):
-
-                        # Creating a new row for the data list
-                        data_row = []
-
-                        # Adding the session name
-                        try: 
-                            data_row.append(extract.session)
-
-                            # Adding the entry to the header
-                            if observation == 0:
-                                header_row.append('SESSION')
-
-                        except Exception: 
-                            pass
-                        
-                        # Adding the observation time in mjd format
-                        try: 
-                            data_row.append(mjd.time[observation])
-
-                            # Adding the entry to the header
-                            if observation == 0:
-                                header_row.append('TIME (MJD)')
-                            
-                        except Exception: 
-                            pass
-
-                        # Adding the X band observation duration
-                        try: 
-                            data_row.append(extract.duration_bX[observation])
-
-                            # Adding the entry to the header
-                            if observation == 0:
-                                header_row.append('DURATION (s)')
-
-                        except Exception: 
-                            pass
-
-                        # Adding the source observed for the observation
-                        try: 
-
-                            data_row.append(extract.source[observation])
-
-                            # Adding the entry to the header
-                            if observation == 0:
-                                header_row.append('SOURCE')
-
-                        except Exception: 
-                            pass
-                        
-                        # Adding the baseline of the observation
-                        for telescope in range(2):
-
-                            try: 
-
-                                data_row.append(extract.baseline[observation][telescope])
-
-                                # Adding the entry to the header
-                                if observation == 0:
-                                    header_row.append(f'STATION {telescope + 1}')
-
-                            except Exception: 
-                                pass
-
-                        
-                        # Adding the X band quality code
-                        try: 
-                            data_row.append(extract.qc_bX[observation])
-
-                            # Adding the entry to the header
-                            if observation == 0:
-                                if extract.mode == 'S/X':
-                                    header_row.append('QC [X]')
-                                else:
-                                    header_row.append('QC')
-
-                        except Exception: 
-                            pass
-
-                        # Adding bandwise quality code depending on the format
-                        if extract.mode == 'S/X':
-
-                            # Adding the S band quality code
-                            try: 
-                                data_row.append(extract.qc_bS[observation])
-
-                                # Adding the entry to the header
-                                if observation == 0:
-                                    header_row.append('QC [S] (s)')
-
-                            except Exception: 
-                                pass
-
-                        # Adding the X band SNR
-                        try: 
-                            data_row.append(extract.snr_bX[observation])
-
-                            # Adding the entry to the header
-                            if observation == 0:
-                                if extract.mode == 'S/X':
-                                    header_row.append('SNR [X]')
-                                else:
-                                    header_row.append('SNR [TOTAL]')
-
-                        except Exception: 
-                            pass
-
-                        # Adding bandwise quality code depending on the format
-                        if extract.mode == 'S/X':
-
-                            # Adding the S band SNR
-                            try: 
-                                data_row.append(extract.snr_bS[observation])
-
-                                # Adding the entry to the header
-                                if observation == 0:
-                                    header_row.append('SNR [S]')
-
-                            except Exception: 
-                                pass
-
-                        else:
-
-                            for band in range(4):
-
-                                # Adding the S band SNR
-                                try: 
-                                    data_row.append(snr.bandwise[observation][band])
-
-                                    # Adding the entry to the header
-                                    if observation == 0:
-                                        header_row.append(f'SNR [{['a', 'b', 'c', 'd'][band]}]')
-
-                                except Exception: 
-                                    pass
-
-                        # Adding the projections if calculated
-                        if calculate_projection == True:
-
-                            # Adding projected baseline length
-                            try: 
-                                data_row.append(projection.baseline[observation])
-
-                                # Adding the entry to the header
-                                if observation == 0:
-                                    header_row.append('BASELINE [PROJ.]')
-
-                            except Exception: 
-                                pass
-                            
-                            # Adding projected baseline angle
-                            try: 
-                                data_row.append(projection.angle[observation])
-
-                                # Adding the entry to the header
-                                if observation == 0:
-                                    header_row.append('ANGLE [PROJ.]')
-
-                            except Exception: 
-                                pass
-
-                        # Adding the data row to the data list
-                        data_list.append(data_row)
-                    
-                    print(f'Writing data from {session_directory.name} to a text file...')
-
-                    # Writing the data to a text file
-                    CreateTextFile(
-                        data_list,
-                        os.path.join(os.path.dirname(__file__), 'Extracted Data'),
-                        extract.session,
-                        header = header_row
-                    )
-                    print(f'The path to the text file is: {os.path.join(os.path.dirname(__file__), 'Extracted Data', extract.session)}')
-
-        # If the application was forceably closed
-        if continue_application == False:
-            print('Ending application...')
-
-        # Closing remark for the application
-        print('Thankyou for using the SVD application.\n')
-
-    '''
-    @concatList: returns elements in a list formatted into a string
-
-    @param self: instance variable of the class, MainMethod
-    @param file: list to be formatted
-    @return: the list as a formatted string
-    '''
-    def concatList(item_list):
-
-        item_string = ''
-
-        # Looping through all items in the string
-        for i in range(len(item_list)):
-
-            # Adding the item to the formatted string
-            item_string += str(item_list[i])
-
-            # Determining if a comma deliminator should be used between items
-            if len(item_list) > 2 and i + 2 < len(item_list):
-                item_string += ', '
-
-            # Determining if an 'and' should deliminate the items
-            elif len(item_list) >= 2 and i + 2 == len(item_list):
-                item_string += ' and '
-
-        return item_string
-    
-class HelpMethod:
-
-    '''
-    @__init__: MainMethod class constructor
-
-    @param self: instance variable of the class, HelpMethod
-    @param index: a specific index of the menu to instantly select
-    '''
-    def __init__(self, index = 0):
-
-        # Program boolean check
-        continue_to_help = True
-
-        # Displaying the opening message and allowing user input if no index selected
-        if index == 0:
-            print('-' * 39 + 'HELP MENU' + '-' * 39)
-            print('Type "1" for more information about the session code')
-            print('Type "2" for more information about the projections')
-            print('Type "3" for more information about the output')
-            print('Type "4" for more information about the CDDIS server error')
-            print('Type "5" for more information about the matching process error')
-            print('Type "quit" to close the help menu')
-            print('-' * 87)
-
-            while continue_to_help == True:
-                
-                help_menu_entry = input('help> ').lower().replace(' ','')
-
-                # Testing if the entry is "quit"
-                if 'quit' in help_menu_entry or help_menu_entry == '':
-                    continue_to_help = False
-
-                # Texting if the entry is "1", "2", "3", "4", "5" or "help" and selecting the correct output message
-                elif help_menu_entry in ["1", "2", "3", "4", "5", "help"]:
-                    print('-' * 87)
-                    print(HelpMethod.helpMessage(self, help_menu_entry))
-                    print('-' * 87)
-
-                else:
-                    print('Invalid entry')
-                    print('-' * 87)
-                    print(HelpMethod.helpMessage(self, help_menu_entry))
-                    print('-' * 87)
-
-        # If an index is specified, immediately navigate to the selected message
-        else:
-            print('-' * 87)
-            print(HelpMethod.helpMessage(self,index))
-            print('-' * 87)
-
-    '''
-    @helpMessage: returns the selected help message
-
-    @param self: instance variable of the class, HelpMethod
-    @param index: the selected index of the menu
-    @return: a help message string
-    '''
-    def helpMessage(self, index):
-    
-        # Returning the chosen help message
-        if index == "1":
-            return 'The session code is a unique identifyer of each Geodetic VLBI session. They are usually \n4 to 6 digits long, formed from an assortment of numbers and letters (e.g. "VO3012"). \nTo find a full list of all session codes, open any of the yearly catalogue files in the \nsession codes folder in the SVD application folder. The collection of characters after \nthe dash (-) in the first column of each file is a session code (e.g. from \n"20191230-B19364", "B19364" is a session code) To learn more about these sessions, \nsearch "IVS VLBI SESSIONS" followed by the session code, in your web browser. \n\nTo enter multiple session codes, separate each code by a comma "," (e.g. to enter the \ncodes "VO3012" and "B19364", type "VO3012, B19364").'
-        
-        elif index == "2":
-            return 'The calculation of projection angles and lengths for this program is a timely process, \nand can take a while to compute. By default, SVD will not compute the projections \nunless it is specified in the first user entry. To specify calculation of projections, \ntype "projection" after typing your session code(s) (e.g. for one code with projection\n type "VO3012 projection". For multiple codes with projection type \n"B19364, VO3012 projection") Note that if projection is specified, projections for all \nsessions will be calculated.'
-        
-        elif index == "3":
-            return 'The SVD application will output source variability data for each individual session \nentered, in the form of a text file. The text files cn be found in the extracted data \nfolder in the SVD application folder. Each text file is labelled under its session name \nof which the session code is the second half (after the dash). The program will notify \nthe path to the text file once it has been written so that the data may be easily\n imported for use in other applications.'
-        
-        elif index == "4":
-            return 'The server error will occur if the SVD application cannot find the server containing \nthe data for downloading, or if the SVD application cannot find the requested session \nin the server. If SVD cannot find the server, either the server is no longer \nopperational (and the SVD application will no longer be able to download files) or \nthere is no internet connection. \n\nIf SVD cannot find a file in the server, either there is no internet connection, or the \nsession name in the session code folder in the SVD application folder contains an \nincorrect session name.'
-        
-        elif index == "5":
-            return 'The matching process error will occur if SVD could not find a match for an enterred \nsession code in the session codes folder in the SVD application folder. Common causes \nof this are misspelling the session code, forgetting to place commas (,) separating \nindividual session code entries, misspelling "projection", misspelling "quit" or \nmisspelling "help".'
-        
-        else:
-            return 'To use the help menu type the number "1", "2", "3", "4" or "5" which relates to the \nparticular aspect of the application that needs a further explanation as dictated by \nthe menu. To leave the help menu and return to the application type "quit".'
-            
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Main method of SVD. Calls all classes and relevant functions, as well as calls for user input and outputs status messages
+'''
+
+import os
+import sys
+import json
+import shutil
+import argparse
+from collections import Counter
+from astropy.table import Table
+from datetime import datetime
+from concurrent.futures import as_completed
+from extractFile import ExtractTGZ
+from extractData import ObservationFilter
+from processData import ProcessSession, EXTRACTED_DATA_DIRECTORY
+from batchRun import BatchRun, BATCH_RETRIES, BATCH_BACKOFF
+from sessionState import SessionState
+from transport import FTPSTransport, MirrorTransport, HTTPSTransport, SERVER, VGOSDB_MIRROR, HTTPS_URL, HTTPS_CONNECTIONS
+from vgosDBCache import VgosDBCache, VGOSDB_CACHE_SIZE, VGOSDB_CACHE_KEEP, VGOSDB_CACHE_KEEP_OPTIONS
+from service import SVDService
+from workerPool import WorkerPool, WORKER_COUNT, READER_COUNT
+from shardRun import ShardRun
+from workQueue import WorkQueue
+from sessionCost import SessionCost
+from extractedData import ExtractedData, EXTRACTED_COLUMNS_DIRECTORY
+
+# Path to folder containing text files with all current session codes
+SESSION_CODE_FILE = os.path.join(os.path.dirname(__file__), 'Session Codes')
+
+# Options a service request can be given, which only change how the sessions of that request are processed, and whether each is followed by a value
+REQUEST_OPTIONS = {
+    '-p': False, '--projection': False,
+    '-c': True, '--chunk': True,
+    '-s': True, '--source': True,
+    '-t': True, '--station': True,
+    '--start': True, '--end': True,
+    '--min-qc': True, '--min-snr': True,
+    '-f': False, '--force': False
+}
+
+# Session code catalogues that have been read, by path, with the modification time and size they were read at, so that a service only reads a catalogue again when it changes
+session_code_catalogue_cache = {}
+
+class MainMethod:
+
+    '''
+    @__init__: MainMethod class constructor
+
+    @param self: instance variable of the class, MainMethod
+    @param argument_list: command line arguments, the arguments SVD was run with if None
+    @param session_state: SessionState of the sessions, which a service shares between its requests, opened for the run if None
+    @param session_code_list: session codes claimed from a work queue, which are run as a batch run instead of the session codes of the arguments
+    @param output_directory: path to the folder the text files are written to, the Extracted Data folder or the folder of the shard if None
+    '''
+    def __init__(self, argument_list = None, session_state = None, session_code_list = None, output_directory = None):   
+
+        # Whether or not to allow for user input
+        allow_user_input = False
+
+        # List of paths to the VgosDB's that have been matched to session codes
+        matched_files= []
+
+        # Program boolean checks
+        continue_application = True
+        calculate_projection = False
+
+        # Number of observations processed at a time, all observations of a session are processed at once if None
+        chunk_size = None
+
+        # Filter of the observations that are processed, all observations are processed if None
+        observation_filter = None
+
+        # Record of the sessions of a batch run, failed sessions only end the application if None
+        batch_run = None
+
+        # Shard of the sessions this machine processes, all the sessions are processed if None
+        shard_run = None
+
+        # State of every session that has been downloaded, extracted or processed, so that an interrupted run resumes where it stopped
+        close_session_state = session_state == None
+
+        if session_state == None:
+            session_state = SessionState()
+
+        # Record of the sessions of the run, which a service returns the outcome of
+        self.batch_run = None
+
+        # Sessions whose archive was completely downloaded but not yet extracted
+        downloaded_session_code_list = []
+
+        # Stages of program completion
+        valid_session_code_entry = False
+        server_found = False
+        valid_server_recall_entry = False
+        matched_all_session_codes = False
+        download_successful = False
+        valid_download_retry_entry = False
+        valid_continue_application_entry = False
+
+        # User entry's
+        session_code_entry = ''
+        server_recall_entry = ''
+        download_retry_entry = ''
+        continue_application_entry = ''
+
+        # List of enterred session codes
+        enterred_session_code_list = []
+
+        # Command line argument specifications contructor
+        parser = argparse.ArgumentParser(
+            prog = 'SOURCE VARIABILITY DATA',
+            usage = f'\n  python "{os.path.dirname(__file__)}" [-h] [-p] [-c CHUNK] [-s SOURCES] [-t STATIONS] [--start TIME] [--end TIME] [--min-qc QC] [--min-snr SNR] [-b] [--retries RETRIES] [--backoff SECONDS] [--strict] [-f] [--cache-size SIZE] [--cache-keep {{archive,nothing}}] [-m MIRROR] [--https [URL]] [--connections CONNECTIONS] [-w WORKERS] [--readers READERS] [--serve ADDRESS] [--shard i/N] [--balance] [--merge] [--queue QUEUE] [--convert] [--find] [session codes...]',
+            description = 'description: \n  SVD Takes a Geodetic VLBI session code and extracts data from the relevant vgosDB \n  into a text file.',
+            epilog = 'Thankyou for using the SVD application',
+            formatter_class = argparse.RawTextHelpFormatter,
+            exit_on_error = False
+        )
+        
+        # Adding the session code argument to the command line. If nothing is enterred, the program asks for user input
+        parser.add_argument(
+            'session_codes', 
+            nargs='?',
+            const='',
+            help = 'name of the Geodetic VLBI session of which data is to be extracted \nSVD takes between zero and infinitely many session codes as input'
+        )
+        
+        # Adding the optional projection selection argument to the command line.
+        parser.add_argument(
+            '-p',
+            '--projection', 
+            help = 'specify calculation of projcted baseline angles and lengths',
+            action= 'store_true'
+        )
+
+        # Adding the optional chunk size argument to the command line.
+        parser.add_argument(
+            '-c',
+            '--chunk', 
+            help = 'process sessions in chunks of CHUNK observations, so that the memory used does not \ngrow with the size of the session',
+            type = MainMethod.parsePositive,
+            metavar = 'CHUNK'
+        )
+
+        # Adding the optional observation filter arguments to the command line.
+        parser.add_argument(
+            '-s',
+            '--source', 
+            help = 'only extract observations of these sources (IAU or common names), separated by commas',
+            metavar = 'SOURCES'
+        )
+
+        parser.add_argument(
+            '-t',
+            '--station', 
+            help = 'only extract observations with either of their stations in these stations, separated by \ncommas',
+            metavar = 'STATIONS'
+        )
+
+        parser.add_argument(
+            '--start', 
+            help = 'only extract observations at or after this UTC time (e.g. 2020-01-09T18:00)',
+            metavar = 'TIME'
+        )
+
+        parser.add_argument(
+            '--end', 
+            help = 'only extract observations at or before this UTC time (e.g. 2020-01-10T06:00)',
+            metavar = 'TIME'
+        )
+
+        parser.add_argument(
+            '--min-qc', 
+            help = 'only extract observations with an X band quality code of at least QC (0 to 9)',
+            type = int,
+            metavar = 'QC'
+        )
+
+        parser.add_argument(
+            '--min-snr', 
+            help = 'only extract observations with an X band signal to noise ratio of at least SNR',
+            type = float,
+            metavar = 'SNR'
+        )
+
+        # Adding the optional batch run arguments to the command line.
+        parser.add_argument(
+            '-b',
+            '--batch', 
+            help = 'keep going when a session fails to download, extract or process, retrying failed \ndownloads, and display a summary of the sessions at the end',
+            action= 'store_true'
+        )
+
+        parser.add_argument(
+            '--retries', 
+            help = f'number of times a failed download is retried in a batch run (default {BATCH_RETRIES})',
+            type = int,
+            default = BATCH_RETRIES,
+            metavar = 'RETRIES'
+        )
+
+        parser.add_argument(
+            '--backoff', 
+            help = f'seconds waited before the first retry in a batch run, doubled for every retry \n(default {BATCH_BACKOFF})',
+            type = float,
+            default = BATCH_BACKOFF,
+            metavar = 'SECONDS'
+        )
+
+        parser.add_argument(
+            '--strict', 
+            help = 'end a batch run with a non-zero exit code if any session failed',
+            action= 'store_true'
+        )
+
+        # Adding the optional force argument to the command line.
+        parser.add_argument(
+            '-f',
+            '--force', 
+            help = 'process every session again, even if its text file was already written from the same \nVgosDB with the same options',
+            action= 'store_true'
+        )
+
+        # Adding the optional VgosDB cache arguments to the command line.
+        parser.add_argument(
+            '--cache-size', 
+            help = 'keep the archives and extracted VgosDB\'s in the VgosDB folder within SIZE bytes (e.g. \n50G), removing the least recently used sessions first',
+            type = VgosDBCache.parseSize,
+            default = VGOSDB_CACHE_SIZE,
+            metavar = 'SIZE'
+        )
+
+        parser.add_argument(
+            '--cache-keep', 
+            help = f'what is kept of a session removed from the VgosDB cache, its archive or nothing \n(default {VGOSDB_CACHE_KEEP})',
+            choices = VGOSDB_CACHE_KEEP_OPTIONS,
+            default = VGOSDB_CACHE_KEEP
+        )
+
+        # Adding the optional mirror argument to the command line.
+        parser.add_argument(
+            '-m',
+            '--mirror', 
+            help = f'list and fetch the VgosDB archives from a local mirror of the {SERVER} \nVgosDB directory (a folder of archives per year) rather than the server',
+            default = VGOSDB_MIRROR,
+            metavar = 'MIRROR'
+        )
+
+        # Adding the optional HTTPS arguments to the command line.
+        parser.add_argument(
+            '--https', 
+            help = f'download the VgosDB archives over HTTPS rather than FTPS, from URL if given \n(default {HTTPS_URL}), using the Earthdata login in the \n.netrc file',
+            nargs = '?',
+            const = HTTPS_URL,
+            metavar = 'URL'
+        )
+
+        parser.add_argument(
+            '--connections', 
+            help = f'number of connections each archive is downloaded over at once with --https \n(default {HTTPS_CONNECTIONS})',
+            type = MainMethod.parsePositive,
+            default = HTTPS_CONNECTIONS,
+            metavar = 'CONNECTIONS'
+        )
+
+        # Adding the optional worker argument to the command line.
+        parser.add_argument(
+            '-w',
+            '--workers', 
+            help = f'process WORKERS sessions at once in separate processes, which share one copy of the \nsource and station catalogues (default {WORKER_COUNT})',
+            type = MainMethod.parsePositive,
+            default = WORKER_COUNT,
+            metavar = 'WORKERS'
+        )
+
+        parser.add_argument(
+            '--readers', 
+            help = f'read the sessions in READERS separate processes, which hand the observations to the \nworkers through shared memory, unless the sessions are processed in chunks \n(default {READER_COUNT})',
+            type = MainMethod.parseNonNegative,
+            default = READER_COUNT,
+            metavar = 'READERS'
+        )
+
+        # Adding the optional service argument to the command line.
+        parser.add_argument(
+            '--serve', 
+            help = 'keep running as a service that processes the sessions of each request, keeping the \ncatalogues loaded between requests, on the port ADDRESS of localhost over HTTP if \nADDRESS is a number, otherwise on the Unix socket at the path ADDRESS',
+            metavar = 'ADDRESS'
+        )
+
+        # Adding the optional shard arguments to the command line.
+        parser.add_argument(
+            '--shard', 
+            help = 'only process the i\'th of N shards of the session codes, as a batch run, writing the \ntext files and a manifest to the folder shard-i-of-N of the Extracted Data folder. \nEvery machine given the same session codes and the same Session Codes catalogues \nassigns them to the same shards',
+            type = ShardRun.parseShard,
+            metavar = 'i/N'
+        )
+
+        # Adding the optional work queue argument to the command line.
+        parser.add_argument(
+            '--queue', 
+            help = 'share the session codes with every other SVD process run with the same QUEUE folder, \non storage they all reach, each process claiming one session at a time until every \nsession has been processed',
+            metavar = 'QUEUE'
+        )
+
+        parser.add_argument(
+            '--balance', 
+            help = 'balance the shards by the size of the archives of the sessions on the server, rather \nthan by the number of sessions',
+            action= 'store_true'
+        )
+
+        parser.add_argument(
+            '--merge', 
+            help = 'move the text files of every finished shard into the Extracted Data folder and combine \ntheir manifests into merged.manifest.json',
+            action= 'store_true'
+        )
+
+        # Adding the optional convert argument to the command line.
+        parser.add_argument(
+            '--convert', 
+            help = 'convert every text file of the Extracted Data folder that has changed since it was last \nconverted into a numpy file of its columns in the Extracted Columns folder, in WORKERS \nprocesses',
+            action= 'store_true'
+        )
+
+        # Adding the optional find argument to the command line.
+        parser.add_argument(
+            '--find', 
+            help = 'list the processed sessions that observed any of the SOURCES and any of the STATIONS, \nfrom the summaries of the sessions rather than their text files',
+            action= 'store_true'
+        )
+        
+        # Running the parser. If there are more than one session codes added, these will be put into the spillover list
+        args, spillover = parser.parse_known_args(argument_list)
+
+        # Serving requests until the service is stopped, with the options of each request applying only to that request
+        if args.serve != None:
+
+            SVDService(lambda session_list, request_argument_list: MainMethod.serveRequest(session_list, request_argument_list, session_state), args.serve).serve()
+
+            if close_session_state == True:
+                session_state.close()
+
+            return
+
+        # Merging the shards written by other runs, without processing any sessions
+        if args.merge:
+
+            try:
+                ShardRun.merge()
+
+            except ValueError as error:
+                print('~' * 87)
+                print(f'{error}!\n SVD could not merge the shards')
+                print('~' * 87)
+
+            if close_session_state == True:
+                session_state.close()
+
+            return
+
+        # Converting the text files written by earlier runs, without processing any sessions
+        if args.convert:
+
+            ExtractedData.convertDirectory(EXTRACTED_DATA_DIRECTORY, EXTRACTED_COLUMNS_DIRECTORY, args.workers)
+
+            if close_session_state == True:
+                session_state.close()
+
+            return
+
+        # Finding the sessions of the sources and stations, without processing any sessions
+        if args.find:
+
+            if args.source == None and args.station == None:
+                print('Error! the sources (-s) or stations (-t) to find the sessions of must be entered')
+
+            else:
+                MainMethod.findSessions(
+                    session_state,
+                    None if args.source == None else [source for source in args.source.split(',') if source.strip() != ''],
+                    None if args.station == None else [station for station in args.station.split(',') if station.strip() != '']
+                )
+
+            if close_session_state == True:
+                session_state.close()
+
+            return
+        
+        # Creating list of user enterred session codes if they exist
+        if args.session_codes:
+            enterred_session_code_list = [args.session_codes]
+        
+        # Adding remaining session codes to the list if they exist
+        if spillover:
+            enterred_session_code_list += spillover
+
+        # Claiming the sessions from the work queue one at a time, each processed by a run of its own
+        if args.queue != None and args.session_codes != None and session_code_list == None:
+
+            self.batch_run = MainMethod.runQueue(args.queue, enterred_session_code_list, argument_list, session_state, args.projection, args.retries, args.backoff)
+
+            if close_session_state == True:
+                session_state.close()
+
+            print('Thankyou for using the SVD application.\n')
+
+            if args.strict and len(self.batch_run.failed) != 0:
+                sys.exit(1)
+
+            return
+
+        # Running the sessions claimed from a work queue as a batch run, which are never sharded again and only end the process that claimed them through the queue
+        if session_code_list != None:
+            enterred_session_code_list = list(session_code_list)
+            args.batch = True
+            args.shard = None
+            args.strict = False
+        
+        # Selecting projection to be calculated if selected
+        if args.projection:
+            calculate_projection = True
+
+        # Selecting the chunk size if specified
+        if args.chunk != None:
+            chunk_size = args.chunk
+
+        # Creating the observation filter if any filter is specified
+        if args.source != None or args.station != None or args.start != None or args.end != None or args.min_qc != None or args.min_snr != None:
+
+            try:
+                observation_filter = ObservationFilter(
+                    sources = None if args.source == None else [source for source in args.source.split(',') if source.strip() != ''],
+                    stations = None if args.station == None else [station for station in args.station.split(',') if station.strip() != ''],
+                    start_time = args.start,
+                    end_time = args.end,
+                    minimum_qc = args.min_qc,
+                    minimum_snr = args.min_snr
+                )
+
+            # If a time could not be read the application ends
+            except ValueError:
+                print('Error! the start and end times must be UTC times in the format YYYY-MM-DDThh:mm:ss (e.g. 2020-01-09T18:00)')
+                continue_application = False
+
+        # Description of where the VgosDB archives are listed and fetched from, for the status messages
+        if args.mirror != None:
+            server_description = f'the mirror {args.mirror}'
+
+        elif args.https != None:
+            server_description = f'the {args.https} server'
+
+        else:
+            server_description = f'the {SERVER} server'
+
+        # Transport the VgosDB's are listed and fetched with, which is only opened if something needs downloading
+        transport = None
+
+        # Keeping the VgosDB folder within the size budget if one is specified
+        vgosDB_cache = VgosDBCache(session_state, args.cache_size, args.cache_keep)
+
+        # Recording the outcome of each session if a batch run is specified, which is only possible when the session codes are enterred on the command line.
+        # A shard is always a batch run, as its manifest records the outcome of each session
+        if (args.batch or args.shard != None) and args.session_codes != None:
+            batch_run = BatchRun(args.retries, args.backoff)
+
+        if args.shard != None and args.session_codes != None:
+            shard_run = ShardRun(*args.shard, balanced = args.balance)
+
+        # If no session codes have been enterred the program proceeds to ask for user input
+        if args.session_codes == None:
+
+            # Allowing user input
+            allow_user_input = True
+
+            print('-' * 32 + 'SOURCE VARIABILITY DATA' + '-' * 32)
+            print('Type "help" for more information or type "quit" to end this application\n')
+            print('-' * 87)
+
+            # Only displaying text explaining projections if it has not already been specified
+            if calculate_projection == False:
+                print('Note that by default, SVD will not calculate baseline projection angles or lengths as \nthe computations take significant time. To enable calculation of projections, type \n"projection" after enterring the VgosDB session code(s).\n')
+            
+            # Otherwise reminding the user that projections have been specified
+            else:
+                print('Note that SVD will calculate baseline projection angles and lengths, of which the \ncomputations will take significant time.\n')
+
+            print('Warning, SVD only accepts session codes in the VGOS format.')
+            print('To compile data for multiple VgosDB sessions, separate individual entries by a space.')
+            print('-' * 87 + '\n')
+
+            # Passing the users entry through stage one of processing.
+            while valid_session_code_entry == False and continue_application == True:
+
+                session_code_entry = input('Enter VgosDB session code(s):\n> ').lower()
+
+                # Testing if the entry is "quit"
+                if 'quit' in session_code_entry or session_code_entry == '':
+                    continue_application = False
+
+                # Testing if the entry is "help"
+                elif 'help' in session_code_entry:
+                    HelpMethod()
+
+                # Testing if the entry specified "projection"
+                elif 'projection' in session_code_entry:
+                    calculate_projection = True
+                    valid_session_code_entry = True
+
+                    # Removeing the text "projection" from the entry
+                    session_code_entry = session_code_entry.replace('projection','')
+
+                # If the entry is not "quit" or "help" the 
+                else:
+                    valid_session_code_entry = True
+
+            # Creating a list of session codes from the users entry
+            if continue_application == True:
+
+                # Splitting the entry over the spaces and removing empty entries to create a list of the selected sessions
+                enterred_session_code_list = [code for code in session_code_entry.upper().split(' ') if code != '']
+        
+        if continue_application == True:
+            
+            # Eliminating duplicate entries of enterred code list
+            enterred_session_code_list = [code for code, count in Counter(enterred_session_code_list).items() if count == 1]
+
+        # Keeping only the session codes of this shard, which are assigned by the session name they match so that every machine agrees on them
+        if continue_application == True and shard_run != None:
+
+            resolved_session_dictionary = MainMethod.resolveSessionCodes(enterred_session_code_list)
+
+            # Session codes that match no session are assigned by the code itself, and fail to match in their shard
+            session_name_dictionary = {code: resolved_session_dictionary[code][0] if code in resolved_session_dictionary else code for code in enterred_session_code_list}
+
+            size_dictionary = None
+
+            # Balancing the shards by the size of the archives, which every machine reads from the same server
+            if args.balance:
+
+                try:
+                    print(f'Requesting the archive sizes from {server_description}...')
+
+                    size_transport = MainMethod.connectServer(args.mirror, args.https, args.connections)
+
+                    try:
+                        size_dictionary = MainMethod.archiveSizes(size_transport, resolved_session_dictionary)
+
+                    finally:
+                        size_transport.close()
+
+                # The shards can not fall back to another assignment, as the other machines would not agree on it
+                except Exception as error:
+
+                    print('~' * 87)
+                    print(f'{error}!\n SVD could not request the archive sizes to balance the shards.')
+                    print('~' * 87)
+
+                    continue_application = False
+
+            if continue_application == True:
+
+                shard_session_list = shard_run.selectSessions(list(session_name_dictionary.values()), size_dictionary)
+
+                print(f'Shard {args.shard[0]} of {args.shard[1]} has {len(shard_session_list)} of the {len(set(session_name_dictionary.values()))} session(s)')
+
+                enterred_session_code_list = [code for code in enterred_session_code_list if session_name_dictionary[code] in shard_session_list]
+
+        if continue_application == True:
+
+            # Planning the enterred sessions from the session state database in one indexed query, rather than scanning the VgosDB folder
+            session_plan = session_state.planSessions(enterred_session_code_list)
+
+            # Session codes that have not been recorded, or whose recorded VgosDB has moved, which are looked for in the VgosDB folder
+            unrecorded_session_code_list = []
+
+            for enterred_session_code in list(enterred_session_code_list):
+
+                session_record = session_plan.get(enterred_session_code.upper(), {})
+
+                # Determining if the VgosDB was completely extracted and is still where it was extracted to
+                if session_state.hasReached(session_record, 'extracted') and os.path.isdir(session_record.get('directory_path', '')):
+
+                    print(f'Found match for {enterred_session_code} in VgosDB file folder')
+
+                    # Adding the path of the VgosDB to the list of matched files
+                    matched_files.append(session_record['directory_path'])
+
+                    # Removing the matched code from the code_list
+                    enterred_session_code_list.remove(enterred_session_code)
+
+                # Determining if the archive of the VgosDB was completely downloaded, so that it only needs extracting
+                elif session_state.hasReached(session_record, 'downloaded') and session_state.isDownloaded(session_record['session'], session_record.get('archive_path', '')):
+                    downloaded_session_code_list.append(enterred_session_code)
+
+                else:
+                    unrecorded_session_code_list.append(enterred_session_code)
+
+            # Only scanning the VgosDB folder for sessions that are not in the session state database (e.g. extracted by earlier versions of SVD)
+            if len(unrecorded_session_code_list) != 0:
+
+                # List of downloaded files
+                vgosDB_file_SVD_list = os.listdir(os.path.join(os.path.dirname(__file__), 'VgosDB'))
+
+                # Checking that the sessions VGOS DB file has not already been downloaded and extracted
+                for file in vgosDB_file_SVD_list:
+
+                    # Looping through all the unrecorded session codes
+                    for enterred_session_code in list(unrecorded_session_code_list):
+
+                        # Path to the file in the VgosDB folder
+                        file_path = os.path.join(os.path.dirname(__file__), 'VgosDB', file)
+
+                        # Determining if any of the unrecorded codes lie in the list of files, and that the VgosDB was not partly extracted.
+                        # The names are compared ignoring case, as earlier versions of SVD extracted some VgosDB's under lower case names
+                        if enterred_session_code.lower() in file.lower() and file[-4:] != '.tgz' and session_state.isExtracted(file, file_path, file_path + '.tgz'):
+
+                            print(f'Found match for {enterred_session_code} in VgosDB file folder')
+
+                            # Adding the path of the VgosDB to the list of matched files
+                            matched_files.append(file_path)
+                                    
+                            # Removing the matched code from the code lists
+                            enterred_session_code_list.remove(enterred_session_code)
+                            unrecorded_session_code_list.remove(enterred_session_code)
+
+                    if len(unrecorded_session_code_list) == 0:
+                        break
+            
+            # If all files have been already downloaded and extracted, the next stages of the program do not need to run
+            if len(enterred_session_code_list) == 0:
+                server_found = True
+                valid_server_recall_entry = True
+                matched_all_session_codes = True
+                download_successful = True
+                valid_download_retry_entry = True
+                valid_continue_application_entry = True 
+
+            # If the remaining sessions only need extracting from their downloaded archives, the server is not needed
+            elif all(session_code in downloaded_session_code_list for session_code in enterred_session_code_list):
+                print(f'Resuming {MainMethod.concatList(enterred_session_code_list)} from the downloaded archive(s)')
+                server_found = True
+                valid_server_recall_entry = True
+
+        # Number of failed requests of the server
+        server_attempts = 0
+
+        # Requesting the server
+        while server_found == False and continue_application == True:
+
+            # Loading the required directory in the server
+            try:
+
+                print(f'Requesting {server_description}...')
+                
+                # Requesting the server and navigating to the directory of VgosDB's, or opening the mirror
+                transport = MainMethod.connectServer(args.mirror, args.https, args.connections)
+                        
+                # If the server calls successfully run without error, the server is said to be found
+                server_found = True
+
+                # Finding the year in which the program is currently running
+                current_year = datetime.now().year
+                
+                # Adding missing session code files to the session code folder
+                for year in range(2023, current_year+1):
+                    
+                    session_code_file_path = os.path.join(os.path.dirname(__file__), 'Session Codes', 'session.codes.' + str(year) + '.catalogue')
+
+                    # As all the current years sessions are unlikely to be complete
+                    if year == current_year:
+                        session_code_file_path = os.path.join(os.path.dirname(__file__), 'Session Codes', 'session.codes.incomplete.' + str(year) + '.catalogue')
+                        
+                    # Checking if the years folder is incomplete
+                    if year != current_year and f'session.codes.incomplete.{year}.catalogue' in os.listdir(os.path.join(os.path.dirname(__file__), 'Session Codes')):
+                        
+                        # Removing the incomplete file
+                        os.remove(os.path.join(os.path.dirname(__file__), 'Session Codes', 'session.codes.incomplete.' + str(year) + '.catalogue'))
+                    
+                    # Determining if the session code folder for that year exists in the folder
+                    if f'session.codes.{year}.catalogue' not in os.listdir(os.path.join(os.path.dirname(__file__), 'Session Codes')):
+
+                        # Writing an empty session code file
+                        with open(session_code_file_path, 'w') as file_write:
+                            file_write.write('')
+                        
+                        # List of files in that years directory
+                        file_list = transport.listFiles(year)
+                        
+                        # Opening the session code file for appending
+                        with open(session_code_file_path, 'a') as file_append:
+
+                            # Looping through all files in the list
+                            for session_code in file_list:
+                                
+                                # Making sure the session code is valid
+                                if len(session_code) >= 9 and session_code[:4] == str(year):
+
+                                    # Adding a new line if the session code is not the first one in the list
+                                    if session_code != file_list[0]:
+                                        file_append.write('\n')
+
+                                    # Appending the session code, and ommiting '.tgz' from the end of the file to get the session code
+                                    file_append.write(session_code[:-4].upper())
+            
+            except Exception as error:
+
+                print('~' * 87)
+                print(f'{error}!\n Internet connection failed, SVD could not request the required server.')
+                print('~' * 87)
+
+                # Only allowing user to recall the server if user input is specified
+                if allow_user_input == True:
+
+                    # Passing the users entry through stage two of processing
+                    while valid_server_recall_entry == False and continue_application == True:
+
+                        # Asking user if they want to re-request the server 
+                        server_recall_entry = input('To recall the server, type "recall", to end the application type "quit":\n>  ').lower()
+                                    
+                        # Testing if the entry is "quit"
+                        if 'quit' in server_recall_entry or server_recall_entry == '':
+                            continue_application = False
+
+                        # Testing if the entry is "help"
+                        elif 'help' in server_recall_entry:
+                            HelpMethod('4')
+
+                        # Testing if the entry is "recall"
+                        elif 'recall' in server_recall_entry:
+                            valid_server_recall_entry = True
+
+                        # Otherwise an error is thrown
+                        else:
+                            print('~' * 87)
+                            print('[Error 400] Invalid Request! Your entry is invalid.')
+                            print('~' * 87)
+
+                # In a batch run the server is requested again after a wait, and if it still can not be found the sessions that need downloading are skipped
+                elif batch_run != None:
+
+                    server_attempts += 1
+
+                    if batch_run.waitToRetry(server_attempts, f'the request of {server_description}') == False:
+
+                        for session_code in enterred_session_code_list:
+                            if session_code not in downloaded_session_code_list:
+                                batch_run.recordFailure(session_code, 'server', error)
+
+                        # The sessions that have already been downloaded are still extracted from their archives and processed
+                        enterred_session_code_list = [session_code for session_code in enterred_session_code_list if session_code in downloaded_session_code_list]
+                        matched_all_session_codes = len(enterred_session_code_list) == 0
+                        break
+
+                # If user input is not specified the program ends
+                else:
+                    continue_application = False
+
+        # Searching for a match for the enterred session codes
+        while matched_all_session_codes == False and continue_application == True:
+
+            print(f'Searching for a match for the session code(s) {MainMethod.concatList(enterred_session_code_list)}...')
+
+            # Creating list of session code catalogs loaded into SVD
+            session_code_catalogue_list = sorted(os.listdir(SESSION_CODE_FILE), reverse = True)
+            
+            # Looping through all the VgosDB's session codes in the directories to see if a match with the input is found
+            for session_code_catalogue in session_code_catalogue_list:
+                    
+                # Converting the specified session_code_catalogue ascii table to a single-column data frame
+                session_name_list = MainMethod.readSessionCodeCatalogue(os.path.join(SESSION_CODE_FILE, session_code_catalogue))
+                
+                # Looping through all session codes in the list
+                for session_name_row in session_name_list:
+
+                    # Only finding a match for the VGOS DB format of session code
+                    session_name = str(session_name_row[0])
+                    
+                    # Looping through all the entered session codes
+                    for session_code in enterred_session_code_list:
+                        
+                        # Determining if any of the enterred VgosDB codes lie in that list.
+                        if session_code in session_name:
+
+                            print(f'Found match for {session_code}')
+
+                            # Extracting the year which the session comes from
+                            year = session_name[:4]
+                            
+                            # Setting the name of the downloaded file to be the same as the VgosDB name
+                            vgosDB_file_SVD_name = session_name
+                            
+                            # Setting path of the downloaded file
+                            vgosDB_file_SVD_path = os.path.join(os.path.dirname(__file__), 'VgosDB', vgosDB_file_SVD_name + '.tgz')
+
+                            # List of downloaded files
+                            vgosDB_file_SVD_list = os.listdir(os.path.join(os.path.dirname(__file__), 'VgosDB'))
+
+                            # Name of file in the server
+                            vgosDB_file_server_name = ''
+
+                            # Transforming session code to the old format if applicable and adding '.tgz' to turn into file name
+                            if int(year) <= 2022:
+                                vgosDB_file_server_name = session_name_row[1] + '.tgz'
+                            
+                            else:
+                                vgosDB_file_server_name = session_name.lower() + '.tgz'
+                            
+                            # Whether or not the session failed in a batch run, and the number of failed downloads of the session
+                            session_failed = False
+                            download_attempts = 0
+
+                            # Path to the extracted VgosDB
+                            vgosDB_directory_SVD_path = os.path.join(os.path.dirname(__file__), 'VgosDB', vgosDB_file_SVD_name)
+
+                            # Whether or not the VgosDB was completely extracted, a partly extracted VgosDB is extracted again
+                            vgosDB_extracted = session_state.isExtracted(vgosDB_file_SVD_name, vgosDB_directory_SVD_path, vgosDB_file_SVD_path)
+
+                            # Checking that the VgosDB has not already been completely downloaded, a partly downloaded archive is downloaded again
+                            if vgosDB_extracted == False and session_state.isDownloaded(vgosDB_file_SVD_name, vgosDB_file_SVD_path) == False:
+                                
+                                download_successful = False
+
+                                # Checking if the VGOS DB can be downloaded without errors
+                                while download_successful == False and continue_application == True:
+                                    
+                                    # If the download has already been tried and failed, resetting
+                                    if valid_download_retry_entry == True:
+                                        valid_download_retry_entry = False
+
+                                    try: 
+                                        print(f'Downloading {session_code} as "{vgosDB_file_SVD_name}.tgz"...')
+                                        
+                                        # Downloading the VgosDB to the VgosDB directory
+                                        transport.fetch(year, vgosDB_file_server_name, vgosDB_file_SVD_path)
+
+                                        download_successful = True
+
+                                        # Recording the complete download, so that it is not downloaded again if the run is interrupted
+                                        session_state.recordStage(
+                                            vgosDB_file_SVD_name,
+                                            'downloaded',
+                                            year = int(year),
+                                            server_name = vgosDB_file_server_name,
+                                            archive_path = vgosDB_file_SVD_path,
+                                            archive_size = os.path.getsize(vgosDB_file_SVD_path),
+                                            archive_digest = session_state.fileDigest(vgosDB_file_SVD_path)
+                                        )
+
+                                    except Exception as error:
+
+                                        print('~' * 87)
+                                        print(f'{error}\n SVD failed to locate or download {vgosDB_file_SVD_name}')
+                                        print('~' * 87)
+
+                                        # Only allowing user to retry the download if user input is specified
+                                        if allow_user_input == True:
+
+                                            # Passing the users entry through stage four of processing
+                                            while valid_download_retry_entry == False and continue_application == True:
+
+                                                # Asking user if they want to re-request the server 
+                                                download_retry_entry = input('To retry the download, type "retry", to end the application type "quit":\n> ').lower()
+                                                            
+                                                # Testing if the entry is "quit"
+                                                if 'quit' in download_retry_entry or download_retry_entry == '':
+                                                    continue_application = False
+
+                                                # Testing if the entry is "help"
+                                                elif 'help' in download_retry_entry:
+                                                    HelpMethod('4')
+
+                                                # Testing if the entry is "recall"
+                                                elif 'retry' in download_retry_entry:
+                                                    print('Retrying download...')
+                                                    valid_download_retry_entry = True
+
+                                                # Otherwise an error is thrown
+                                                else:
+                                                    print('~' * 87)
+                                                    print('[Error 400] Invalid Request! Your entry is invalid.')
+                                                    print('~' * 87)
+
+                                        # In a batch run the download is retried after a wait, and if it keeps failing the session is skipped
+                                        elif batch_run != None:
+
+                                            download_attempts += 1
+
+                                            # Removing the partly downloaded file, so that it is not mistaken for a complete download
+                                            if os.path.exists(vgosDB_file_SVD_path):
+                                                os.remove(vgosDB_file_SVD_path)
+
+                                            if batch_run.waitToRetry(download_attempts, f'the download of {vgosDB_file_SVD_name}') == False:
+                                                batch_run.recordFailure(vgosDB_file_SVD_name, 'download', error)
+                                                session_state.recordFailure(vgosDB_file_SVD_name, 'download', error)
+                                                session_failed = True
+
+                                            # Requesting the server again, as the failed download may have left the connection in another directory or closed
+                                            try:
+                                                transport.close()
+                                                transport = MainMethod.connectServer(args.mirror, args.https, args.connections)
+
+                                            except Exception:
+                                                pass
+
+                                            if session_failed == True:
+                                                break
+
+                                        # If user input is not specified the program ends
+                                        else:
+                                            continue_application = False
+
+                            # Checking that the VgosDB has not already been extracted
+                            if vgosDB_extracted == False and continue_application == True and session_failed == False:
+                                    
+                                print(f'Extracting {vgosDB_file_SVD_name} from TGZ file format...')
+
+                                # Current .tgz file name
+                                vgosDB_tgzfile_SVD_name = vgosDB_file_server_name[:-4].upper()
+
+                                # Destination directory for extracted file
+                                vgosDB_folder_SVD_path = os.path.join(os.path.dirname(__file__), 'VgosDB')
+
+                                try:
+                                    # Removing what an interrupted extraction left behind, under either name
+                                    for partial_directory_name in [vgosDB_tgzfile_SVD_name, vgosDB_file_SVD_name]:
+                                        if os.path.isdir(os.path.join(vgosDB_folder_SVD_path, partial_directory_name)):
+                                            shutil.rmtree(os.path.join(vgosDB_folder_SVD_path, partial_directory_name))
+
+                                    # Extracting the file from TGZ format into the same directory, under the same name
+                                    ExtractTGZ(vgosDB_file_SVD_path, vgosDB_tgzfile_SVD_name, vgosDB_folder_SVD_path, vgosDB_file_SVD_name, vgosDB_cache.keepArchive())
+
+                                    # Recording the complete extraction
+                                    extracted_digest, directory_size = session_state.directoryDigest(vgosDB_directory_SVD_path)
+
+                                    session_state.recordStage(
+                                        vgosDB_file_SVD_name,
+                                        'extracted',
+                                        directory_path = vgosDB_directory_SVD_path,
+                                        directory_size = directory_size,
+                                        extracted_digest = extracted_digest
+                                    )
+
+                                    # Making room for the session by removing least recently used sessions that this run does not need
+                                    vgosDB_cache.enforce([os.path.basename(path) for path in matched_files] + [vgosDB_file_SVD_name])
+
+                                # Only a batch run carries on without the session
+                                except Exception as error:
+
+                                    session_state.recordFailure(vgosDB_file_SVD_name, 'extract', error)
+
+                                    if batch_run == None:
+                                        raise
+
+                                    batch_run.recordFailure(vgosDB_file_SVD_name, 'extract', error)
+                                    session_failed = True
+
+                            if continue_application == True:
+
+                                # Adding the path of the VgosDB to the list of matched files, unless the session failed in a batch run
+                                if session_failed == False:
+                                    matched_files.append(vgosDB_directory_SVD_path)
+                                
+                                # Removing the matched code from the code_list
+                                enterred_session_code_list.remove(session_code)
+
+                        # Determining if all the session codes have been matched
+                        if len(enterred_session_code_list) == 0 and continue_application == True:
+                            matched_all_session_codes = True
+                            break
+                        
+                        elif continue_application == False:
+                            break
+
+                    # Stopping the loop if all VgosDB's have been found
+                    if matched_all_session_codes == True or continue_application == False:
+                        break
+
+                # Stopping the loop if all VgosDB's have been found
+                if matched_all_session_codes == True or continue_application == False:
+                    break
+            
+            # Checking if all codes have been matched
+            if len(enterred_session_code_list) != 0 and continue_application == True:
+
+                print('~' * 87)
+                print(f'[Errno 2] No such file or directory! SVD could not match {MainMethod.concatList(enterred_session_code_list)}')
+                print('~' * 87)
+
+                # Only allowing the user to manually download if user input is specified
+                if allow_user_input == True:
+                            
+                    while valid_continue_application_entry == False and continue_application == True:
+                                
+                        # Asking the user if they want to continue the apllication
+                        continue_application_entry = input(f'To continue this application without these session(s) type "continue", to end the application type "quit":\n> ').lower()
+                                
+                        # Testing if the entry is "quit"
+                        if 'quit' in continue_application_entry or continue_application_entry == '':
+                            continue_application = False
+
+                        # Testing if the entry is "help"
+                        elif 'help' in continue_application_entry:
+                            HelpMethod('5')
+                                
+                        elif 'continue' in continue_application_entry:
+                            valid_continue_application_entry = True
+                            matched_all_session_codes = True
+
+                # If no user input is specified the program continues, skipping the unmatched session
+                else:
+                    matched_all_session_codes = True
+
+                    # Recording the unmatched sessions as failed in a batch run
+                    if batch_run != None:
+                        for session_code in enterred_session_code_list:
+                            batch_run.recordFailure(session_code, 'match', 'No matching session name in the session codes folder')
+        
+        if continue_application == True:
+
+            # Digest of the options that change the text files, a session is only processed again if they change
+            options_digest = session_state.optionsDigest({
+                'projection': calculate_projection,
+                'chunk': chunk_size,
+                'filter': None if observation_filter == None else [args.source, args.station, args.start, args.end, args.min_qc, args.min_snr]
+            })
+            
+            # Paths to the VgosDB's to process, each VgosDB only once
+            session_directory_path_list = list(dict.fromkeys(matched_files))
+
+            # Folder the text files are written to, which is the folder of the shard if the sessions are sharded
+            if output_directory == None:
+                output_directory = EXTRACTED_DATA_DIRECTORY if shard_run == None else shard_run.directory
+
+            # Processing the sessions in worker processes if more than one worker or any readers are specified and there is more than one session
+            worker_pool = None
+
+            if (args.workers > 1 or args.readers > 0) and len(session_directory_path_list) > 1:
+                worker_pool = WorkerPool(min(args.workers, len(session_directory_path_list)), min(args.readers, len(session_directory_path_list)))
+
+                # Handing the longest sessions to the workers first, so that no worker is left with a long session once the others have finished
+                session_directory_path_list = SessionCost(session_state, calculate_projection, options_digest).order(session_directory_path_list)
+
+            # Name and path of the session each worker process is processing
+            worker_session_dictionary = {}
+
+            # Creating a text file of extracted relevant data for each sessions DB
+            for session_index, session_directory_path in enumerate(session_directory_path_list):
+
+                # Name of the session, which is the name of its VgosDB
+                session_name = os.path.basename(session_directory_path)
+
+                # Keeping the VgosDB cache within its budget, only removing sessions that have already been processed or are not part of this run.
+                # Sessions handed to the workers are only processed later, so they stay in the cache until all sessions are processed
+                if worker_pool == None:
+                    vgosDB_cache.enforce([os.path.basename(path) for path in session_directory_path_list[session_index:]])
+
+                else:
+                    vgosDB_cache.enforce([os.path.basename(path) for path in session_directory_path_list])
+
+                # Marking the session as the most recently used in the VgosDB cache
+                session_state.recordUse(session_name)
+
+                # Skipping the session if its text file was already written from the same VgosDB with the same options and has not changed since
+                if args.force == False and session_state.isWritten(session_name, session_directory_path, options_digest):
+
+                    print(f'{session_name} was already processed with the same options, the path to the text file is: {session_state.getRecord(session_name)["text_file_path"]}')
+
+                    if batch_run != None:
+                        batch_run.recordSuccess(session_name)
+
+                    continue
+
+                # Handing the session to the next free worker
+                if worker_pool != None:
+                    worker_session_dictionary[worker_pool.submit(session_directory_path, calculate_projection, chunk_size, observation_filter, output_directory)] = (session_name, session_directory_path)
+                    continue
+
+                try:
+                    # Extracting, calculating and writing the data of the session
+                    session = ProcessSession(session_directory_path, calculate_projection, chunk_size, observation_filter, output_directory = output_directory)
+
+                    MainMethod.recordProcessed(session_state, session_name, session_directory_path, options_digest, session, calculate_projection)
+
+                # Only a batch run carries on to the next session
+                except Exception as error:
+
+                    session_state.recordFailure(session_name, 'process', error)
+
+                    if batch_run == None:
+                        raise
+
+                    batch_run.recordFailure(session_name, 'process', error)
+
+                else:
+                    if batch_run != None:
+                        batch_run.recordSuccess(session_name)
+
+            # Recording each session processed by the workers as it finishes
+            if worker_pool != None:
+
+                try:
+                    for worker_future in as_completed(worker_session_dictionary):
+
+                        session_name, session_directory_path = worker_session_dictionary[worker_future]
+
+                        try:
+                            MainMethod.recordProcessed(session_state, session_name, session_directory_path, options_digest, worker_future.result(), calculate_projection)
+
+                        # Only a batch run carries on to the next session
+                        except Exception as error:
+
+                            session_state.recordFailure(session_name, 'process', error)
+
+                            if batch_run == None:
+                                raise
+
+                            batch_run.recordFailure(session_name, 'process', error)
+
+                        else:
+                            if batch_run != None:
+                                batch_run.recordSuccess(session_name)
+
+                finally:
+                    worker_pool.close()
+
+            # Bringing the VgosDB cache within its budget now that the sessions of this run are processed
+            vgosDB_cache.enforce()
+
+            # Writing the manifest of the shard for the merge
+            if shard_run != None:
+                shard_run.writeManifest(MainMethod.sessionOutcomes(batch_run, session_state))
+
+        # Closing the connections to the server
+        if transport != None:
+            transport.close()
+
+        # If the application was forceably closed
+        if continue_application == False:
+            print('Ending application...')
+
+        # Displaying the outcome of each session of a batch run
+        if batch_run != None:
+            batch_run.printSummary()
+
+        self.batch_run = batch_run
+
+        if close_session_state == True:
+            session_state.close()
+
+        # Closing remark for the application
+        print('Thankyou for using the SVD application.\n')
+
+        # Ending a batch run with a non-zero exit code if specified and a session failed
+        if batch_run != None and args.strict and len(batch_run.failed) != 0:
+            sys.exit(1)
+
+    '''
+    @parsePositive: reads a whole number of at least 1 from the command line
+
+    @param number: the number as text
+    @return: the number
+    '''
+    def parsePositive(number):
+
+        if int(number) < 1:
+            raise ValueError(f'{number} is not a whole number of at least 1')
+
+        return int(number)
+
+    '''
+    @parseNonNegative: reads a whole number of at least 0 from the command line
+
+    @param number: the number as text
+    @return: the number
+    '''
+    def parseNonNegative(number):
+
+        if int(number) < 0:
+            raise ValueError(f'{number} is not a whole number of at least 0')
+
+        return int(number)
+
+    '''
+    @connectServer: requests the server, logs in and navigates to the directory of VgosDB's, or opens the local mirror if one is specified
+
+    @param mirror_path: path to a local mirror of the VgosDB directory of the server, the server is requested if None
+    @param https_url: URL of the VgosDB directory of the server over HTTPS, FTPS is used if None
+    @param connections: number of connections each archive is downloaded over at once over HTTPS
+    @return: the transport the VgosDB's are listed and fetched with
+    '''
+    def connectServer(mirror_path = None, https_url = None, connections = HTTPS_CONNECTIONS):
+
+        if mirror_path != None:
+            return MirrorTransport(mirror_path)
+
+        if https_url != None:
+            return HTTPSTransport(https_url, connections)
+
+        return FTPSTransport()
+
+    '''
+    @recordProcessed: records a processed session, and the text file if one was written
+
+    @param session_state: SessionState of the sessions
+    @param session_name: name of the session
+    @param session_directory_path: path to the VgosDB of the session
+    @param options_digest: digest of the options the session was processed with
+    @param session: ProcessSession of the session
+    @param calculate_projection: whether or not projections were calculated, which is recorded with the time the session took
+    '''
+    def recordProcessed(session_state, session_name, session_directory_path, options_digest, session, calculate_projection = False):
+
+        session_state.recordStage(
+            session_name,
+            'processed',
+            options_digest = options_digest,
+            processed_digest = session_state.directoryDigest(session_directory_path)[0],
+            mode = session.mode,
+            observations = session.observations,
+            status_codes = json.dumps(session.status_code),
+            projection = int(calculate_projection),
+            process_seconds = session.seconds
+        )
+
+        # Recording the summary of the session, so that the sessions of a source or station are found without reading their text files.
+        # A session processed with a filter has no summary, which keeps the summary of when it was last processed without one
+        if session.summary != None:
+            session_state.recordSummary(session_name, session.summary)
+
+        if session.path != '':
+            session_state.recordStage(
+                session_name,
+                'written',
+                text_file_path = session.path,
+                text_file_size = os.path.getsize(session.path),
+                text_file_digest = session_state.fileDigest(session.path)
+            )
+
+    '''
+    @findSessions: lists the processed sessions that observed any of the sources and any of the stations, from their summaries
+
+    @param session_state: SessionState of the sessions
+    @param sources: source names (IAU or common names), sessions are not selected by source if None
+    @param stations: station names, sessions are not selected by station if None
+    @return: list of the summaries of the sessions, from the earliest to the latest
+    '''
+    def findSessions(session_state, sources = None, stations = None):
+
+        # Matching the names in the same way as the observation filter, including the other name of each source in the catalogue
+        observation_filter = ObservationFilter(sources = sources, stations = stations)
+
+        summary_list = session_state.findSessions(observation_filter.sources, observation_filter.stations)
+
+        for summary in summary_list:
+
+            # Number of observations of each of the sources in the session
+            source_counts = ''.join(f', {count} of {source}' for source, count in summary['sources'].items() if observation_filter.sources != None and source in observation_filter.sources)
+
+            mjd_span = 'MJD unknown' if summary['mjd_start'] == None else f'MJD {summary["mjd_start"]:.6f} to {summary["mjd_end"]:.6f}'
+
+            print(f'{summary["session"]} ({summary["mode"]}) {mjd_span}, {summary["observations"]} observations{source_counts}')
+
+        print(f'{len(summary_list)} session(s) found')
+
+        return summary_list
+
+    '''
+    @readSessionCodeCatalogue: reads a session code catalogue, only reading it again if it has changed since it was last read
+
+    @param session_code_catalogue_path: path to the session code catalogue
+    @return: table of the session names in the VGOS DB and Mk3 formats
+    '''
+    def readSessionCodeCatalogue(session_code_catalogue_path):
+
+        catalogue_stat = os.stat(session_code_catalogue_path)
+        catalogue_version = (catalogue_stat.st_mtime_ns, catalogue_stat.st_size)
+
+        cached_catalogue = session_code_catalogue_cache.get(session_code_catalogue_path)
+
+        if cached_catalogue != None and cached_catalogue[0] == catalogue_version:
+            return cached_catalogue[1]
+
+        session_name_list = Table.read(
+            session_code_catalogue_path, 
+            format='ascii.csv',
+            delimiter = '\t',
+            data_start= 0,
+            names = ['VGOS DB format','Mk3 format']
+        )
+
+        session_code_catalogue_cache[session_code_catalogue_path] = (catalogue_version, session_name_list)
+
+        return session_name_list
+
+    '''
+    @serveRequest: processes the sessions of a service request as a batch run, so that a failed session is returned rather than ending the service
+
+    @param session_list: session codes of the request
+    @param argument_list: command line arguments of the request
+    @param session_state: SessionState of the service
+    @return: the text file, observing mode, number of observations and status codes of each completed session, and the stage and error of each failed session
+    '''
+    def serveRequest(session_list, argument_list, session_state):
+
+        # Only accepting the options of REQUEST_OPTIONS, as every other option changes the service itself or starts another kind of run
+        # (e.g. --serve, --queue, --shard, --merge, --convert, --workers, --cache-size or --mirror)
+        argument_index = 0
+
+        while argument_index < len(argument_list):
+
+            argument = argument_list[argument_index]
+            option = argument.split('=', 1)[0]
+
+            # Short options are followed by their value without a space (e.g. -c50), short options without a value must be entered on their own
+            if option[:1] == '-' and option[:2] != '--' and REQUEST_OPTIONS.get(option[:2]) == True:
+                option = option[:2]
+
+            if option not in REQUEST_OPTIONS:
+                raise ValueError(f'{argument} can not be given to a request, the options of a request are {", ".join(REQUEST_OPTIONS)}')
+
+            # Skipping the value of the option, when it is the next argument
+            if REQUEST_OPTIONS[option] == True and argument == option:
+                argument_index += 1
+
+            argument_index += 1
+
+        # Session codes come first, as an option that takes an optional value would otherwise take the first session code
+        application = MainMethod(session_list + argument_list + ['--batch'], session_state)
+
+        return MainMethod.sessionOutcomes(application.batch_run, session_state)
+
+    '''
+    @runQueue: claims sessions from a work queue and processes each with a batch run of its own, until every session of the queue has been processed
+
+    @param queue_directory: path to the folder of the work queue
+    @param session_code_list: session codes of the run
+    @param argument_list: command line arguments of the run, the arguments SVD was run with if None
+    @param session_state: SessionState of the sessions
+    @param calculate_projection: whether or not projections are calculated, which orders the sessions by how long they are estimated to take
+    @param retries: number of times a failed download or server request is retried
+    @param backoff: seconds waited before the first retry
+    @return: BatchRun of the sessions this process processed
+    '''
+    def runQueue(queue_directory, session_code_list, argument_list, session_state, calculate_projection = False, retries = BATCH_RETRIES, backoff = BATCH_BACKOFF):
+
+        batch_run = BatchRun(retries, backoff)
+
+        # Eliminating duplicate entries of the code list, as a run does
+        session_code_list = [code for code, count in Counter(session_code_list).items() if count == 1]
+
+        # Sessions are queued by the session name they match, so that every process queues the same session under the same name
+        resolved_session_dictionary = MainMethod.resolveSessionCodes(session_code_list)
+
+        session_code_dictionary = {}
+
+        for session_code in session_code_list:
+            session_code_dictionary.setdefault(resolved_session_dictionary[session_code][0] if session_code in resolved_session_dictionary else session_code, session_code)
+
+        work_queue = WorkQueue(queue_directory)
+
+        print(f'Sharing {len(session_code_dictionary)} session(s) through the work queue {queue_directory} as {work_queue.worker}')
+
+        # Claiming the longest sessions first, so that no process is left with a long session once the others have finished
+        outcome_dictionary = work_queue.run(
+            SessionCost(session_state, calculate_projection).order(list(session_code_dictionary)),
+            lambda session, staging_directory: MainMethod.processQueued(session_code_dictionary[session], staging_directory, argument_list, session_state)
+        )
+
+        for session, outcome in outcome_dictionary.items():
+
+            if 'error' in outcome:
+                batch_run.recordFailure(session, outcome['stage'], outcome['error'])
+                continue
+
+            batch_run.recordSuccess(session)
+
+            # Recording where the text file was moved to, so that the session is not processed again by a later run
+            if outcome['text_file_path'] != None and session_state.getRecord(session).get('text_file_path') != outcome['text_file_path']:
+                session_state.recordStage(
+                    session,
+                    'written',
+                    text_file_path = outcome['text_file_path'],
+                    text_file_size = os.path.getsize(outcome['text_file_path']),
+                    text_file_digest = session_state.fileDigest(outcome['text_file_path'])
+                )
+
+        batch_run.printSummary()
+
+        return batch_run
+
+    '''
+    @processQueued: processes a session claimed from a work queue with a batch run of its own
+
+    @param session_code: session code of the session
+    @param staging_directory: path to the folder the text file is written to until it is moved into place
+    @param argument_list: command line arguments of the run
+    @param session_state: SessionState of the sessions
+    @return: the text file, observing mode, number of observations and status codes of the session if it completed, otherwise the stage and error it failed with
+    '''
+    def processQueued(session_code, staging_directory, argument_list, session_state):
+
+        try:
+            outcome_dictionary = MainMethod.sessionOutcomes(MainMethod(argument_list, session_state, [session_code], staging_directory).batch_run, session_state)
+
+        # A session that ends the run (e.g. with an error that is not recorded by the batch run) is recorded as failed rather than ending the process
+        except Exception as error:
+            return {'stage': 'process', 'error': str(error)}
+
+        for outcome in outcome_dictionary['completed'].values():
+            return outcome
+
+        for outcome in outcome_dictionary['failed'].values():
+            return outcome
+
+        return {'stage': 'match', 'error': f'{session_code} was not processed'}
+
+    '''
+    @sessionOutcomes: grabs the outcome of each session of a batch run
+
+    @param batch_run: BatchRun of the sessions
+    @param session_state: SessionState of the sessions
+    @return: the text file, observing mode, number of observations and status codes of each completed session, and the stage and error of each failed session
+    '''
+    def sessionOutcomes(batch_run, session_state):
+
+        outcome_dictionary = {'completed': {}, 'failed': {}}
+
+        for session in batch_run.succeeded:
+
+            session_record = session_state.getRecord(session)
+
+            outcome_dictionary['completed'][session] = {
+                'text_file_path': session_record.get('text_file_path'),
+                'mode': session_record.get('mode'),
+                'observations': session_record.get('observations'),
+                'status_codes': json.loads(session_record['status_codes']) if 'status_codes' in session_record else None
+            }
+
+        for session, (stage, error) in batch_run.failed.items():
+            outcome_dictionary['failed'][session] = {'stage': stage, 'error': error}
+
+        return outcome_dictionary
+
+    '''
+    @resolveSessionCodes: matches session codes to the sessions of the session code catalogues, in the same order as they are searched for a match.
+        Codes that are a whole session code are matched from an index of the catalogues, so that the codes of a large run are not each compared to every session
+
+    @param session_code_list: list of session codes
+    @return: dictionary of the matched session codes to the name of their session and the name of its archive in the server
+    '''
+    def resolveSessionCodes(session_code_list):
+
+        resolved_session_dictionary = {}
+
+        # First session of each whole session code, and every session in the order they are searched
+        session_code_index = {}
+        session_row_list = []
+
+        # Searching the catalogues in sorted order, as the order os.listdir lists them in differs between file systems and machines
+        for session_code_catalogue in sorted(os.listdir(SESSION_CODE_FILE), reverse = True):
+            for session_name_row in MainMethod.readSessionCodeCatalogue(os.path.join(SESSION_CODE_FILE, session_code_catalogue)):
+
+                session_name = str(session_name_row[0])
+
+                # Skipping lines that are not sessions (e.g. the README of the folder)
+                if session_name[:4].isdigit() == False:
+                    continue
+
+                # Transforming the session code to the old format if applicable and adding '.tgz' to turn it into the file name
+                session_row = (session_name, str(session_name_row[1]) + '.tgz' if int(session_name[:4]) <= 2022 else session_name.lower() + '.tgz')
+
+                session_code_index.setdefault(session_name.partition('-')[2], session_row)
+                session_row_list.append(session_row)
+
+        for session_code in session_code_list:
+
+            if session_code in session_code_index:
+                resolved_session_dictionary[session_code] = session_code_index[session_code]
+                continue
+
+            for session_row in session_row_list:
+                if session_code in session_row[0]:
+                    resolved_session_dictionary[session_code] = session_row
+                    break
+
+        return resolved_session_dictionary
+
+    '''
+    @archiveSizes: finds the size of the archive of each session in the server, listing each year once
+
+    @param transport: the transport the VgosDB's are listed and fetched with
+    @param resolved_session_dictionary: dictionary of session codes to the name of their session and the name of its archive in the server, from resolveSessionCodes
+    @return: dictionary of the names of the sessions that were found to the size of their archive in bytes
+    '''
+    def archiveSizes(transport, resolved_session_dictionary):
+
+        # Sessions of each year by the name of their archive
+        year_dictionary = {}
+
+        for session_name, server_file_name in resolved_session_dictionary.values():
+            year_dictionary.setdefault(session_name[:4], {})[server_file_name] = session_name
+
+        size_dictionary = {}
+
+        for year, session_dictionary in sorted(year_dictionary.items()):
+            for server_file_name, archive_size in transport.archiveSizes(year, list(session_dictionary)).items():
+                size_dictionary[session_dictionary[server_file_name]] = archive_size
+
+        return size_dictionary
+
+    '''
+    @concatList: returns elements in a list formatted into a string
+
+    @param self: instance variable of the class, MainMethod
+    @param file: list to be formatted
+    @return: the list as a formatted string
+    '''
+    def concatList(item_list):
+
+        item_string = ''
+
+        # Looping through all items in the string
+        for i in range(len(item_list)):
+
+            # Adding the item to the formatted string
+            item_string += str(item_list[i])
+
+            # Determining if a comma deliminator should be used between items
+            if len(item_list) > 2 and i + 2 < len(item_list):
+                item_string += ', '
+
+            # Determining if an 'and' should deliminate the items
+            elif len(item_list) >= 2 and i + 2 == len(item_list):
+                item_string += ' and '
+
+        return item_string
+    
+class HelpMethod:
+
+    '''
+    @__init__: MainMethod class constructor
+
+    @param self: instance variable of the class, HelpMethod
+    @param index: a specific index of the menu to instantly select
+    '''
+    def __init__(self, index = 0):
+
+        # Program boolean check
+        continue_to_help = True
+
+        # Displaying the opening message and allowing user input if no index selected
+        if index == 0:
+            print('-' * 39 + 'HELP MENU' + '-' * 39)
+            print('Type "1" for more information about the session code')
+            print('Type "2" for more information about the projections')
+            print('Type "3" for more information about the output')
+            print('Type "4" for more information about the CDDIS server error')
+            print('Type "5" for more information about the matching process error')
+            print('Type "quit" to close the help menu')
+            print('-' * 87)
+
+            while continue_to_help == True:
+                
+                help_menu_entry = input('help> ').lower().replace(' ','')
+
+                # Testing if the entry is "quit"
+                if 'quit' in help_menu_entry or help_menu_entry == '':
+                    continue_to_help = False
+
+                # Texting if the entry is "1", "2", "3", "4", "5" or "help" and selecting the correct output message
+                elif help_menu_entry in ["1", "2", "3", "4", "5", "help"]:
+                    print('-' * 87)
+                    print(HelpMethod.helpMessage(self, help_menu_entry))
+                    print('-' * 87)
+
+                else:
+                    print('Invalid entry')
+                    print('-' * 87)
+                    print(HelpMethod.helpMessage(self, help_menu_entry))
+                    print('-' * 87)
+
+        # If an index is specified, immediately navigate to the selected message
+        else:
+            print('-' * 87)
+            print(HelpMethod.helpMessage(self,index))
+            print('-' * 87)
+
+    '''
+    @helpMessage: returns the selected help message
+
+    @param self: instance variable of the class, HelpMethod
+    @param index: the selected index of the menu
+    @return: a help message string
+    '''
+    def helpMessage(self, index):
+    
+        # Returning the chosen help message
+        if index == "1":
+            return 'The session code is a unique identifyer of each Geodetic VLBI session. They are usually \n4 to 6 digits long, formed from an assortment of numbers and letters (e.g. "VO3012"). \nTo find a full list of all session codes, open any of the yearly catalogue files in the \nsession codes folder in the SVD application folder. The collection of characters after \nthe dash (-) in the first column of each file is a session code (e.g. from \n"20191230-B19364", "B19364" is a session code) To learn more about these sessions, \nsearch "IVS VLBI SESSIONS" followed by the session code, in your web browser. \n\nTo enter multiple session codes, separate each code by a comma "," (e.g. to enter the \ncodes "VO3012" and "B19364", type "VO3012, B19364").'
+        
+        elif index == "2":
+            return 'The calculation of projection angles and lengths for this program is a timely process, \nand can take a while to compute. By default, SVD will not compute the projections \nunless it is specified in the first user entry. To specify calculation of projections, \ntype "projection" after typing your session code(s) (e.g. for one code with projection\n type "VO3012 projection". For multiple codes with projection type \n"B19364, VO3012 projection") Note that if projection is specified, projections for all \nsessions will be calculated.'
+        
+        elif index == "3":
+            return 'The SVD application will output source variability data for each individual session \nentered, in the form of a text file. The text files cn be found in the extracted data \nfolder in the SVD application folder. Each text file is labelled under its session name \nof which the session code is the second half (after the dash). The program will notify \nthe path to the text file once it has been written so that the data may be easily\n imported for use in other applications.'
+        
+        elif index == "4":
+            return 'The server error will occur if the SVD application cannot find the server containing \nthe data for downloading, or if the SVD application cannot find the requested session \nin the server. If SVD cannot find the server, either the server is no longer \nopperational (and the SVD application will no longer be able to download files) or \nthere is no internet connection. \n\nIf SVD cannot find a file in the server, either there is no internet connection, or the \nsession name in the session code folder in the SVD application folder contains an \nincorrect session name.'
+        
+        elif index == "5":
+            return 'The matching process error will occur if SVD could not find a match for an enterred \nsession code in the session codes folder in the SVD application folder. Common causes \nof this are misspelling the session code, forgetting to place commas (,) separating \nindividual session code entries, misspelling "projection", misspelling "quit" or \nmisspelling "help".'
+        
+        else:
+            return 'To use the help menu type the number "1", "2", "3", "4" or "5" which relates to the \nparticular aspect of the application that needs a further explanation as dictated by \nthe menu. To leave the help menu and return to the application type "quit".'
+            
 MainMethod()
\ No newline at end of file
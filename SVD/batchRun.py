@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Records the outcome of each session of an unattended batch run, so that a failed session is retried or skipped rather than ending the run
+'''
+
+import time
+
+# Number of times a failed download or server request is retried in a batch run before the session is skipped
+BATCH_RETRIES = 3
+
+# Seconds waited before the first retry, doubled for every following retry up to BATCH_BACKOFF_LIMIT
+BATCH_BACKOFF = 5
+BATCH_BACKOFF_LIMIT = 300
+
+class BatchRun:
+
+    '''
+    @__init__: BatchRun class constructor
+
+    @param self: instance variable of the class, BatchRun
+    @param retries: number of times a failed download or server request is retried before giving up
+    @param backoff: seconds waited before the first retry, doubled for every following retry
+    '''
+    def __init__(self, retries = BATCH_RETRIES, backoff = BATCH_BACKOFF):
+
+        self.retries = retries
+        self.backoff = backoff
+
+        # Sessions that completed, and the stage and error of each session that failed
+        self.succeeded_list = []
+        self.failed_dictionary = {}
+
+    '''
+    @retryDelay: calculates how long to wait before a retry, which doubles with every attempt and is bounded by BATCH_BACKOFF_LIMIT
+
+    @param self: instance variable of the class, BatchRun
+    @param attempt: number of attempts that have already failed
+    @return: seconds to wait before the next attempt
+    '''
+    def retryDelay(self, attempt):
+        return min(self.backoff * 2 ** (attempt - 1), BATCH_BACKOFF_LIMIT)
+
+    '''
+    @waitToRetry: determines whether or not another attempt is allowed, and if so waits before it
+
+    @param self: instance variable of the class, BatchRun
+    @param attempt: number of attempts that have already failed
+    @param description: what is being retried, for the status message
+    @return: whether or not to try again
+    '''
+    def waitToRetry(self, attempt, description):
+
+        if attempt > self.retries:
+            return False
+
+        delay = BatchRun.retryDelay(self, attempt)
+
+        print(f'Retrying {description} in {delay:g} seconds (attempt {attempt + 1} of {self.retries + 1})...')
+        time.sleep(delay)
+
+        return True
+
+    '''
+    @recordSuccess: records a session that completed
+
+    @param self: instance variable of the class, BatchRun
+    @param session: name of the session
+    '''
+    def recordSuccess(self, session):
+
+        self.succeeded_list.append(session)
+
+        # A session that succeeds after an earlier failure is no longer failed
+        self.failed_dictionary.pop(session, None)
+
+    '''
+    @recordFailure: records a session that failed and the stage it failed at
+
+    @param self: instance variable of the class, BatchRun
+    @param session: name of the session
+    @param stage: stage of the run the session failed at (server, match, download, extract or process)
+    @param error: the error that occoured
+    '''
+    def recordFailure(self, session, stage, error):
+
+        self.failed_dictionary[session] = (stage, str(error))
+
+        print('~' * 87)
+        print(f'{error}\n SVD skipped {session}, which failed at the {stage} stage')
+        print('~' * 87)
+
+    '''
+    @printSummary: displays the sessions that completed and the sessions that failed with their errors
+
+    @param self: instance variable of the class, BatchRun
+    '''
+    def printSummary(self):
+
+        print('-' * 37 + 'BATCH SUMMARY' + '-' * 37)
+        print(f'{len(self.succeeded_list)} session(s) completed and {len(self.failed_dictionary)} session(s) failed')
+
+        for session in self.succeeded_list:
+            print(f'  completed  {session}')
+
+        for session, (stage, error) in self.failed_dictionary.items():
+            print(f'  failed     {session} at the {stage} stage: {error}')
+
+        print('-' * 87)
+
+    '''
+    @get_succeeded_list: grabs the list of sessions that completed
+
+    @param self: instance variable of the class, BatchRun
+    @return: list of session names
+    '''
+    def get_succeeded_list(self):
+        return self.succeeded_list
+
+    '''
+    @get_failed_dictionary: grabs the sessions that failed
+
+    @param self: instance variable of the class, BatchRun
+    @return: dictionary of session names to the stage and error of the failure
+    '''
+    def get_failed_dictionary(self):
+        return self.failed_dictionary
+
+    succeeded = property(get_succeeded_list)
+    failed = property(get_failed_dictionary)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Loads the Earth orientation data needed for sidereal time once per process from a local table, so that no IERS downloads are attempted
+'''
+
+import os
+import numpy as np
+from astropy.time import Time
+from astropy.utils import iers
+
+# Earth orientation table (IERS finals2000A.all) kept in the SVD application folder. If it is not present the copy bundled with astropy is used.
+# To extend the table past the predictions of the bundled copy, download finals2000A.all from the IERS on a connected machine and place it here
+EARTH_ORIENTATION_FILE = os.path.join(os.path.dirname(__file__), 'finals2000A.all')
+
+# Zero point of the MJD format
+MJD_EPOCH = np.datetime64('1858-11-17T00:00:00', 'ns')
+
+# Largest error of interpolated sidereal times in decimal degrees (1 milliarcsecond), and the initial step of the interpolation grid in days.
+# Sidereal time is nearly linear in time, so one grid point an hour already meets the tolerance by several orders of magnitude
+SIDEREAL_TIME_TOLERANCE = 1 / 3600 / 1000
+SIDEREAL_GRID_STEP = 1 / 24
+
+# Largest number of grid points before calculating the exact sidereal time of every observation instead
+SIDEREAL_GRID_MAX_POINTS = 10000
+
+# Never letting astropy download IERS or leap second tables, as the compute nodes are not connected to the internet
+iers.conf.auto_download = False
+iers.conf.auto_max_age = None
+
+class EarthOrientation:
+
+    '''
+    @__init__: EarthOrientation class constructor, reads the Earth orientation table and keeps the UT1-UTC column as arrays
+
+    @param self: instance variable of the class, EarthOrientation
+    '''
+    def __init__(self):
+
+        # Using the table in the SVD application folder if there is one, otherwise the table bundled with astropy
+        if os.path.exists(EARTH_ORIENTATION_FILE):
+            self.table_path = EARTH_ORIENTATION_FILE
+
+        else:
+            self.table_path = iers.IERS_A_FILE
+
+        earth_orientation_table = iers.IERS_A.open(self.table_path)
+
+        # Making astropy use the same table for anything else that needs Earth orientation data
+        iers.earth_orientation_table.set(earth_orientation_table)
+
+        mjd = np.asarray(earth_orientation_table['MJD'].value, dtype=float)
+        ut1_utc = np.ma.filled(np.ma.asarray(earth_orientation_table['UT1_UTC'].value, dtype=float), np.nan)
+
+        # Days past the end of the predictions have no UT1-UTC value
+        valid = np.isfinite(ut1_utc)
+
+        self.mjd = mjd[valid]
+        self.ut1_utc = ut1_utc[valid]
+
+    '''
+    @ut1MinusUTC: interpolates UT1-UTC for each time from the daily values of the table, times outside the table use the first or last value
+
+    @param self: instance variable of the class, EarthOrientation
+    @param time_mjd: array of times in MJD format
+    @return: array of UT1-UTC in seconds for each time
+    '''
+    def ut1MinusUTC(self, time_mjd):
+        return np.interp(time_mjd, self.mjd, self.ut1_utc)
+
+    '''
+    @readTimes: reads UTC times in isot format into MJD format all at once with numpy, rather than one astropy time at a time
+
+    @param self: instance variable of the class, EarthOrientation
+    @param time_utc_list: list of UTC times in isot format, entries that are Err are skipped
+    @return: array of times in MJD format, NaN where the time is an error or cannot be read
+    '''
+    def readTimes(self, time_utc_list):
+
+        time_mjd = np.full(len(time_utc_list), np.nan)
+
+        # Index of the times that were extracted without an error
+        valid_index = [index for index, time_utc in enumerate(time_utc_list) if time_utc != 'Err']
+
+        try:
+            times = np.array([time_utc_list[index] for index in valid_index], dtype='datetime64[ns]')
+
+        except ValueError:
+
+            # Reading the times one at a time to skip the ones that cannot be read
+            times = []
+            for index in valid_index:
+                try:
+                    times.append(np.datetime64(time_utc_list[index], 'ns'))
+
+                except ValueError:
+                    times.append(np.datetime64('NaT'))
+
+            times = np.array(times, dtype='datetime64[ns]')
+
+        time_mjd[valid_index] = (times - MJD_EPOCH) / np.timedelta64(1, 'D')
+
+        return time_mjd
+
+    '''
+    @exactSiderealTime: calculates the Greenwich mean sidereal time of every time with astropy, in one call
+
+    @param self: instance variable of the class, EarthOrientation
+    @param time_mjd: array of UTC times in MJD format
+    @return: array of Greenwich mean sidereal times in decimal degrees
+    '''
+    def exactSiderealTime(self, time_mjd):
+
+        times = Time(time_mjd, format = 'mjd', scale = 'utc')
+
+        # Giving UT1-UTC from the loaded table, so that astropy does not look up an IERS table itself
+        times.delta_ut1_utc = EarthOrientation.ut1MinusUTC(self, time_mjd)
+
+        return np.asarray(times.sidereal_time('mean', 'greenwich').deg, dtype=float)
+
+    '''
+    @siderealTime: calculates the Greenwich mean sidereal time of every time. The exact sidereal time is calculated with astropy on a grid 
+        across the span of the times, and the sidereal time of each time is linearly interpolated from the grid. 
+        To bound the error, the exact sidereal time is also calculated half way between the grid points, where the error of linear 
+        interpolation is largest, and the grid is made finer until the error there is within the tolerance. The values half way are 
+        then added to the grid, so the error of the returned times is at most the tolerance and in practice well below it. 
+        If the tolerance cannot be met with SIDEREAL_GRID_MAX_POINTS grid points (e.g. a leap second in the session) or 
+        the tolerance is None, the exact sidereal time of every time is calculated instead
+
+    @param self: instance variable of the class, EarthOrientation
+    @param time_utc_list: list of UTC times in isot format, entries that are Err are skipped
+    @param tolerance: largest allowed error of the interpolated sidereal times in decimal degrees, exact for every time if None
+    @return: array of Greenwich mean sidereal times in decimal degrees, NaN where the time is an error
+    '''
+    def siderealTime(self, time_utc_list, tolerance = SIDEREAL_TIME_TOLERANCE):
+
+        time_mjd = EarthOrientation.readTimes(self, time_utc_list)
+        sidereal_time = np.full(len(time_mjd), np.nan)
+
+        valid = np.isfinite(time_mjd)
+
+        if not valid.any():
+            return sidereal_time
+
+        time_start = time_mjd[valid].min()
+        time_end = time_mjd[valid].max()
+
+        # Number of grid intervals needed for the initial grid step
+        grid_intervals = max(1, int(np.ceil((time_end - time_start) / SIDEREAL_GRID_STEP)))
+
+        while tolerance != None and grid_intervals * 2 + 1 <= SIDEREAL_GRID_MAX_POINTS and grid_intervals * 2 + 1 < valid.sum():
+
+            # Grid points and the points half way between them, calculated with astropy in one call
+            grid = np.linspace(time_start, time_end, grid_intervals * 2 + 1)
+            grid_sidereal_time = np.unwrap(EarthOrientation.exactSiderealTime(self, grid), period = 360)
+
+            # Error of interpolating half way between the grid points from the grid points either side
+            interpolation_error = np.abs(
+                (grid_sidereal_time[0:-1:2] + grid_sidereal_time[2::2]) / 2 - grid_sidereal_time[1::2]
+            ).max(initial = 0)
+
+            if interpolation_error <= tolerance:
+                sidereal_time[valid] = np.interp(time_mjd[valid], grid, grid_sidereal_time) % 360
+                return sidereal_time
+
+            # Making the grid finer, as the error of linear interpolation falls with the square of the grid step
+            grid_intervals *= 4
+
+        # Calculating the exact sidereal time of every time if the grid would not save any calculations or cannot meet the tolerance
+        sidereal_time[valid] = EarthOrientation.exactSiderealTime(self, time_mjd[valid])
+
+        return sidereal_time
+
+    '''
+    @get_table_path: grabs the path to the Earth orientation table in use
+
+    @param self: instance variable of the class, EarthOrientation
+    @return: path to the Earth orientation table
+    '''
+    def get_table_path(self):
+        return self.table_path
+
+    path = property(get_table_path)
+
+# Earth orientation data shared by all of SVD, loaded once per process
+earth_orientation = EarthOrientation()
@@ -1,987 +1,1663 @@
-#!/usr/bin/env python
-# -*- coding: utf-8 -*-
-'''
-@author: Zachary Allen
-@supervisor: Tiege McCarthy
-@function: Extracts relevant observables data from given VgosDB directory into lists
-'''
-
-import os
-import netCDF4 as nc
-from pathlib import Path
-from geodeticData import ExtractSourceCatalogue, ExtractStationCatalogue
-
-source_data = ExtractSourceCatalogue()
-station_data = ExtractStationCatalogue()
-
-class ReadNetCDF4:
-
-    '''
-    @__init__: ReadNetCDF4 class constructor
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @param vgosDB_path: path to the selected session VgosDB's
-    '''
-    def __init__(self, vgosDB_path):
-
-        # Observing mode (S/X or VGOS)
-        self.observing_mode = ''
-
-        # Boolean dictating whether or not a source missing from the list has been found
-        self.missing_source = False
-
-        # Boolean dictating whether or not a station missing from the list has been found
-        self.missing_station = False
-
-        # Extracted observation data lists
-        self.session_code = ''
-        self.observation_time_UTC_list = []
-        self.observation_source_list = []
-        self.observation_duration_bX_list = [] # Used as the default duration list for the VGOS database
-        self.observation_baselines_list = []
-        self.observation_QC_bX_list = [] # Used as the default quality code for the VGOS database
-        self.observation_QC_bS_list = []
-        self.observation_SNR_bX_list = [] # Used as the default signal-to-noise ratio for the VGOS database
-        self.observation_SNR_bS_list = []
-        self.observation_channelwise_amplitude = [] # Used as the default amplitude list for the VGOS database
-        self.observation_channelwise_phase = [] # Used as the default phase list for the VGOS database
-
-        # Extracted source data lists  
-        self.source_name_list = []
-        self.source_right_ascension_list = []
-        self.source_declination_list = []
-        self.source_reference_list = []
-
-        # Extracted station data lists
-        self.station_name_list = []
-        self.station_cartesian_coordinates_list = []
-
-        # Status codes of data extraction
-        self.status_code_time_UTC = '0'
-        self.status_code_duration_bX = '0'
-        self.status_code_source = '0'
-        self.status_code_baseline = '0'
-        self.status_code_QC_bX = '0'
-        self.status_code_QC_bS = '0'
-        self.status_code_SNR_bX = '0'
-        self.status_code_SNR_bS = '0'
-        self.status_code_channelwise_amplitude = '0'
-        self.status_code_channelwise_phase = '0'
-        self.status_code_source_name = '0'
-        self.status_code_right_ascension = '0'
-        self.status_code_declination = '0'
-        self.status_code_reference = '0'
-        self.status_code_station_name = '0'
-        self.status_code_station_coordinates = '0'
-        self.status_code_missing_data = '0'
-
-        # Looping through all the subdirectories in the VgosDB
-        for sub_directory in Path(vgosDB_path).rglob(''):
-            
-            # Select the observables sub_directory
-            if sub_directory.name == 'Observables':
-                
-                # Calculating the session code from the name of the sessions vgosDB
-                self.session_code = Path(vgosDB_path).name.upper() # TODO GET RID OF .upper() ONCE RENAMING ERROR IS FIXED IN extractFile
-
-                observables_directory = sub_directory
-
-                # Finds relevant files in observables
-                for file_path in Path(observables_directory).rglob('*'):
-                    
-                    if file_path.name == 'TimeUTC.nc':
-                        self.observation_time_UTC_list, self.status_code_time_UTC = ReadNetCDF4.extractUTCTime(self, file_path)
-
-                    # Duration is only extracted from the X band list as for S/X sessions, the S band list is empty
-                    elif 'CorrInfo' in file_path.name and '_bX.nc' in file_path.name: 
-                        self.observation_duration_bX_list, self.status_code_duration_bX = ReadNetCDF4.extractDuration(self, file_path)
-
-                    elif file_path.name == 'Source.nc':
-                        self.observation_source_list, self.status_code_source = ReadNetCDF4.extractSource(self, file_path)
-
-                    elif file_path.name == 'Baseline.nc':
-                        self.observation_baselines_list, self.status_code_baseline = ReadNetCDF4.extractBaseline(self, file_path)
-
-                    elif file_path.name == 'QualityCode_bX.nc':
-                        self.observation_QC_bX_list, self.status_code_QC_bX = ReadNetCDF4.extractQC(self, file_path)
-
-                    elif file_path.name == 'QualityCode_bS.nc':
-                        self.observation_QC_bS_list, self.status_code_QC_bS = ReadNetCDF4.extractQC(self, file_path)
-
-                    elif file_path.name == 'SNR_bX.nc':
-                        self.observation_SNR_bX_list, self.status_code_SNR_bX = ReadNetCDF4.extractSNR(self, file_path)
-
-                    elif file_path.name == 'SNR_bS.nc':
-                        self.observation_SNR_bS_list, self.status_code_SNR_bS = ReadNetCDF4.extractSNR(self, file_path)
-
-                    elif file_path.name == 'ChannelInfo_bX.nc':
-                        self.observation_channelwise_amplitude, self.observation_channelwise_phase, self.status_code_channelwise_amplitude, self.status_code_channelwise_phase = ReadNetCDF4.extractChannelInfo(self, file_path)
-
-        # If a missing source was detected, extracting it from the vgosDB and adding it to the catalogure    
-        if self.missing_source == True: 
-
-            # Path to file with source information
-            file_path = os.path.join(os.path.dirname(__file__), 'VgosDB', self.session_code, 'Apriori', 'Source.nc')
-
-            # Extracting the file of source information from the Apriori directory
-            self.source_name_list, self.source_right_ascension_list, self.source_declination_list, self.source_reference_list, self.status_code_source_name, self.status_code_right_ascension, self.status_code_declination, self.status_code_reference = ReadNetCDF4.extractSourceInfo(self, file_path)
-    
-        # If a missing source was detected, extracting it from the vgosDB and adding it to the catalogure    
-        if self.missing_station == True: 
-
-            # Path to file with station information
-            file_path = os.path.join(os.path.dirname(__file__), 'VgosDB', self.session_code, 'Apriori', 'Station.nc')
-
-            # Extracting the file of source information from the Apriori directory
-            self.station_name_list, self.station_cartesian_coordinates_list, self.status_code_station_name, self.status_code_station_coordinates = ReadNetCDF4.extractStationInfo(self, file_path)
-
-    '''
-    @extractTime: reads the utc time from a NetCDF file
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @param file: NetCDF file containing the time
-    @return: time in utc format
-    '''
-    def extractUTCTime(self,file):
-
-        data_set = nc.Dataset(file)
-        utc_time_list = []
-        status_code = '0' # If no errors occoured in the data extraction, the status code is 0
-
-        # Boolean whether all entries are errors
-        all_errors = True
-        
-        try:
-            # Extracting year-month-day-hour-minute (YMDHM) and seconds datasets
-            ymdhm_ndarray = data_set['YMDHM'][:]
-            seconds_ndarray = data_set['Second'][:]
-            
-            # Decoding sources from a numpy.ndarray and adding to a list
-            for time in range(len(ymdhm_ndarray)):
-
-                try:
-                
-                    # Extracting the specific times from the list
-                    ymdhm = ymdhm_ndarray[time]
-                    seconds = seconds_ndarray[time]
-                    
-                    # Adding 2000 to the year if not already added
-                    if len(str(ymdhm[0])) != 4:
-                        year = 2000 + int(ymdhm[0])
-
-                    # If the year is already added:
-                    else:
-                        year = int(ymdhm[0])
-
-                    month = int(ymdhm[1])
-                    day = int(ymdhm[2])
-                    hour = int(ymdhm[3])
-                    minute = int(ymdhm[4])
-                    second = float(seconds)
-
-                    # Modifying the time into isot format so that it can be converted into other formats by astropy
-                    utc_time_list.append(
-                        str(year) 
-                        + '-' 
-                        + ''.join(['0' for zeros in range(2-len(str(month)))])
-                        + str(month) 
-                        + '-' 
-                        + ''.join(['0' for zeros in range(2-len(str(day)))])
-                        + str(day) 
-                        + 'T' 
-                        + ''.join(['0' for zeros in range(2-len(str(hour)))])
-                        + str(hour) 
-                        + ':' 
-                        + ''.join(['0' for zeros in range(2-len(str(minute)))])
-                        + str(minute) 
-                        + ':' 
-                        + ''.join(['0' for zeros in range(2-len(str(int(second))))])
-                        + str(second)
-                    )
-
-                    all_errors = False
-
-                # If an error occoured during the decoding of data the entry is changed to Err
-                except Exception:
-                    status_code = '1' # If some errors occoured in the data extraction, the status code is 1
-                    utc_time_list.append('Err')
-        
-            # Converting the list to an empty list if all entries are errors 
-            if all_errors == True:
-                status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-                utc_time_list = []
-
-        # If a fatal error occoured an empty list is returned
-        except Exception:
-            status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-            utc_time_list = []
-            
-        return utc_time_list, status_code
-    
-    '''
-    @extractDuration: reads the observation durations from a NetCDF file into a list
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @param file: NetCDF file containing scan durations
-    @return: list of observation durations
-    ''' 
-    def extractDuration(self, file):
-
-        data_set = nc.Dataset(file)
-        status_code = '0' # If no errors occoured in the data extraction, the status code is 0
-        duration_list = []
-
-        # Boolean whether all entries are errors
-        all_errors = True
-
-        try:
-            duration_ndarray = data_set['EffectiveDuration'][:] 
-
-            # Decoding scan durations from a numpy.ndarray and adding to a list
-            for element in duration_ndarray:
-
-                try:
-                    # Converting duration to a string to avoid error
-                    duration_list.append(str(element))
-
-                    all_errors = False
-
-                # If an error occoured during the decoding of data the entry is changed to Err
-                except Exception:
-                    status_code = '1' # If some errors occoured in the data extraction, the status code is 1
-                    duration_list.append('Err')
-
-            # Converting the list to an empty list if all entries are errors 
-            if all_errors == True:
-                status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-                duration_list = []
-        
-        # If an error occours an empty list is returned
-        except Exception:
-            status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-            duration_list = []
-            
-        return duration_list, status_code
-
-    '''
-    @extractSource: reads the sources from a NetCDF file into a list
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @param file: NetCDF file containing sources
-    @return: list of sources
-    ''' 
-    def extractSource(self, file):
-
-        data_set = nc.Dataset(file)
-        status_code = '0' # If no errors occoured in the data extraction, the status code is 0
-        source_list = []
-
-        # Boolean whether all entries are errors
-        all_errors = True
-
-        try:
-            source_ndarray = data_set['Source'][:]
-            
-            for element in range(0, len(source_ndarray)):
-
-                try:
-                    source = ''
-
-                    # Decoding sources from a numpy.ndarray and adding to a list
-                    for character in source_ndarray[element]:
-                        source = source + str(character.decode('UTF-8'))
-                        
-                    # Changing the source name back to its IAU name if its labelled under its IVS common name
-                    if source in source_data.common:
-                        source = source_data.name[source_data.common.index(source)]
-                    
-                    # If the source is not in the common name or IAU name list, the program will 
-                    if source not in source_data.name and source not in source_data.common:
-                        self.missing_source = True
-
-                    source_list.append(source)
-
-                    all_errors = False
-                
-                # If an error occoured during the decoding of data the entry is changed to Err
-                except Exception:
-                    status_code = '1' # If some errors occoured in the data extraction, the status code is 1
-                    source_list.append('Err')
-
-            # Converting the list to an empty list if all entries are errors 
-            if all_errors == True:
-                status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-                source_list = []
-        
-        # If an error occours an empty list is returned
-        except Exception:
-            status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-            source_list = []
-    
-        return source_list, status_code
-    
-    '''
-    @extractBaseline: reads the baselines from a NetCDF file into a list
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @param file: NetCDF file containing baselines
-    @return: list of baselines
-    ''' 
-    def extractBaseline(self, file):
-
-        data_set = nc.Dataset(file)
-        status_code = '0' # If no errors occoured in the data extraction, the status code is 0
-        baseline_list = []
-
-        # Boolean whether all entries are errors
-        all_errors = True
-        
-        try:
-            baseline_ndarray = data_set['Baseline'][:]
-
-            for character in range(0, len(baseline_ndarray)):
-
-                try:
-                    station1 = ''
-                    station2 = ''
-            
-                    # Decoding baselines from a numpy.ndarray and adding to a list
-                    for element in baseline_ndarray[character][0]:
-                        station1 += str(element.decode('UTF-8'))
-
-                    # Replacing spaces with underscores in the unlikely event of stations having spaces within their name
-                    if len(station1.rstrip().split(' ')) != 0:
-                        station1 = station1.rstrip().replace(' ', '_') + station1.replace(station1.rstrip(), '')
-                        
-                    for element in baseline_ndarray[character][1]:
-                        station2 += str(element.decode('UTF-8'))
-
-                    # Replacing spaces with underscores in the unlikely event of stations having spaces within their name
-                    if len(station2.rstrip().split(' ')) != 0:
-                        station2 = station2.rstrip().replace(' ', '_') + station2.replace(station2.rstrip(), '')
-
-                    if station1 not in station_data.name or station2 not in station_data.name:
-                        self.missing_station = True
-            
-                    baseline_list.append((station1, station2))
-
-                    all_errors = False
-
-                # If an error occoured during the decoding of data the entry is changed to Err
-                except Exception:
-                    status_code = '1' # If some errors occoured in the data extraction, the status code is 1
-                    baseline_list.append(('Err','Err'))
-
-            # Converting the list to an empty list if all entries are errors 
-            if all_errors == True:
-                status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-                baseline_list = []
-        
-        # If an error occours an empty list is returned
-        except Exception:
-            status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-            baseline_list = []
-        
-        return baseline_list, status_code
-
-    '''
-    @extractQC: reads the quality codes (QC) from a NetCDF file into a list
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @param file: NetCDF file containing quality codes
-    @return: list of quality codes
-    ''' 
-    def extractQC(self, file):
-
-        data_set = nc.Dataset(file)
-        status_code = '0' # If no errors occoured in the data extraction, the status code is 0
-        qc_list = []
-
-        # Boolean whether all entries are errors
-        all_errors = True
-        
-        try:
-            qc_ndarray = data_set['QualityCode'][:] 
-            
-            # Decoding quality codes from a numpy.ndarray and adding to a list
-            for element in qc_ndarray:
-                
-                try:
-                    # Converting the quality code to a string to avoid possible error
-                    qc_list.append(str(element.decode('UTF-8')))
-
-                    all_errors = False
-                
-                # If an error occoured during the decoding of data the entry is changed to Err
-                except Exception:
-                    status_code = '1' # If some errors occoured in the data extraction, the status code is 1
-                    qc_list.append('Err')
-
-            # Converting the list to an empty list if all entries are errors 
-            if all_errors == True:
-                status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-                qc_list = []
-        
-        # If an error occours an empty list is returned
-        except Exception:
-            status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-            qc_list = []
-
-        return qc_list, status_code
-    
-    '''
-    @extractSNR: reads the signal to noise ratios (SNR) from a NetCDF file into a list
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @param file: NetCDF file containing signal to noise ratios
-    @return: list of signal to noise ratios
-    '''
-    def extractSNR(self,file):
-
-        data_set = nc.Dataset(file)
-        status_code = '0' # If no errors occoured in the data extraction, the status code is 0
-        snr_list = []
-
-        # Boolean whether all entries are errors
-        all_errors = True
-
-        try:
-            snr_ndarray = data_set['SNR'][:]
-            # Decoding signal to noise ratios from a numpy.ndarray and adding to a list
-            for element in snr_ndarray:
-                
-                try:
-                    snr_list.append(float(element))
-
-                    all_errors = False
-                
-                # If an error occoured during the decoding of data the entry is changed to Err
-                except Exception:
-                    status_code = '1' # If some errors occoured in the data extraction, the status code is 1
-                    snr_list.append('Err')
-
-            # Converting the list to an empty list if all entries are errors 
-            if all_errors == True:
-                status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-                snr_list = []
-        
-        # If an error occours an empty list is returned
-        except Exception:
-            status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-            snr_list = []
-            
-        return snr_list, status_code
-
-    '''
-    @extractChannelInfo: reads the channelwise amplitude and phase from a NetCDF file into a list
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @param : NetCDF file containing the channel infomation
-    @return: a list of channelwise amplitudes and a list of channelwise phases for each observation
-    ''' 
-    def extractChannelInfo(self, file):
-
-        data_set = nc.Dataset(file)
-        amplitude_status_code = '0' # If no errors occoured in the data extraction, the status code is 0
-        phase_status_code = '0'
-        channelwise_amplitude_list = []
-        channelwise_phase_list = []
-
-        # Boolean whether all entries are errors
-        amplitude_all_errors = True
-        phase_all_errors = True
-
-        try:
-            channelwise_amplitude_phase_ndarray = data_set['ChanAmpPhase'][:]
-
-            # Decoding channel amplitude and phase from a numpy.ndarray and adding to a list
-            for element in channelwise_amplitude_phase_ndarray:
-
-                amplitude_list = []
-                phase_list = []
-
-                # Each element contains a list of phase and amplitude for each of the 32 channels
-                for channel in element:
-
-                    try:
-                        amplitude_list.append(float(channel[0]))
-                    
-                        amplitude_all_errors = False
-
-                    # If an error occoured during the decoding of data the entry is changed to Err
-                    except Exception:
-                        amplitude_status_code = '1' # If some errors occoured in the data extraction, the status code is 1
-                        amplitude_list.append('Err')
-                       
-                    try:    
-                        phase_list.append(float(channel[1]))
-
-                        phase_all_errors = False
-
-                    # If an error occoured during the decoding of data the entry is changed to Err
-                    except Exception:
-                        phase_status_code = '1' # If some errors occoured in the data extraction, the status code is 1
-                        phase_list.append('Err')
-
-                channelwise_amplitude_list.append(amplitude_list)
-                channelwise_phase_list.append(phase_list)
-
-                # Determining the observing mode
-                if amplitude_all_errors == False:
-                    if len(amplitude_list) == 32:
-                        self.observing_mode = 'VGOS'
-
-                    else:
-                        self.observing_mode = 'S/X'
-
-                else:
-                    self.observing_mode = ''
-
-            # Converting the list to an empty list if all entries are errors 
-            if amplitude_all_errors == True:
-                status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-                channelwise_amplitude_list = []
-
-            if phase_all_errors == True:
-                status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-                channelwise_phase_list = []
-        
-        # If an error occours empty lists are returned
-        except Exception:
-            status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-            channelwise_amplitude_list = []
-            channelwise_phase_list = []
-
-        return channelwise_amplitude_list, channelwise_phase_list, amplitude_status_code, phase_status_code
-
-    '''
-    @extractSourceInfo: reads the source names, source coordinates and source references for all the sources used in the session from a NetCDF file into a list
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @param file: NetCDF file containing source information
-    @return: lists of source names, source right ascension coordinated, source declination coordinates and source references
-    ''' 
-    def extractSourceInfo(self, file):
-
-        data_set = nc.Dataset(file)
-        names_status_code = '0' # If no errors occoured in the data extraction, the status code is 0
-        right_ascensions_status_code = '0'
-        declinations_status_code = '0'
-        references_status_code = '0'
-        
-        # Lists of source data
-        source_names = []
-        source_right_ascensions = []
-        source_declinations = []
-        source_references = []
-
-        # Boolean whether all entries are errors
-        names_all_errors = True
-        right_ascensions_all_errors = True
-        declinations_all_errors = True
-        references_all_errors = True
-
-        # Reading the three different variables from the masked array
-        try:                
-            source_ndarray = data_set['AprioriSourceList'][:]
-                
-            for element in source_ndarray:
-
-                try:           
-                    source_name = ''
-
-                    # Decoding source name from a numpy.ndarray and adding to the list
-                    for character in element:
-                        source_name += str(character.decode('UTF-8'))
-
-                    source_names.append(source_name)
-
-                    names_all_errors = False
-                
-                # If an error occoured during the decoding of data the entry is changed to Err
-                except Exception:
-                    names_status_code = '1' # If some errors occoured in the data extraction, the status code is 1
-                    source_names.append('Err')
-                
-            source_ndarray = data_set['AprioriSource2000RaDec'][:]
-                
-            for element in source_ndarray:
-                    
-                try:
-                    source_right_ascensions.append(float(element[0])) # Note the right ascension coordinate is in radians
-                    
-                    right_ascensions_all_errors = False
-
-                # If an error occoured during the decoding of data the entry is changed to Err
-                except Exception:
-                    right_ascensions_status_code = '1' # If some errors occoured in the data extraction, the status code is 1
-                    source_right_ascensions.append('Err')
-
-                try:    
-                    source_declinations.append(float(element[1])) # Note the declination coordinate is in radians
-
-                    declinations_all_errors = False
-
-                # If an error occoured during the decoding of data the entry is changed to Err
-                except Exception:
-                    declinations_status_code = '1' # If some errors occoured in the data extraction, the status code is 1
-                    source_declinations.append('Err')
-
-            source_ndarray = data_set['AprioriSourceReference'][:]
-                
-            for element in source_ndarray:
-                    
-                try:
-                    source_reference = ''
-
-                    # Decoding source reference from a numpy.ndarray and adding to the list
-                    for character in element:
-                            
-                        # Only decoding if the character is not '--'
-                        if character != b'--' and character != b' ':
-                            source_reference += str(character.decode('UTF-8'))
-
-                    source_references.append(source_reference)
-
-                    references_all_errors = False
-
-                # If an error occoured during the decoding of data the entry is changed to Err
-                except Exception:
-                    references_status_code = '1' # If some errors occoured in the data extraction, the status code is 1
-                    source_references.append('Err')            
-            
-            # Converting the list to an empty list if all entries are errors 
-            if names_all_errors == True:
-                names_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-                source_names = []
-            
-            # Converting the list to an empty list if all entries are errors 
-            if right_ascensions_all_errors == True:
-                right_ascensions_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-                source_right_ascensions = []
-
-            # Converting the list to an empty list if all entries are errors 
-            if declinations_all_errors == True:
-                declinations_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-                source_declinations = []
-
-            # Converting the list to an empty list if all entries are errors 
-            if references_all_errors == True:
-                references_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-                source_references = []
-
-        # If an error occours empty lists are returned
-        except Exception:
-            names_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-            right_ascensions_status_code = '2'
-            declinations_status_code = '2'
-            references_status_code = '2'
-            source_names = []
-            source_right_ascensions = []
-            source_declinations = []
-            source_references = []
-            
-        return source_names, source_right_ascensions, source_declinations, source_references, names_status_code, right_ascensions_status_code, declinations_status_code, references_status_code
-    
-    '''
-    @extractStationInfo: reads the station names and station coordinates for all the stations used in the session from a NetCDF file into a list
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @param file: NetCDF file containing station information
-    @return: lists of station names and station cartesian coordinates
-    ''' 
-    def extractStationInfo(self, file):
-
-        data_set = nc.Dataset(file)
-        names_status_code = '0' # If no errors occoured in the data extraction, the status code is 0
-        coordinates_status_code = '0'
-
-        # Lists of source data
-        station_names = []
-        station_cartesian_coordinates = []
-
-        # Boolean whether all entries are errors
-        names_all_errors = True
-        coordinates_all_errors = True
-
-        # Reading the two different variables from the masked array
-        try:
-                
-            station_ndarray = data_set['AprioriStationList'][:]
-                
-            for element in station_ndarray:
-
-                try:
-                    station_name = ''
-
-                    # Decoding source name from a numpy.ndarray and adding to the list
-                    for character in element:
-                        station_name += str(character.decode('UTF-8'))
-
-                    station_names.append(station_name)
-
-                    names_all_errors = False
-
-                # If an error occoured during the decoding of data the entry is changed to Err
-                except Exception:
-                    names_status_code = '1' # If some errors occoured in the data extraction, the status code is 1
-                    station_names.append('Err')
-
-            station_ndarray = data_set['AprioriStationXYZ'][:]
-                
-            for element in station_ndarray:
-
-                try:                        
-                    coordinates = []
-
-                    # Adding each of the three coordinates to a list
-                    for coordinate in element:
-                        coordinates.append(float(coordinate))
-
-                    station_cartesian_coordinates.append(coordinates)
-
-                    coordinates_all_errors = False
-
-                # If an error occoured during the decoding of data the entry is changed to Err
-                except Exception:
-                    coordinates_status_code = '1' # If some errors occoured in the data extraction, the status code is 1
-                    station_cartesian_coordinates.append('Err')
-
-            # Converting the list to an empty list if all entries are errors 
-            if names_all_errors == True:
-                names_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-                station_names = []
-
-            # Converting the list to an empty list if all entries are errors 
-            if coordinates_all_errors == True:
-                coordinates_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-                station_cartesian_coordinates = []
-
-        # If an error occours empty lists are returned
-        except Exception:
-            names_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
-            coordinates_status_code = '2'
-            station_names = []
-            station_cartesian_coordinates = []
-            
-        return station_names, station_cartesian_coordinates, names_status_code, coordinates_status_code
-
-    '''
-    @get_observing_mode: grabs the observing mode
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the observing mode
-    '''
-    def get_observing_mode(self):
-        return self.observing_mode
-
-    '''
-    @get_session_code: grabs the session code
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the session code
-    '''
-    def get_session_code(self):
-        return self.session_code
-    
-    '''
-    @get_observation_time_UTC_list: grabs the list of UTC times
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the UTC time list
-    '''
-    def get_observation_time_UTC_list(self):
-        return self.observation_time_UTC_list
-    
-    '''
-    @get_observation_duration_bX_list: grabs the list of scan durations for X band
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of durations
-    '''
-    def get_observation_duration_bX_list(self):
-        return self.observation_duration_bX_list
-    
-    '''
-    @get_observation_source_list: grabs the list of sources
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of sources
-    '''
-    def get_observation_source_list(self):
-        return self.observation_source_list
-    
-    '''
-    @get_observation_baselines_list: grabs the list of baselines
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of baselines
-    '''
-    def get_observation_baselines_list(self):
-        return self.observation_baselines_list
-    
-    '''
-    @get_observation_QC_bX_list: grabs the list of quality codes from the X band
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of quality codes
-    '''
-    def get_observation_QC_bX_list(self):
-        return self.observation_QC_bX_list
-    
-    '''
-    @get_observation_QC_bS_list: grabs the list of quality codes from the S band
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of quality codes
-    '''
-    def get_observation_QC_bS_list(self):
-        return self.observation_QC_bS_list
-    
-    '''
-    @get_observation_SNR_bX_list: grabs the list of signal to noise ratios from the X band
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of signal to noise ratios
-    '''
-    def get_observation_SNR_bX_list(self):
-        return self.observation_SNR_bX_list
-    
-    '''
-    @get_observation_SNR_bS_list: grabs the list of signal to noise ratios from the S band
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of signal to noise ratios
-    '''
-    def get_observation_SNR_bS_list(self):
-        return self.observation_SNR_bS_list
-    
-    '''
-    @get_observation_channelwise_amplitude: grabs the list of channelwise amplitude
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of channelwise amplitudes
-    '''
-    def get_observation_channelwise_amplitude(self):
-        return self.observation_channelwise_amplitude
-    
-    '''
-    @get_observation_channelwise_phase: grabs the list of channelwise amplitude
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of channelwise amplitudes
-    '''
-    def get_observation_channelwise_phase(self):
-        return self.observation_channelwise_phase
-    
-    '''
-    @get_source_name_list: grabs the list of source names that participated in the session
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of participating source names
-    '''
-    def get_source_name_list(self):
-        return self.source_name_list
-    
-    '''
-    @get_source_right_ascension_list: grabs the list of the right ascension coordinates of the sources that participated in the session
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of participating source right ascensions
-    '''
-    def get_source_right_ascension_list(self):
-        return self.source_right_ascension_list
-    
-    '''
-    @get_source_declination_list: grabs the list of the declination coordinates of the sources that participated in the session
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of participating source declinations
-    '''
-    def get_source_declination_list(self):
-        return self.source_declination_list
-    
-    '''
-    @get_source_reference_list: grabs the list of the dreferences of the sources that participated in the session
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of participating source references
-    '''
-    def get_source_reference_list(self):
-        return self.source_reference_list
-
-    '''
-    @get_station_name_list: grabs the list of station names that participated in the session
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of participating station names
-    '''
-    def get_station_name_list(self):
-        return self.station_name_list
-    
-    '''
-    @get_station_cartesian_coordinates_list: grabs the list of the Cartesian coordinates of the stations that participated in the session
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of participating station Cartesian coordinates
-    '''
-    def get_station_cartesian_coordinates_list(self):
-        return self.station_cartesian_coordinates_list
-    
-    '''
-    @get_status_codes: grabs the status codes of all the data extractions
-
-    @param self: instance variable of the class, ReadNetCDF4
-    @return: the list of status codes
-    '''
-    def get_status_codes(self):
-        
-        # Calculating the missing data status code
-        if self.missing_source == True and self.missing_station == True:
-            self.status_code_missing_data = '5' # A status code of 5 is returned if missing source and station information is detected
-
-        elif self.missing_station == True:
-            self.status_code_missing_data = '4' # A status code of 4 is returned if missing station information is detected
-        
-        elif self.missing_source == True:
-            self.status_code_missing_data = '3' # A status code of 3 is returned if missing source information is detected
-
-        return {
-        'UTC time': self.status_code_time_UTC,
-        'duration': self.status_code_duration_bX,
-        'source': self.status_code_source,
-        'baseline': self.status_code_baseline,
-        'quality code (X)': self.status_code_QC_bX,
-        'quality code (S)': self.status_code_QC_bS, 
-        'signal to noise ratio (X)': self.status_code_SNR_bX,
-        'signal to noise ratio (S)': self.status_code_SNR_bS,
-        'channelwise amplitude': self.status_code_channelwise_amplitude,
-        'channelwise phase': self.status_code_channelwise_phase,
-        'missing data': self.status_code_missing_data,
-        'missing source name': self.status_code_source_name,
-        'missing source right ascension': self.status_code_right_ascension,
-        'missing source declination': self.status_code_declination,
-        'missing source reference': self.status_code_reference,
-        'missing station name': self.status_code_station_name,
-        'missing station coordinate': self.status_code_station_coordinates,
-        }
-
-    mode = property(get_observing_mode)
-    session = property(get_session_code)
-    time_utc = property(get_observation_time_UTC_list)
-    duration_bX = property(get_observation_duration_bX_list)
-    source = property(get_observation_source_list)
-    baseline = property(get_observation_baselines_list)
-    qc_bX = property(get_observation_QC_bX_list)
-    qc_bS = property(get_observation_QC_bX_list)
-    snr_bX = property(get_observation_SNR_bX_list)
-    snr_bS = property(get_observation_SNR_bX_list)
-    chan_amp = property(get_observation_channelwise_amplitude)
-    chan_phase = property(get_observation_channelwise_phase)
-    source_name = property(get_source_name_list)
-    source_ra = property(get_source_right_ascension_list)
-    source_dc = property(get_source_declination_list)
-    source_ref = property(get_source_reference_list)
-    station_name = property(get_station_name_list)
-    station_xyz = property(get_station_cartesian_coordinates_list)
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Extracts relevant observables data from given VgosDB directory into lists
+'''
+
+import os
+import numpy as np
+import netCDF4 as nc
+from pathlib import Path
+from collections import OrderedDict
+from geodeticData import source_data, station_data
+from sharedArrays import SharedArrays
+
+# Names of the files in the observables directory that are read (as well as the X band CorrInfo file)
+OBSERVABLES_FILES = ['TimeUTC.nc', 'Source.nc', 'Baseline.nc', 'QualityCode_bX.nc', 'QualityCode_bS.nc', 'SNR_bX.nc', 'SNR_bS.nc', 'ChannelInfo_bX.nc']
+
+# Key of the X band CorrInfo file, whose name depends on the correlator, and keys of the apriori source and station files
+CORR_INFO_FILE = 'CorrInfo_bX.nc'
+APRIORI_SOURCE_FILE = 'Apriori/Source.nc'
+APRIORI_STATION_FILE = 'Apriori/Station.nc'
+
+# File each variable is read from, so that a file is only read when one of its variables is first used
+VARIABLE_FILES = {
+    'time_utc': 'TimeUTC.nc',
+    'duration_bX': CORR_INFO_FILE,
+    'source': 'Source.nc',
+    'baseline': 'Baseline.nc',
+    'qc_bX': 'QualityCode_bX.nc',
+    'qc_bS': 'QualityCode_bS.nc',
+    'snr_bX': 'SNR_bX.nc',
+    'snr_bS': 'SNR_bS.nc',
+    'chan_amp': 'ChannelInfo_bX.nc',
+    'chan_phase': 'ChannelInfo_bX.nc',
+    'chan_valid': 'ChannelInfo_bX.nc',
+    'source_name': APRIORI_SOURCE_FILE,
+    'source_ra': APRIORI_SOURCE_FILE,
+    'source_dc': APRIORI_SOURCE_FILE,
+    'source_ref': APRIORI_SOURCE_FILE,
+    'station_name': APRIORI_STATION_FILE,
+    'station_xyz': APRIORI_STATION_FILE
+}
+
+# Largest number of separate hyperslabs read for the filtered observations, beyond which the span of the observations is read at once and then indexed
+HYPERSLAB_LIMIT = 64
+
+# Largest number of NetCDF files a ReadNetCDF4 keeps open to be used again, beyond which the least recently used file is closed,
+# so that the file handles held by a session stay bounded however many of its files are read
+OPEN_DATASET_LIMIT = 4
+
+# Extracted observation lists and arrays that are placed in shared memory when a session read in one process is processed in another
+SHARED_OBSERVATION_ATTRIBUTES = [
+    'observation_time_UTC_list',
+    'observation_source_list',
+    'observation_duration_bX_list',
+    'observation_baselines_list',
+    'observation_QC_bX_list',
+    'observation_QC_bS_list',
+    'observation_SNR_bX_list',
+    'observation_SNR_bS_list',
+    'observation_channelwise_amplitude',
+    'observation_channelwise_phase',
+    'observation_channelwise_valid'
+]
+
+# Attributes describing what has been read, which are sent with the descriptor of the shared memory
+SHARED_STATE_ATTRIBUTES = ['observation_range', 'observation_number', 'observing_mode', 'missing_source', 'missing_station', 'session_code', 'observables_files', 'loaded_files']
+
+class ObservationFilter:
+
+    '''
+    @__init__: ObservationFilter class constructor, holds the conditions an observation must meet to be extracted
+
+    @param self: instance variable of the class, ObservationFilter
+    @param sources: list of source names (IAU or common names) to keep, all sources are kept if None
+    @param stations: list of station names, observations with either station in the list are kept, all stations are kept if None
+    @param start_time: earliest UTC time to keep in isot format, no earliest time if None
+    @param end_time: latest UTC time to keep in isot format, no latest time if None
+    @param minimum_qc: lowest X band quality code (0 to 9) to keep, no minimum if None
+    @param minimum_snr: lowest X band signal to noise ratio to keep, no minimum if None
+    '''
+    def __init__(self, sources = None, stations = None, start_time = None, end_time = None, minimum_qc = None, minimum_snr = None):
+
+        self.sources = None
+        self.stations = None
+
+        # Source names to keep, including the other name of each source in the catalogue (names are compared without whitespace)
+        if sources != None:
+            self.sources = set()
+
+            for source in sources:
+                source = source.strip()
+                padded_source = source.ljust(8)
+
+                self.sources.add(source)
+
+                if padded_source in source_data.common_index:
+                    self.sources.add(source_data.name[source_data.common_index[padded_source]].strip())
+
+                if padded_source in source_data.name_index:
+                    self.sources.add(source_data.common[source_data.name_index[padded_source]].strip())
+
+            self.sources.discard('')
+
+        # Station names to keep, spaces within names are replaced with underscores in the same way as when the baselines are extracted
+        if stations != None:
+            self.stations = set(station.strip().replace(' ', '_') for station in stations)
+
+        self.start_time = None if start_time == None else np.datetime64(start_time, 'ns')
+        self.end_time = None if end_time == None else np.datetime64(end_time, 'ns')
+        self.minimum_qc = minimum_qc
+        self.minimum_snr = minimum_snr
+
+    '''
+    @isEmpty: determines whether or not the filter has no conditions, in which case every observation is kept
+
+    @param self: instance variable of the class, ObservationFilter
+    @return: whether or not the filter has no conditions
+    '''
+    def isEmpty(self):
+        return self.sources == None and self.stations == None and self.start_time == None and self.end_time == None and self.minimum_qc == None and self.minimum_snr == None
+
+    empty = property(isEmpty)
+
+class ReadNetCDF4:
+
+    '''
+    @__init__: ReadNetCDF4 class constructor
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param vgosDB_path: path to the selected session VgosDB's
+    @param observation_range: slice of the observations to extract, all observations are extracted if None
+    @param variables: names of the variables (properties) to read straight away, any other variable is read when it is first used
+    @param observation_filter: ObservationFilter of the observations to extract, all observations in the range are extracted if None
+    @param shared_extract: a session read by another process, from its shareArrays, whose data is used rather than reading the VgosDB again
+    '''
+    def __init__(self, vgosDB_path, observation_range = None, variables = (), observation_filter = None, shared_extract = None):
+
+        # Slice of the observations to read from the observables files (reading only a chunk keeps memory bounded for large sessions)
+        self.observation_range = slice(None) if observation_range == None else observation_range
+
+        # Total number of observations in the session (regardless of the observation range)
+        self.observation_number = 0
+
+        # Indices of the observations selected by the filter, all observations in the range are extracted if None
+        self.observation_index = None
+
+        # Observing mode (S/X or VGOS), None until it is first used
+        self.observing_mode = None
+
+        # Boolean dictating whether or not a source missing from the list has been found
+        self.missing_source = False
+
+        # Boolean dictating whether or not a station missing from the list has been found
+        self.missing_station = False
+
+        # Extracted observation data lists
+        self.session_code = ''
+        self.observation_time_UTC_list = []
+        self.observation_source_list = []
+        self.observation_duration_bX_list = [] # Used as the default duration list for the VGOS database
+        self.observation_baselines_list = []
+        self.observation_QC_bX_list = [] # Used as the default quality code for the VGOS database
+        self.observation_QC_bS_list = []
+        self.observation_SNR_bX_list = [] # Used as the default signal-to-noise ratio for the VGOS database
+        self.observation_SNR_bS_list = []
+        self.observation_channelwise_amplitude = np.empty((0, 0)) # Used as the default amplitude array for the VGOS database
+        self.observation_channelwise_phase = np.empty((0, 0)) # Used as the default phase array for the VGOS database
+        self.observation_channelwise_valid = np.empty((0, 0), dtype=bool) # Whether or not the amplitude and phase of each channel are valid
+
+        # Extracted source data lists  
+        self.source_name_list = []
+        self.source_right_ascension_list = []
+        self.source_declination_list = []
+        self.source_reference_list = []
+
+        # Extracted station data lists
+        self.station_name_list = []
+        self.station_cartesian_coordinates_list = []
+
+        # Status codes of data extraction, None until the variable is read (or if its file is not in the VgosDB)
+        self.status_code_time_UTC = None
+        self.status_code_duration_bX = None
+        self.status_code_source = None
+        self.status_code_baseline = None
+        self.status_code_QC_bX = None
+        self.status_code_QC_bS = None
+        self.status_code_SNR_bX = None
+        self.status_code_SNR_bS = None
+        self.status_code_channelwise_amplitude = None
+        self.status_code_channelwise_phase = None
+        self.status_code_source_name = '0'
+        self.status_code_right_ascension = '0'
+        self.status_code_declination = '0'
+        self.status_code_reference = '0'
+        self.status_code_station_name = '0'
+        self.status_code_station_coordinates = '0'
+        self.status_code_missing_data = '0'
+
+        # Contents of the observables files that have been read into memory but not yet decoded
+        self.file_contents = {}
+
+        # Paths of the files that can be read, by file key, and the keys of the files that have been read
+        self.observables_files = {}
+        self.loaded_files = set()
+
+        # NetCDF files that are open and whether each was opened from memory, from the least to the most recently used, which are closed once decoded or when the session is closed
+        self.open_datasets = OrderedDict()
+
+        # Shared memory holding the data of a session read by another process, which is removed once the session is processed
+        self.shared_session = None
+
+        # Using the data already read by another process, any variable it did not read is still read from the VgosDB when it is first used
+        if shared_extract != None:
+            ReadNetCDF4.attachShared(self, shared_extract)
+            return
+
+        # Finding the observables directory and the relevant files in it, without walking the whole VgosDB
+        observables_directory, observables_file_list = ReadNetCDF4.resolveObservablesFiles(self, vgosDB_path)
+
+        # Select the observables sub_directory
+        if observables_directory != None:
+                
+            # Calculating the session code from the name of the sessions vgosDB
+            self.session_code = Path(vgosDB_path).name.upper() # TODO GET RID OF .upper() ONCE RENAMING ERROR IS FIXED IN extractFile
+
+            for file_path in observables_file_list:
+                self.observables_files[ReadNetCDF4.fileKey(self, file_path.name)] = file_path
+
+            # The apriori directory is next to the observables directory, and is only read if a missing source or station is found
+            self.observables_files[APRIORI_SOURCE_FILE] = Path(observables_directory.parent, 'Apriori', 'Source.nc')
+            self.observables_files[APRIORI_STATION_FILE] = Path(observables_directory.parent, 'Apriori', 'Station.nc')
+
+            try:
+                # Reading the total number of observations from the shape of the sources, without reading any data
+                if 'Source.nc' in self.observables_files:
+                    self.observation_number = ReadNetCDF4.extractObservationNumber(self, self.observables_files['Source.nc'])
+
+                # Selecting the observations that meet the filter from the small index variables, before any other data is read
+                if observation_filter != None and observation_filter.empty == False:
+                    self.observation_index = ReadNetCDF4.selectObservations(self, observation_filter)
+
+                # Reading the variables that are needed straight away together
+                ReadNetCDF4.load(self, *variables)
+
+            # Closing the files already opened, as the ReadNetCDF4 is never returned to be closed
+            except BaseException:
+                ReadNetCDF4.close(self)
+                raise
+
+    '''
+    @load: reads the files of the given variables that have not been read yet. Each file is only read once
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param *variables: names of the variables (properties) to read, from VARIABLE_FILES
+    '''
+    def load(self, *variables):
+
+        # Missing sources and stations are only known once the sources and baselines of the observations have been read
+        if any(VARIABLE_FILES[variable] == APRIORI_SOURCE_FILE for variable in variables):
+            ReadNetCDF4.load(self, 'source')
+
+        if any(VARIABLE_FILES[variable] == APRIORI_STATION_FILE for variable in variables):
+            ReadNetCDF4.load(self, 'baseline')
+
+        file_keys = []
+
+        # Finding the files that have not been read yet, each only once
+        for variable in variables:
+
+            file_key = VARIABLE_FILES[variable]
+
+            if file_key not in self.loaded_files and file_key not in file_keys:
+                file_keys.append(file_key)
+
+        self.loaded_files.update(file_keys)
+
+        for file_key in file_keys:
+            ReadNetCDF4.readObservablesFile(self, file_key)
+
+    '''
+    @shareArrays: places the extracted observations in shared memory, so that the session can be processed by another process without copying them
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the descriptor of the shared memory and what has been read, which the other process passes to ReadNetCDF4 as shared_extract
+    '''
+    def shareArrays(self):
+
+        arrays = {}
+
+        for attribute in SHARED_OBSERVATION_ATTRIBUTES:
+
+            value = getattr(self, attribute)
+
+            if isinstance(value, np.ndarray):
+                arrays[attribute] = value
+
+            # Lists of numbers with errors, such as the signal to noise ratios, are shared as numbers and where the errors are
+            elif any(isinstance(element, float) for element in value):
+                arrays[attribute + '_error'] = np.array([isinstance(element, str) for element in value], dtype = bool)
+                arrays[attribute] = np.array([np.nan if isinstance(element, str) else element for element in value], dtype = float)
+
+            # Lists of text, where the baselines become an array of pairs of stations
+            else:
+                arrays[attribute] = np.array(value, dtype = str)
+
+        if self.observation_index is not None:
+            arrays['observation_index'] = self.observation_index
+
+        state = {attribute: getattr(self, attribute) for attribute in SHARED_STATE_ATTRIBUTES}
+        state.update({attribute: value for attribute, value in vars(self).items() if attribute.startswith('status_code_')})
+
+        # Handing the shared memory over to the process that processes the session, which removes it
+        return {'descriptor': SharedArrays(arrays).handOver(), 'state': state}
+
+    '''
+    @attachShared: attaches to the observations placed in shared memory by another process, and takes over removing the shared memory
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param shared_extract: the descriptor of the shared memory and what has been read, from shareArrays
+    '''
+    def attachShared(self, shared_extract):
+
+        self.shared_session = SharedArrays(descriptor = shared_extract['descriptor'], take_over = True)
+
+        for attribute, value in shared_extract['state'].items():
+            setattr(self, attribute, value)
+
+        arrays = self.shared_session.arrays
+
+        for attribute in SHARED_OBSERVATION_ATTRIBUTES:
+
+            # Rebuilding the lists of numbers with errors, so that the errors are written as they were read
+            if attribute + '_error' in arrays:
+                setattr(self, attribute, ['Err' if error else number for number, error in zip(arrays[attribute].tolist(), arrays[attribute + '_error'].tolist())])
+
+            # Every other list is used straight from the shared memory
+            elif attribute in arrays:
+                setattr(self, attribute, arrays[attribute])
+
+        if 'observation_index' in arrays:
+            self.observation_index = arrays['observation_index']
+
+    '''
+    @releaseShared: releases and removes the shared memory of a session read by another process, once the session has been processed
+
+    @param self: instance variable of the class, ReadNetCDF4
+    '''
+    def releaseShared(self):
+
+        if self.shared_session == None:
+            return
+
+        # Dropping the arrays taken from the shared memory, so that it can be closed
+        for attribute in SHARED_OBSERVATION_ATTRIBUTES:
+            if isinstance(getattr(self, attribute), np.ndarray):
+                setattr(self, attribute, [])
+
+        self.observation_index = None
+
+        self.shared_session.close()
+        self.shared_session = None
+
+    '''
+    @fileKey: finds the key of a file in the observables directory, which is its name except for the X band CorrInfo file
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file_name: name of the file
+    @return: key of the file
+    '''
+    def fileKey(self, file_name):
+
+        # The name of the CorrInfo file depends on the correlator (e.g. CorrInfo-difx_bX.nc)
+        if 'CorrInfo' in file_name and '_bX.nc' in file_name:
+            return CORR_INFO_FILE
+
+        return file_name
+
+    '''
+    @resolveObservablesFiles: finds the observables directory of a VgosDB and the relevant files in it, from the wrapper file if there is one
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param vgosDB_path: path to the selected session VgosDB's
+    @param search_subdirectories: whether or not to look for the observables directory one directory further down
+    @return: path to the observables directory (None if it was not found) and the list of paths to the relevant files
+    '''
+    def resolveObservablesFiles(self, vgosDB_path, search_subdirectories = True):
+
+        observables_directory = None
+        observables_file_list = []
+        wrapper_file_list = []
+
+        # Listing the top of the VgosDB once, which holds the observables directory and the wrapper files
+        try:
+            session_entries = list(os.scandir(vgosDB_path))
+
+        # If the VgosDB can not be listed there are no files to read
+        except Exception:
+            return None, []
+
+        for entry in session_entries:
+
+            if entry.name == 'Observables' and entry.is_dir():
+                observables_directory = Path(entry.path)
+
+            elif entry.name.endswith('.wrp') and entry.is_file():
+                wrapper_file_list.append(entry.path)
+
+        # The VgosDB may be inside another directory if the archive was packed that way
+        if observables_directory == None:
+
+            if search_subdirectories == True:
+                for entry in session_entries:
+                    if entry.is_dir() and os.path.isdir(os.path.join(entry.path, 'Observables')):
+                        return ReadNetCDF4.resolveObservablesFiles(self, entry.path, False)
+
+            return None, []
+
+        # Reading the names of the observables files from the most recent wrapper file, which lists the exact files to use
+        if len(wrapper_file_list) != 0:
+
+            for file_name in ReadNetCDF4.readWrapper(self, sorted(wrapper_file_list)[-1]):
+
+                file_path = Path(observables_directory, file_name)
+
+                if ReadNetCDF4.isObservablesFile(self, file_name) and file_path.is_file():
+                    observables_file_list.append(file_path)
+
+        # If there is no wrapper file, the observables directory is listed once instead
+        if len(observables_file_list) == 0:
+
+            try:
+                observables_file_list = [Path(entry.path) for entry in os.scandir(observables_directory) if entry.is_file() and ReadNetCDF4.isObservablesFile(self, entry.name)]
+
+            # If the observables directory can not be listed there are no files to read
+            except Exception:
+                observables_file_list = []
+
+        return observables_directory, observables_file_list
+
+    '''
+    @readWrapper: reads the names of the files in the observables directory from a VgosDB wrapper file
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param wrapper_path: path to the wrapper (.wrp) file
+    @return: list of file names in the observables directory
+    '''
+    def readWrapper(self, wrapper_path):
+
+        file_name_list = []
+
+        # Directory of the files listed in the current section of the wrapper
+        default_directory = ''
+
+        try:
+            with open(wrapper_path, 'r', errors='ignore') as wrapper:
+
+                for line in wrapper:
+
+                    words = line.split()
+
+                    # Skipping empty lines and comments
+                    if len(words) == 0 or words[0].startswith('!'):
+                        continue
+
+                    # Each section of the wrapper starts with no default directory
+                    if words[0].lower() == 'begin':
+                        default_directory = ''
+
+                    # Changing the directory of the following files
+                    elif words[0].lower() == 'default_dir' and len(words) > 1:
+                        default_directory = words[1]
+
+                    # Adding the file if it is in the observables directory (either from the default directory or its own path)
+                    elif words[0].endswith('.nc'):
+
+                        directory, file_name = os.path.split(words[0])
+
+                        if (directory or default_directory) == 'Observables':
+                            file_name_list.append(file_name)
+
+        # If the wrapper file can not be read, no files are listed
+        except Exception:
+            file_name_list = []
+
+        return file_name_list
+
+    '''
+    @isObservablesFile: determines whether or not a file in the observables directory is read
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file_name: name of the file
+    @return: whether or not the file is read
+    '''
+    def isObservablesFile(self, file_name):
+        return file_name in OBSERVABLES_FILES or ('CorrInfo' in file_name and '_bX.nc' in file_name)
+
+    '''
+    @readObservablesFile: reads a file in the observables (or apriori) directory, and extracts its data into the relevant list
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file_key: key of the file in the dictionary of files
+    '''
+    def readObservablesFile(self, file_key):
+
+        file_path = self.observables_files.get(file_key)
+
+        # If the file is not in the VgosDB, its lists are left empty
+        if file_path == None:
+            return
+
+        # The apriori files are only read if a missing source or station was found
+        if (file_key == APRIORI_SOURCE_FILE and self.missing_source == False) or (file_key == APRIORI_STATION_FILE and self.missing_station == False):
+            return
+
+        file_contents = None
+
+        # Reading the whole file into memory in one read, which NetCDF then decodes from memory. Only done if all observations are read, so that chunks and filters keep memory bounded
+        if self.observation_range == slice(None) and self.observation_index is None:
+
+            try:
+                with open(file_path, 'rb') as file:
+                    file_contents = file.read()
+
+            # If the file could not be read into memory, it is read from the disk instead
+            except Exception:
+                file_contents = None
+
+        self.file_contents[file_path] = file_contents
+
+        if file_key == 'TimeUTC.nc':
+            self.observation_time_UTC_list, self.status_code_time_UTC = ReadNetCDF4.extractUTCTime(self, file_path)
+
+        # Duration is only extracted from the X band list as for S/X sessions, the S band list is empty
+        elif file_key == CORR_INFO_FILE: 
+            self.observation_duration_bX_list, self.status_code_duration_bX = ReadNetCDF4.extractDuration(self, file_path)
+
+        elif file_key == 'Source.nc':
+            self.observation_source_list, self.status_code_source = ReadNetCDF4.extractSource(self, file_path)
+
+        elif file_key == 'Baseline.nc':
+            self.observation_baselines_list, self.status_code_baseline = ReadNetCDF4.extractBaseline(self, file_path)
+
+        elif file_key == 'QualityCode_bX.nc':
+            self.observation_QC_bX_list, self.status_code_QC_bX = ReadNetCDF4.extractQC(self, file_path)
+
+        elif file_key == 'QualityCode_bS.nc':
+            self.observation_QC_bS_list, self.status_code_QC_bS = ReadNetCDF4.extractQC(self, file_path)
+
+        elif file_key == 'SNR_bX.nc':
+            self.observation_SNR_bX_list, self.status_code_SNR_bX = ReadNetCDF4.extractSNR(self, file_path)
+
+        elif file_key == 'SNR_bS.nc':
+            self.observation_SNR_bS_list, self.status_code_SNR_bS = ReadNetCDF4.extractSNR(self, file_path)
+
+        elif file_key == 'ChannelInfo_bX.nc':
+            self.observation_channelwise_amplitude, self.observation_channelwise_phase, self.observation_channelwise_valid, self.status_code_channelwise_amplitude, self.status_code_channelwise_phase = ReadNetCDF4.extractChannelInfo(self, file_path)
+
+        # If a missing source was detected, extracting the source information of the session to add to the catalogue
+        elif file_key == APRIORI_SOURCE_FILE:
+            self.source_name_list, self.source_right_ascension_list, self.source_declination_list, self.source_reference_list, self.status_code_source_name, self.status_code_right_ascension, self.status_code_declination, self.status_code_reference = ReadNetCDF4.extractSourceInfo(self, file_path)
+
+        # If a missing station was detected, extracting the station information of the session to add to the catalogue
+        elif file_key == APRIORI_STATION_FILE:
+            self.station_name_list, self.station_cartesian_coordinates_list, self.status_code_station_name, self.status_code_station_coordinates = ReadNetCDF4.extractStationInfo(self, file_path)
+
+        # Closing the file, as each file is only decoded once, and freeing its memory
+        ReadNetCDF4.closeDataset(self, file_path)
+        del self.file_contents[file_path]
+
+    '''
+    @openDataset: opens a NetCDF file, from memory if it has already been read, or uses it again if it is already open. The file stays open
+        until it is decoded, the session is closed, or more than OPEN_DATASET_LIMIT files are open and it is the least recently used
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file: path to the NetCDF file
+    @return: the NetCDF dataset
+    '''
+    def openDataset(self, file):
+
+        from_memory = self.file_contents.get(file) != None
+
+        # Using the open file again, unless its contents have since been read into memory, which is opened instead
+        if file in self.open_datasets and (from_memory == False or self.open_datasets[file][1] == True):
+            self.open_datasets.move_to_end(file)
+            return self.open_datasets[file][0]
+
+        ReadNetCDF4.closeDataset(self, file)
+
+        # Opening the dataset from the contents of the file already read into memory
+        if from_memory == True:
+            data_set = nc.Dataset(str(file), memory = self.file_contents[file])
+
+        else:
+            data_set = nc.Dataset(file)
+
+        self.open_datasets[file] = (data_set, from_memory)
+
+        # Closing the least recently used files beyond the limit
+        while len(self.open_datasets) > OPEN_DATASET_LIMIT:
+            ReadNetCDF4.closeDataset(self, next(iter(self.open_datasets)))
+
+        return data_set
+
+    '''
+    @closeDataset: closes a NetCDF file if it is open
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file: path to the NetCDF file
+    '''
+    def closeDataset(self, file):
+
+        if file not in self.open_datasets:
+            return
+
+        data_set, from_memory = self.open_datasets.pop(file)
+
+        try:
+            data_set.close()
+
+        # The file was already closed
+        except RuntimeError:
+            pass
+
+    '''
+    @close: closes every NetCDF file that is still open and releases the shared memory of a session read by another process, once the session has been processed
+
+    @param self: instance variable of the class, ReadNetCDF4
+    '''
+    def close(self):
+
+        while len(self.open_datasets) != 0:
+            ReadNetCDF4.closeDataset(self, next(iter(self.open_datasets)))
+
+        ReadNetCDF4.releaseShared(self)
+
+    '''
+    @extractObservationNumber: reads the total number of observations in the session from a NetCDF file without reading the data
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file: NetCDF file containing the sources of each observation
+    @return: number of observations in the session
+    '''
+    def extractObservationNumber(self, file):
+
+        data_set = ReadNetCDF4.openDataset(self, file)
+
+        try:
+            # Only the shape of the variable is read, not the data itself
+            observation_number = int(data_set['Source'].shape[0])
+
+        # If an error occours the number of observations is unknown
+        except Exception:
+            observation_number = 0
+
+        return observation_number
+
+    '''
+    @selectObservations: finds the observations in the observation range that meet the filter, reading only the variables the filter needs
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param observation_filter: ObservationFilter of the observations to extract
+    @return: array of the indices of the selected observations
+    '''
+    def selectObservations(self, observation_filter):
+
+        # Indices of the observations in the observation range
+        observation_index = np.arange(self.observation_number)[self.observation_range]
+        selected = np.ones(len(observation_index), dtype=bool)
+
+        try:
+            if observation_filter.sources != None:
+                data_set = ReadNetCDF4.openDataset(self, self.observables_files['Source.nc'])
+                source_names = np.char.strip(nc.chartostring(np.ma.getdata(data_set['Source'][self.observation_range])).astype(str))
+                selected &= np.isin(source_names, list(observation_filter.sources))
+
+            if observation_filter.stations != None:
+                data_set = ReadNetCDF4.openDataset(self, self.observables_files['Baseline.nc'])
+                station_names = np.char.replace(np.char.strip(nc.chartostring(np.ma.getdata(data_set['Baseline'][self.observation_range])).astype(str)), ' ', '_')
+                selected &= np.isin(station_names, list(observation_filter.stations)).any(axis=1)
+
+            if observation_filter.start_time != None or observation_filter.end_time != None:
+                data_set = ReadNetCDF4.openDataset(self, self.observables_files['TimeUTC.nc'])
+                ymdhm = np.ma.getdata(data_set['YMDHM'][self.observation_range]).astype(int)
+                seconds = np.ma.getdata(data_set['Second'][self.observation_range]).astype(float)
+
+                # Adding 2000 to the year if not already added
+                year = np.where(ymdhm[:, 0] < 100, ymdhm[:, 0] + 2000, ymdhm[:, 0])
+
+                # Building the time of every observation at once
+                times = (
+                    (year - 1970).astype('datetime64[Y]').astype('datetime64[M]')
+                    + (ymdhm[:, 1] - 1).astype('timedelta64[M]')
+                ).astype('datetime64[ns]') + (ymdhm[:, 2] - 1).astype('timedelta64[D]') + ymdhm[:, 3].astype('timedelta64[h]') + ymdhm[:, 4].astype('timedelta64[m]') + (seconds * 1e9).astype('timedelta64[ns]')
+
+                if observation_filter.start_time != None:
+                    selected &= times >= observation_filter.start_time
+
+                if observation_filter.end_time != None:
+                    selected &= times <= observation_filter.end_time
+
+            if observation_filter.minimum_qc != None:
+                data_set = ReadNetCDF4.openDataset(self, self.observables_files['QualityCode_bX.nc'])
+                quality_codes = np.ma.getdata(data_set['QualityCode'][self.observation_range]).astype(str)
+
+                # Quality codes that are not digits are failed observations, which never meet a minimum
+                quality_code_digits = np.char.isdigit(quality_codes)
+                selected &= quality_code_digits & (np.where(quality_code_digits, quality_codes, '0').astype(int) >= observation_filter.minimum_qc)
+
+            if observation_filter.minimum_snr != None:
+                data_set = ReadNetCDF4.openDataset(self, self.observables_files['SNR_bX.nc'])
+                snr = np.ma.filled(np.ma.asarray(data_set['SNR'][self.observation_range], dtype=float), np.nan)
+                selected &= snr >= observation_filter.minimum_snr
+
+        # If a variable needed by the filter can not be read, no observation is known to meet the filter
+        except Exception:
+            selected[:] = False
+
+        return observation_index[selected]
+
+    '''
+    @readObservations: reads the selected observations of a NetCDF variable. The filtered observations are read as hyperslabs of consecutive 
+        observations, or as the span of the observations if they are split into more than HYPERSLAB_LIMIT hyperslabs
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param variable: NetCDF variable with the observations as its first dimension
+    @return: array of the selected observations of the variable
+    '''
+    def readObservations(self, variable):
+
+        # Reading the observation range if the observations are not filtered
+        if self.observation_index is None:
+            return variable[self.observation_range]
+
+        observation_index = self.observation_index
+
+        if len(observation_index) == 0:
+            return variable[0:0]
+
+        # Finding the runs of consecutive observations
+        run_breaks = np.nonzero(np.diff(observation_index) != 1)[0] + 1
+        run_starts = observation_index[np.concatenate(([0], run_breaks))]
+        run_ends = observation_index[np.concatenate((run_breaks - 1, [len(observation_index) - 1]))] + 1
+
+        # Reading the span of the observations once if there are too many runs to read separately
+        if len(run_starts) > HYPERSLAB_LIMIT:
+            return variable[observation_index[0]:observation_index[-1] + 1][observation_index - observation_index[0]]
+
+        return np.ma.concatenate([variable[run_start:run_end] for run_start, run_end in zip(run_starts, run_ends)])
+
+    '''
+    @extractObservingMode: determines the observing mode from the number of channels in a NetCDF file without reading the channel data
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file: NetCDF file containing the channel infomation
+    @return: the observing mode (S/X or VGOS), empty if it could not be determined
+    '''
+    def extractObservingMode(self, file):
+
+        try:
+            data_set = ReadNetCDF4.openDataset(self, file)
+
+            # Only the shape of the variable is read, VGOS sessions have 32 channels
+            if data_set['ChanAmpPhase'].shape[1] == 32:
+                observing_mode = 'VGOS'
+
+            else:
+                observing_mode = 'S/X'
+
+        # If an error occours the observing mode is unknown
+        except Exception:
+            observing_mode = ''
+
+        return observing_mode
+
+    '''
+    @extractTime: reads the utc time from a NetCDF file
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file: NetCDF file containing the time
+    @return: time in utc format
+    '''
+    def extractUTCTime(self,file):
+
+        data_set = ReadNetCDF4.openDataset(self, file)
+        utc_time_list = []
+        status_code = '0' # If no errors occoured in the data extraction, the status code is 0
+
+        # Boolean whether all entries are errors
+        all_errors = True
+        
+        try:
+            # Extracting year-month-day-hour-minute (YMDHM) and seconds datasets
+            ymdhm_ndarray = ReadNetCDF4.readObservations(self, data_set['YMDHM'])
+            seconds_ndarray = ReadNetCDF4.readObservations(self, data_set['Second'])
+            
+            # Decoding sources from a numpy.ndarray and adding to a list
+            for time in range(len(ymdhm_ndarray)):
+
+                try:
+                
+                    # Extracting the specific times from the list
+                    ymdhm = ymdhm_ndarray[time]
+                    seconds = seconds_ndarray[time]
+                    
+                    # Adding 2000 to the year if not already added
+                    if len(str(ymdhm[0])) != 4:
+                        year = 2000 + int(ymdhm[0])
+
+                    # If the year is already added:
+                    else:
+                        year = int(ymdhm[0])
+
+                    month = int(ymdhm[1])
+                    day = int(ymdhm[2])
+                    hour = int(ymdhm[3])
+                    minute = int(ymdhm[4])
+                    second = float(seconds)
+
+                    # Modifying the time into isot format so that it can be converted into other formats by astropy
+                    utc_time_list.append(
+                        str(year) 
+                        + '-' 
+                        + ''.join(['0' for zeros in range(2-len(str(month)))])
+                        + str(month) 
+                        + '-' 
+                        + ''.join(['0' for zeros in range(2-len(str(day)))])
+                        + str(day) 
+                        + 'T' 
+                        + ''.join(['0' for zeros in range(2-len(str(hour)))])
+                        + str(hour) 
+                        + ':' 
+                        + ''.join(['0' for zeros in range(2-len(str(minute)))])
+                        + str(minute) 
+                        + ':' 
+                        + ''.join(['0' for zeros in range(2-len(str(int(second))))])
+                        + str(second)
+                    )
+
+                    all_errors = False
+
+                # If an error occoured during the decoding of data the entry is changed to Err
+                except Exception:
+                    status_code = '1' # If some errors occoured in the data extraction, the status code is 1
+                    utc_time_list.append('Err')
+        
+            # Converting the list to an empty list if all entries are errors 
+            if all_errors == True:
+                status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+                utc_time_list = []
+
+        # If a fatal error occoured an empty list is returned
+        except Exception:
+            status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+            utc_time_list = []
+            
+        return utc_time_list, status_code
+    
+    '''
+    @extractDuration: reads the observation durations from a NetCDF file into a list
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file: NetCDF file containing scan durations
+    @return: list of observation durations
+    ''' 
+    def extractDuration(self, file):
+
+        data_set = ReadNetCDF4.openDataset(self, file)
+        status_code = '0' # If no errors occoured in the data extraction, the status code is 0
+        duration_list = []
+
+        # Boolean whether all entries are errors
+        all_errors = True
+
+        try:
+            duration_ndarray = ReadNetCDF4.readObservations(self, data_set['EffectiveDuration']) 
+
+            # Decoding scan durations from a numpy.ndarray and adding to a list
+            for element in duration_ndarray:
+
+                try:
+                    # Converting duration to a string to avoid error
+                    duration_list.append(str(element))
+
+                    all_errors = False
+
+                # If an error occoured during the decoding of data the entry is changed to Err
+                except Exception:
+                    status_code = '1' # If some errors occoured in the data extraction, the status code is 1
+                    duration_list.append('Err')
+
+            # Converting the list to an empty list if all entries are errors 
+            if all_errors == True:
+                status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+                duration_list = []
+        
+        # If an error occours an empty list is returned
+        except Exception:
+            status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+            duration_list = []
+            
+        return duration_list, status_code
+
+    '''
+    @extractSource: reads the sources from a NetCDF file into a list
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file: NetCDF file containing sources
+    @return: list of sources
+    ''' 
+    def extractSource(self, file):
+
+        data_set = ReadNetCDF4.openDataset(self, file)
+        status_code = '0' # If no errors occoured in the data extraction, the status code is 0
+        source_list = []
+
+        # Boolean whether all entries are errors
+        all_errors = True
+
+        try:
+            source_ndarray = ReadNetCDF4.readObservations(self, data_set['Source'])
+            
+            for element in range(0, len(source_ndarray)):
+
+                try:
+                    source = ''
+
+                    # Decoding sources from a numpy.ndarray and adding to a list
+                    for character in source_ndarray[element]:
+                        source = source + str(character.decode('UTF-8'))
+                        
+                    # Changing the source name back to its IAU name if its labelled under its IVS common name
+                    if source in source_data.common_index:
+                        source = source_data.name[source_data.common_index[source]]
+                    
+                    # If the source is not in the common name or IAU name list, the program will 
+                    if source not in source_data.name_index and source not in source_data.common_index:
+                        self.missing_source = True
+
+                    source_list.append(source)
+
+                    all_errors = False
+                
+                # If an error occoured during the decoding of data the entry is changed to Err
+                except Exception:
+                    status_code = '1' # If some errors occoured in the data extraction, the status code is 1
+                    source_list.append('Err')
+
+            # Converting the list to an empty list if all entries are errors 
+            if all_errors == True:
+                status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+                source_list = []
+        
+        # If an error occours an empty list is returned
+        except Exception:
+            status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+            source_list = []
+    
+        return source_list, status_code
+    
+    '''
+    @extractBaseline: reads the baselines from a NetCDF file into a list
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file: NetCDF file containing baselines
+    @return: list of baselines
+    ''' 
+    def extractBaseline(self, file):
+
+        data_set = ReadNetCDF4.openDataset(self, file)
+        status_code = '0' # If no errors occoured in the data extraction, the status code is 0
+        baseline_list = []
+
+        # Boolean whether all entries are errors
+        all_errors = True
+        
+        try:
+            baseline_ndarray = ReadNetCDF4.readObservations(self, data_set['Baseline'])
+
+            for character in range(0, len(baseline_ndarray)):
+
+                try:
+                    station1 = ''
+                    station2 = ''
+            
+                    # Decoding baselines from a numpy.ndarray and adding to a list
+                    for element in baseline_ndarray[character][0]:
+                        station1 += str(element.decode('UTF-8'))
+
+                    # Replacing spaces with underscores in the unlikely event of stations having spaces within their name
+                    if len(station1.rstrip().split(' ')) != 0:
+                        station1 = station1.rstrip().replace(' ', '_') + station1.replace(station1.rstrip(), '')
+                        
+                    for element in baseline_ndarray[character][1]:
+                        station2 += str(element.decode('UTF-8'))
+
+                    # Replacing spaces with underscores in the unlikely event of stations having spaces within their name
+                    if len(station2.rstrip().split(' ')) != 0:
+                        station2 = station2.rstrip().replace(' ', '_') + station2.replace(station2.rstrip(), '')
+
+                    if station1 not in station_data.index or station2 not in station_data.index:
+                        self.missing_station = True
+            
+                    baseline_list.append((station1, station2))
+
+                    all_errors = False
+
+                # If an error occoured during the decoding of data the entry is changed to Err
+                except Exception:
+                    status_code = '1' # If some errors occoured in the data extraction, the status code is 1
+                    baseline_list.append(('Err','Err'))
+
+            # Converting the list to an empty list if all entries are errors 
+            if all_errors == True:
+                status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+                baseline_list = []
+        
+        # If an error occours an empty list is returned
+        except Exception:
+            status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+            baseline_list = []
+        
+        return baseline_list, status_code
+
+    '''
+    @extractQC: reads the quality codes (QC) from a NetCDF file into a list
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file: NetCDF file containing quality codes
+    @return: list of quality codes
+    ''' 
+    def extractQC(self, file):
+
+        data_set = ReadNetCDF4.openDataset(self, file)
+        status_code = '0' # If no errors occoured in the data extraction, the status code is 0
+        qc_list = []
+
+        # Boolean whether all entries are errors
+        all_errors = True
+        
+        try:
+            qc_ndarray = ReadNetCDF4.readObservations(self, data_set['QualityCode']) 
+            
+            # Decoding quality codes from a numpy.ndarray and adding to a list
+            for element in qc_ndarray:
+                
+                try:
+                    # Converting the quality code to a string to avoid possible error
+                    qc_list.append(str(element.decode('UTF-8')))
+
+                    all_errors = False
+                
+                # If an error occoured during the decoding of data the entry is changed to Err
+                except Exception:
+                    status_code = '1' # If some errors occoured in the data extraction, the status code is 1
+                    qc_list.append('Err')
+
+            # Converting the list to an empty list if all entries are errors 
+            if all_errors == True:
+                status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+                qc_list = []
+        
+        # If an error occours an empty list is returned
+        except Exception:
+            status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+            qc_list = []
+
+        return qc_list, status_code
+    
+    '''
+    @extractSNR: reads the signal to noise ratios (SNR) from a NetCDF file into a list
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file: NetCDF file containing signal to noise ratios
+    @return: list of signal to noise ratios
+    '''
+    def extractSNR(self,file):
+
+        data_set = ReadNetCDF4.openDataset(self, file)
+        status_code = '0' # If no errors occoured in the data extraction, the status code is 0
+        snr_list = []
+
+        # Boolean whether all entries are errors
+        all_errors = True
+
+        try:
+            snr_ndarray = ReadNetCDF4.readObservations(self, data_set['SNR'])
+            # Decoding signal to noise ratios from a numpy.ndarray and adding to a list
+            for element in snr_ndarray:
+                
+                try:
+                    snr_list.append(float(element))
+
+                    all_errors = False
+                
+                # If an error occoured during the decoding of data the entry is changed to Err
+                except Exception:
+                    status_code = '1' # If some errors occoured in the data extraction, the status code is 1
+                    snr_list.append('Err')
+
+            # Converting the list to an empty list if all entries are errors 
+            if all_errors == True:
+                status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+                snr_list = []
+        
+        # If an error occours an empty list is returned
+        except Exception:
+            status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+            snr_list = []
+            
+        return snr_list, status_code
+
+    '''
+    @extractChannelInfo: reads the channelwise amplitude and phase from a NetCDF file into float arrays
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param : NetCDF file containing the channel infomation
+    @return: an array of channelwise amplitudes, an array of channelwise phases and a boolean array of which channels are valid for each observation
+    ''' 
+    def extractChannelInfo(self, file):
+
+        data_set = ReadNetCDF4.openDataset(self, file)
+        amplitude_status_code = '0' # If no errors occoured in the data extraction, the status code is 0
+        phase_status_code = '0'
+
+        try:
+            channelwise_amplitude_phase_ndarray = ReadNetCDF4.readObservations(self, data_set['ChanAmpPhase'])
+
+            # Views of the amplitude and phase of each channel in the read data, so that the data is not copied into lists
+            channelwise_amplitude_phase_data = np.ma.getdata(channelwise_amplitude_phase_ndarray)
+            channelwise_amplitude_array = channelwise_amplitude_phase_data[:, :, 0]
+            channelwise_phase_array = channelwise_amplitude_phase_data[:, :, 1]
+
+            # An amplitude or phase is invalid if it is missing in the NetCDF file or is not a finite number
+            channelwise_missing = np.ma.getmaskarray(channelwise_amplitude_phase_ndarray)
+            amplitude_valid = ~channelwise_missing[:, :, 0] & np.isfinite(channelwise_amplitude_array)
+            phase_valid = ~channelwise_missing[:, :, 1] & np.isfinite(channelwise_phase_array)
+
+            # If some entries are invalid the status code is 1, if all the entries are invalid the status code is 2
+            if not amplitude_valid.all():
+                amplitude_status_code = '2' if not amplitude_valid.any() else '1'
+
+            if not phase_valid.all():
+                phase_status_code = '2' if not phase_valid.any() else '1'
+
+            # A channel is only valid if both its amplitude and phase are valid
+            channelwise_valid_array = amplitude_valid & phase_valid
+
+            # Determining the observing mode from the number of channels
+            if amplitude_status_code != '2':
+                if channelwise_amplitude_array.shape[1] == 32:
+                    self.observing_mode = 'VGOS'
+
+                else:
+                    self.observing_mode = 'S/X'
+
+            else:
+                self.observing_mode = ''
+
+        # If an error occours empty arrays are returned
+        except Exception:
+            amplitude_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+            phase_status_code = '2'
+            channelwise_amplitude_array = np.empty((0, 0))
+            channelwise_phase_array = np.empty((0, 0))
+            channelwise_valid_array = np.empty((0, 0), dtype=bool)
+
+        return channelwise_amplitude_array, channelwise_phase_array, channelwise_valid_array, amplitude_status_code, phase_status_code
+
+    '''
+    @extractSourceInfo: reads the source names, source coordinates and source references for all the sources used in the session from a NetCDF file into a list
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file: NetCDF file containing source information
+    @return: lists of source names, source right ascension coordinated, source declination coordinates and source references
+    ''' 
+    def extractSourceInfo(self, file):
+
+        data_set = ReadNetCDF4.openDataset(self, file)
+        names_status_code = '0' # If no errors occoured in the data extraction, the status code is 0
+        right_ascensions_status_code = '0'
+        declinations_status_code = '0'
+        references_status_code = '0'
+        
+        # Lists of source data
+        source_names = []
+        source_right_ascensions = []
+        source_declinations = []
+        source_references = []
+
+        # Boolean whether all entries are errors
+        names_all_errors = True
+        right_ascensions_all_errors = True
+        declinations_all_errors = True
+        references_all_errors = True
+
+        # Reading the three different variables from the masked array
+        try:                
+            source_ndarray = data_set['AprioriSourceList'][:]
+                
+            for element in source_ndarray:
+
+                try:           
+                    source_name = ''
+
+                    # Decoding source name from a numpy.ndarray and adding to the list
+                    for character in element:
+                        source_name += str(character.decode('UTF-8'))
+
+                    source_names.append(source_name)
+
+                    names_all_errors = False
+                
+                # If an error occoured during the decoding of data the entry is changed to Err
+                except Exception:
+                    names_status_code = '1' # If some errors occoured in the data extraction, the status code is 1
+                    source_names.append('Err')
+                
+            source_ndarray = data_set['AprioriSource2000RaDec'][:]
+                
+            for element in source_ndarray:
+                    
+                try:
+                    source_right_ascensions.append(float(element[0])) # Note the right ascension coordinate is in radians
+                    
+                    right_ascensions_all_errors = False
+
+                # If an error occoured during the decoding of data the entry is changed to Err
+                except Exception:
+                    right_ascensions_status_code = '1' # If some errors occoured in the data extraction, the status code is 1
+                    source_right_ascensions.append('Err')
+
+                try:    
+                    source_declinations.append(float(element[1])) # Note the declination coordinate is in radians
+
+                    declinations_all_errors = False
+
+                # If an error occoured during the decoding of data the entry is changed to Err
+                except Exception:
+                    declinations_status_code = '1' # If some errors occoured in the data extraction, the status code is 1
+                    source_declinations.append('Err')
+
+            source_ndarray = data_set['AprioriSourceReference'][:]
+                
+            for element in source_ndarray:
+                    
+                try:
+                    source_reference = ''
+
+                    # Decoding source reference from a numpy.ndarray and adding to the list
+                    for character in element:
+                            
+                        # Only decoding if the character is not '--'
+                        if character != b'--' and character != b' ':
+                            source_reference += str(character.decode('UTF-8'))
+
+                    source_references.append(source_reference)
+
+                    references_all_errors = False
+
+                # If an error occoured during the decoding of data the entry is changed to Err
+                except Exception:
+                    references_status_code = '1' # If some errors occoured in the data extraction, the status code is 1
+                    source_references.append('Err')            
+            
+            # Converting the list to an empty list if all entries are errors 
+            if names_all_errors == True:
+                names_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+                source_names = []
+            
+            # Converting the list to an empty list if all entries are errors 
+            if right_ascensions_all_errors == True:
+                right_ascensions_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+                source_right_ascensions = []
+
+            # Converting the list to an empty list if all entries are errors 
+            if declinations_all_errors == True:
+                declinations_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+                source_declinations = []
+
+            # Converting the list to an empty list if all entries are errors 
+            if references_all_errors == True:
+                references_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+                source_references = []
+
+        # If an error occours empty lists are returned
+        except Exception:
+            names_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+            right_ascensions_status_code = '2'
+            declinations_status_code = '2'
+            references_status_code = '2'
+            source_names = []
+            source_right_ascensions = []
+            source_declinations = []
+            source_references = []
+            
+        return source_names, source_right_ascensions, source_declinations, source_references, names_status_code, right_ascensions_status_code, declinations_status_code, references_status_code
+    
+    '''
+    @extractStationInfo: reads the station names and station coordinates for all the stations used in the session from a NetCDF file into a list
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @param file: NetCDF file containing station information
+    @return: lists of station names and station cartesian coordinates
+    ''' 
+    def extractStationInfo(self, file):
+
+        data_set = ReadNetCDF4.openDataset(self, file)
+        names_status_code = '0' # If no errors occoured in the data extraction, the status code is 0
+        coordinates_status_code = '0'
+
+        # Lists of source data
+        station_names = []
+        station_cartesian_coordinates = []
+
+        # Boolean whether all entries are errors
+        names_all_errors = True
+        coordinates_all_errors = True
+
+        # Reading the two different variables from the masked array
+        try:
+                
+            station_ndarray = data_set['AprioriStationList'][:]
+                
+            for element in station_ndarray:
+
+                try:
+                    station_name = ''
+
+                    # Decoding source name from a numpy.ndarray and adding to the list
+                    for character in element:
+                        station_name += str(character.decode('UTF-8'))
+
+                    station_names.append(station_name)
+
+                    names_all_errors = False
+
+                # If an error occoured during the decoding of data the entry is changed to Err
+                except Exception:
+                    names_status_code = '1' # If some errors occoured in the data extraction, the status code is 1
+                    station_names.append('Err')
+
+            station_ndarray = data_set['AprioriStationXYZ'][:]
+                
+            for element in station_ndarray:
+
+                try:                        
+                    coordinates = []
+
+                    # Adding each of the three coordinates to a list
+                    for coordinate in element:
+                        coordinates.append(float(coordinate))
+
+                    station_cartesian_coordinates.append(coordinates)
+
+                    coordinates_all_errors = False
+
+                # If an error occoured during the decoding of data the entry is changed to Err
+                except Exception:
+                    coordinates_status_code = '1' # If some errors occoured in the data extraction, the status code is 1
+                    station_cartesian_coordinates.append('Err')
+
+            # Converting the list to an empty list if all entries are errors 
+            if names_all_errors == True:
+                names_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+                station_names = []
+
+            # Converting the list to an empty list if all entries are errors 
+            if coordinates_all_errors == True:
+                coordinates_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+                station_cartesian_coordinates = []
+
+        # If an error occours empty lists are returned
+        except Exception:
+            names_status_code = '2' # If a fatal error occoured in the data extraction, the status code is 2
+            coordinates_status_code = '2'
+            station_names = []
+            station_cartesian_coordinates = []
+            
+        return station_names, station_cartesian_coordinates, names_status_code, coordinates_status_code
+
+    '''
+    @get_observing_mode: grabs the observing mode
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the observing mode
+    '''
+    def get_observing_mode(self):
+
+        # Determining the observing mode when it is first used, from the shape of the channel information
+        if self.observing_mode == None:
+
+            if 'ChannelInfo_bX.nc' in self.observables_files:
+                self.observing_mode = ReadNetCDF4.extractObservingMode(self, self.observables_files['ChannelInfo_bX.nc'])
+
+            else:
+                self.observing_mode = ''
+
+        return self.observing_mode
+
+    '''
+    @get_session_code: grabs the session code
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the session code
+    '''
+    def get_session_code(self):
+        return self.session_code
+
+    '''
+    @get_observation_number: grabs the total number of observations in the session
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the number of observations
+    '''
+    def get_observation_number(self):
+        return self.observation_number
+    
+    '''
+    @get_selected_observation_number: grabs the number of observations extracted, after the observation range and filter
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the number of extracted observations
+    '''
+    def get_selected_observation_number(self):
+
+        if self.observation_index is None:
+            return len(range(self.observation_number)[self.observation_range])
+
+        return len(self.observation_index)
+    
+    '''
+    @get_observation_time_UTC_list: grabs the list of UTC times
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the UTC time list
+    '''
+    def get_observation_time_UTC_list(self):
+        ReadNetCDF4.load(self, 'time_utc')
+        return self.observation_time_UTC_list
+    
+    '''
+    @get_observation_duration_bX_list: grabs the list of scan durations for X band
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the list of durations
+    '''
+    def get_observation_duration_bX_list(self):
+        ReadNetCDF4.load(self, 'duration_bX')
+        return self.observation_duration_bX_list
+    
+    '''
+    @get_observation_source_list: grabs the list of sources
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the list of sources
+    '''
+    def get_observation_source_list(self):
+        ReadNetCDF4.load(self, 'source')
+        return self.observation_source_list
+    
+    '''
+    @get_observation_baselines_list: grabs the list of baselines
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the list of baselines
+    '''
+    def get_observation_baselines_list(self):
+        ReadNetCDF4.load(self, 'baseline')
+        return self.observation_baselines_list
+    
+    '''
+    @get_observation_QC_bX_list: grabs the list of quality codes from the X band
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the list of quality codes
+    '''
+    def get_observation_QC_bX_list(self):
+        ReadNetCDF4.load(self, 'qc_bX')
+        return self.observation_QC_bX_list
+    
+    '''
+    @get_observation_QC_bS_list: grabs the list of quality codes from the S band
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the list of quality codes
+    '''
+    def get_observation_QC_bS_list(self):
+        ReadNetCDF4.load(self, 'qc_bS')
+        return self.observation_QC_bS_list
+    
+    '''
+    @get_observation_SNR_bX_list: grabs the list of signal to noise ratios from the X band
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the list of signal to noise ratios
+    '''
+    def get_observation_SNR_bX_list(self):
+        ReadNetCDF4.load(self, 'snr_bX')
+        return self.observation_SNR_bX_list
+    
+    '''
+    @get_observation_SNR_bS_list: grabs the list of signal to noise ratios from the S band
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the list of signal to noise ratios
+    '''
+    def get_observation_SNR_bS_list(self):
+        ReadNetCDF4.load(self, 'snr_bS')
+        return self.observation_SNR_bS_list
+    
+    '''
+    @get_observation_channelwise_amplitude: grabs the array of channelwise amplitude
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the array of channelwise amplitudes
+    '''
+    def get_observation_channelwise_amplitude(self):
+        ReadNetCDF4.load(self, 'chan_amp')
+        return self.observation_channelwise_amplitude
+    
+    '''
+    @get_observation_channelwise_phase: grabs the array of channelwise phase
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the array of channelwise phases
+    '''
+    def get_observation_channelwise_phase(self):
+        ReadNetCDF4.load(self, 'chan_phase')
+        return self.observation_channelwise_phase
+
+    '''
+    @get_observation_channelwise_valid: grabs the array of whether or not each channel is valid
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the boolean array of valid channels
+    '''
+    def get_observation_channelwise_valid(self):
+        ReadNetCDF4.load(self, 'chan_valid')
+        return self.observation_channelwise_valid
+    
+    '''
+    @get_source_name_list: grabs the list of source names that participated in the session
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the list of participating source names
+    '''
+    def get_source_name_list(self):
+        ReadNetCDF4.load(self, 'source_name')
+        return self.source_name_list
+    
+    '''
+    @get_source_right_ascension_list: grabs the list of the right ascension coordinates of the sources that participated in the session
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the list of participating source right ascensions
+    '''
+    def get_source_right_ascension_list(self):
+        ReadNetCDF4.load(self, 'source_ra')
+        return self.source_right_ascension_list
+    
+    '''
+    @get_source_declination_list: grabs the list of the declination coordinates of the sources that participated in the session
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the list of participating source declinations
+    '''
+    def get_source_declination_list(self):
+        ReadNetCDF4.load(self, 'source_dc')
+        return self.source_declination_list
+    
+    '''
+    @get_source_reference_list: grabs the list of the dreferences of the sources that participated in the session
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the list of participating source references
+    '''
+    def get_source_reference_list(self):
+        ReadNetCDF4.load(self, 'source_ref')
+        return self.source_reference_list
+
+    '''
+    @get_station_name_list: grabs the list of station names that participated in the session
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the list of participating station names
+    '''
+    def get_station_name_list(self):
+        ReadNetCDF4.load(self, 'station_name')
+        return self.station_name_list
+    
+    '''
+    @get_station_cartesian_coordinates_list: grabs the list of the Cartesian coordinates of the stations that participated in the session
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the list of participating station Cartesian coordinates
+    '''
+    def get_station_cartesian_coordinates_list(self):
+        ReadNetCDF4.load(self, 'station_xyz')
+        return self.station_cartesian_coordinates_list
+    
+    '''
+    @get_status_codes: grabs the status codes of all the data extractions
+
+    @param self: instance variable of the class, ReadNetCDF4
+    @return: the list of status codes, where the status code of a variable that has not been read yet is None
+    '''
+    def get_status_codes(self):
+        
+        # Calculating the missing data status code, which is only known once the sources and baselines have been read
+        if self.missing_source == True and self.missing_station == True:
+            self.status_code_missing_data = '5' # A status code of 5 is returned if missing source and station information is detected
+
+        elif self.missing_station == True:
+            self.status_code_missing_data = '4' # A status code of 4 is returned if missing station information is detected
+        
+        elif self.missing_source == True:
+            self.status_code_missing_data = '3' # A status code of 3 is returned if missing source information is detected
+
+        return {
+        'UTC time': self.status_code_time_UTC,
+        'duration': self.status_code_duration_bX,
+        'source': self.status_code_source,
+        'baseline': self.status_code_baseline,
+        'quality code (X)': self.status_code_QC_bX,
+        'quality code (S)': self.status_code_QC_bS, 
+        'signal to noise ratio (X)': self.status_code_SNR_bX,
+        'signal to noise ratio (S)': self.status_code_SNR_bS,
+        'channelwise amplitude': self.status_code_channelwise_amplitude,
+        'channelwise phase': self.status_code_channelwise_phase,
+        'missing data': self.status_code_missing_data,
+        'missing source name': self.status_code_source_name,
+        'missing source right ascension': self.status_code_right_ascension,
+        'missing source declination': self.status_code_declination,
+        'missing source reference': self.status_code_reference,
+        'missing station name': self.status_code_station_name,
+        'missing station coordinate': self.status_code_station_coordinates,
+        }
+
+    mode = property(get_observing_mode)
+    session = property(get_session_code)
+    observations = property(get_observation_number)
+    selected = property(get_selected_observation_number)
+    time_utc = property(get_observation_time_UTC_list)
+    duration_bX = property(get_observation_duration_bX_list)
+    source = property(get_observation_source_list)
+    baseline = property(get_observation_baselines_list)
+    qc_bX = property(get_observation_QC_bX_list)
+    qc_bS = property(get_observation_QC_bS_list)
+    snr_bX = property(get_observation_SNR_bX_list)
+    snr_bS = property(get_observation_SNR_bS_list)
+    chan_amp = property(get_observation_channelwise_amplitude)
+    chan_phase = property(get_observation_channelwise_phase)
+    chan_valid = property(get_observation_channelwise_valid)
+    source_name = property(get_source_name_list)
+    source_ra = property(get_source_right_ascension_list)
+    source_dc = property(get_source_declination_list)
+    source_ref = property(get_source_reference_list)
+    station_name = property(get_station_name_list)
+    station_xyz = property(get_station_cartesian_coordinates_list)
     status_code = property(get_status_codes)
\ No newline at end of file
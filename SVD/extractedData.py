@@ -0,0 +1,374 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Reads the text files of the Extracted Data folder back into columns, from the positions of the columns in the header rather than by
+    splitting on spaces, so that names padded with spaces are read whole, and converts whole folders of text files into numpy files of columns
+'''
+
+import os
+import mmap
+import multiprocessing
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from processData import EXTRACTED_DATA_DIRECTORY
+
+# Path to the folder the text files are converted into, with one numpy file of the columns of each session
+EXTRACTED_COLUMNS_DIRECTORY = os.path.join(os.path.dirname(__file__), 'Extracted Columns')
+
+# Extension of the converted files
+COLUMNS_EXTENSION = '.npz'
+
+# Text written for a number that could not be extracted or calculated, which is read as NaN
+ERROR_CELLS = [b'Err', b'--', b'']
+
+# Headers of the columns that are text, every other column is read as numbers with errors as NaN
+TEXT_COLUMNS = ['SESSION', 'SOURCE', 'STATION 1', 'STATION 2', 'QC [X]', 'QC [S] (s)', 'QC']
+
+# Headers of the columns written by ProcessSession, longest first so that a header is never taken for the start of a longer header (e.g. QC and QC [X])
+EXTRACTED_HEADERS = sorted(TEXT_COLUMNS + [
+    'TIME (MJD)',
+    'DURATION (s)',
+    'SNR [X]',
+    'SNR [S]',
+    'SNR [TOTAL]',
+    'SNR [a]',
+    'SNR [b]',
+    'SNR [c]',
+    'SNR [d]',
+    'BASELINE [PROJ.]',
+    'ANGLE [PROJ.]'
+], key = len, reverse = True)
+
+class ExtractedData:
+
+    '''
+    @__init__: ExtractedData class constructor, which reads a text file of extracted data into columns. Every row of the text file is as wide as
+        the header, with each column ending where its header ends, so the rows are read as one array of characters over the memory mapped file and
+        each column is cut out of every row at once
+
+    @param self: instance variable of the class, ExtractedData
+    @param text_file_path: path to the text file
+    '''
+    def __init__(self, text_file_path):
+
+        self.text_file_path = text_file_path
+
+        # Columns of the text file by header, in the order they were written
+        self.column_dictionary = {}
+
+        with open(text_file_path, 'rb') as text_file:
+
+            # An empty file can not be memory mapped, and has no columns
+            if os.fstat(text_file.fileno()).st_size == 0:
+                return
+
+            with mmap.mmap(text_file.fileno(), 0, access = mmap.ACCESS_READ) as text_buffer:
+
+                character_array = np.frombuffer(text_buffer, dtype = np.uint8)
+
+                try:
+                    ExtractedData.readColumns(self, character_array)
+
+                # Releasing the memory mapped file before it is closed
+                finally:
+                    del character_array
+
+    '''
+    @readColumns: reads the header and cuts each column out of the rows
+
+    @param self: instance variable of the class, ExtractedData
+    @param character_array: array of the characters of the text file
+    '''
+    def readColumns(self, character_array):
+
+        line_ends = np.flatnonzero(character_array == ord('\n'))
+
+        header_end = int(line_ends[0]) if len(line_ends) != 0 else len(character_array)
+        header = bytes(character_array[:header_end]).decode().rstrip('\r')
+
+        # A session without observations is written by pandas as a description of the empty table
+        if header.startswith('Empty DataFrame'):
+
+            for line in bytes(character_array).decode().splitlines():
+                if line.startswith('Columns: [') and line.endswith(']'):
+                    self.column_dictionary = {column: np.array([], dtype = str if column in TEXT_COLUMNS else float) for column in line[len('Columns: ['):-1].split(', ') if column != ''}
+
+            return
+
+        column_spans = ExtractedData.columnSpans(header)
+
+        row_array = ExtractedData.rowArray(character_array, header_end, line_ends)
+
+        for column, (column_start, column_end) in column_spans.items():
+
+            # Cutting the column out of every row as fixed width strings, and removing the spaces it is padded with
+            cells = np.char.strip(np.ascontiguousarray(row_array[:, column_start:column_end]).view(f'S{column_end - column_start}').ravel())
+
+            if column in TEXT_COLUMNS:
+                self.column_dictionary[column] = ExtractedData.toText(cells)
+
+            else:
+                self.column_dictionary[column] = ExtractedData.toNumbers(cells)
+
+    '''
+    @columnSpans: finds where each column starts and ends from the header, where each header is right aligned to the end of its column.
+        Headers that ProcessSession does not write are taken to be one word
+
+    @param header: the header of the text file
+    @return: dictionary of the headers to the start and end of their columns
+    '''
+    def columnSpans(header):
+
+        column_spans = {}
+        column_start = 0
+        position = 0
+
+        while position < len(header):
+
+            # Skipping the spaces between headers
+            if header[position] == ' ':
+                position += 1
+                continue
+
+            for column in EXTRACTED_HEADERS:
+                if header.startswith(column, position) and header[position + len(column):position + len(column) + 1] in ('', ' '):
+                    break
+
+            else:
+                column = header[position:].split(' ')[0]
+
+            position += len(column)
+
+            column_spans[column] = (column_start, position)
+            column_start = position
+
+        return column_spans
+
+    '''
+    @rowArray: arranges the rows of the text file below the header as a two dimensional array of characters. Rows as wide as the header are
+        viewed in place, rows of another width (e.g. from a file edited by hand) are padded to the width of the header
+
+    @param character_array: array of the characters of the text file
+    @param header_end: position of the end of the header
+    @param line_ends: positions of the ends of the lines
+    @return: array of the characters of each row
+    '''
+    def rowArray(character_array, header_end, line_ends):
+
+        row_width = header_end
+        row_start = header_end + 1
+        row_count = -(-(len(character_array) - row_start) // (row_width + 1)) if len(character_array) > row_start else 0
+
+        # Viewing the rows in place if they are all as wide as the header, where the last row may or may not end with a new line
+        if row_count > 0 and len(character_array) - row_start in (row_count * (row_width + 1) - 1, row_count * (row_width + 1)):
+
+            row_line_ends = line_ends[1:]
+
+            if len(row_line_ends) >= row_count - 1 and np.array_equal(row_line_ends[:row_count - 1], row_start + row_width + np.arange(row_count - 1) * (row_width + 1)):
+                return np.lib.stride_tricks.as_strided(character_array[row_start:], shape = (row_count, row_width), strides = (row_width + 1, 1), writeable = False)
+
+        row_list = [row.ljust(row_width)[:row_width] for row in bytes(character_array[row_start:]).split(b'\n') if row.strip() != b'']
+
+        return np.frombuffer(b''.join(row_list), dtype = np.uint8).reshape(len(row_list), row_width)
+
+    '''
+    @toText: converts a column of bytes into text, which is ASCII for the names written by ProcessSession
+
+    @param cells: array of the bytes of the column
+    @return: array of the text
+    '''
+    def toText(cells):
+
+        try:
+            return cells.astype(str)
+
+        # Decoding the column as UTF-8 if it is not ASCII
+        except UnicodeDecodeError:
+            return np.char.decode(cells, 'utf-8')
+
+    '''
+    @toNumbers: converts a column of text into numbers, where errors (e.g. Err) become NaN
+
+    @param cells: array of the text of the column
+    @return: array of the numbers
+    '''
+    def toNumbers(cells):
+
+        try:
+            return np.where(np.isin(cells, ERROR_CELLS), b'nan', cells).astype(float)
+
+        # Converting each distinct text once if some of the column are errors
+        except ValueError:
+
+            unique_cells, cell_index = np.unique(cells, return_inverse = True)
+            unique_numbers = np.empty(len(unique_cells), dtype = float)
+
+            for position, cell in enumerate(unique_cells):
+
+                try:
+                    unique_numbers[position] = float(cell)
+
+                except ValueError:
+                    unique_numbers[position] = np.nan
+
+            return unique_numbers[cell_index]
+
+    '''
+    @columnsPath: grabs the path to the converted file of a session
+
+    @param session: name of the session
+    @param columns_directory: path to the folder of the converted files
+    @return: path to the converted file
+    '''
+    def columnsPath(session, columns_directory = EXTRACTED_COLUMNS_DIRECTORY):
+        return os.path.join(columns_directory, session + COLUMNS_EXTENSION)
+
+    '''
+    @isTextFile: determines whether or not a file in the Extracted Data folder is the text file of a session, rather than a manifest or the readme
+
+    @param directory: path to the folder
+    @param file_name: name of the file
+    @return: whether or not the file is a text file of a session
+    '''
+    def isTextFile(directory, file_name):
+        return file_name.startswith('.') == False and '.' not in file_name and os.path.isfile(os.path.join(directory, file_name))
+
+    '''
+    @loadExtracted: loads the extracted data of a session, from its converted file if it is as recent as the text file, otherwise from the text file
+
+    @param session: name of the session (e.g. 20200109-VO0009), or its session code (e.g. VO0009)
+    @param directory: path to the folder of the text files
+    @param columns_directory: path to the folder of the converted files
+    @return: dataframe of the columns of the session
+    '''
+    def loadExtracted(session, directory = EXTRACTED_DATA_DIRECTORY, columns_directory = EXTRACTED_COLUMNS_DIRECTORY):
+
+        text_file_path = os.path.join(directory, session)
+        columns_path = ExtractedData.columnsPath(session, columns_directory)
+
+        # Finding the session by its session code
+        if os.path.exists(text_file_path) == False and os.path.exists(columns_path) == False:
+
+            session_list = sorted(set(
+                [file_name for file_name in (os.listdir(directory) if os.path.isdir(directory) else []) if ExtractedData.isTextFile(directory, file_name)] +
+                [file_name[:-len(COLUMNS_EXTENSION)] for file_name in (os.listdir(columns_directory) if os.path.isdir(columns_directory) else []) if file_name.endswith(COLUMNS_EXTENSION)]
+            ))
+
+            matching_session_list = [name for name in session_list if name.upper().endswith('-' + session.upper())]
+
+            if len(matching_session_list) != 1:
+                raise FileNotFoundError(f'{session} is not a session in the Extracted Data folder' if len(matching_session_list) == 0 else f'{session} matches the sessions {", ".join(matching_session_list)}')
+
+            return ExtractedData.loadExtracted(matching_session_list[0], directory, columns_directory)
+
+        if os.path.exists(columns_path) and (os.path.exists(text_file_path) == False or os.path.getmtime(columns_path) >= os.path.getmtime(text_file_path)):
+
+            with np.load(columns_path) as columns_file:
+                return pd.DataFrame({column: columns_file[column] for column in columns_file.files})
+
+        return pd.DataFrame(ExtractedData(text_file_path).columns)
+
+    '''
+    @convertFile: converts a text file into a numpy file of its columns, which replaces the converted file of an earlier conversion in one step
+
+    @param text_file_path: path to the text file
+    @param columns_directory: path to the folder of the converted files
+    @return: path to the converted file
+    '''
+    def convertFile(text_file_path, columns_directory = EXTRACTED_COLUMNS_DIRECTORY):
+
+        columns_path = ExtractedData.columnsPath(os.path.basename(text_file_path), columns_directory)
+
+        with open(columns_path + '.partial', 'wb') as columns_file:
+            np.savez(columns_file, **ExtractedData(text_file_path).columns)
+
+        os.replace(columns_path + '.partial', columns_path)
+
+        return columns_path
+
+    '''
+    @convertDirectory: converts every text file of a folder that has not been converted since it was written, in separate processes
+
+    @param directory: path to the folder of the text files
+    @param columns_directory: path to the folder of the converted files
+    @param worker_count: number of processes the text files are converted in
+    @return: dictionary of the sessions converted to their converted file, and of the sessions that could not be converted to their error
+    '''
+    def convertDirectory(directory = EXTRACTED_DATA_DIRECTORY, columns_directory = EXTRACTED_COLUMNS_DIRECTORY, worker_count = 1):
+
+        os.makedirs(columns_directory, exist_ok = True)
+
+        outcome_dictionary = {'converted': {}, 'failed': {}}
+
+        session_list = []
+
+        # Skipping the text files that have not changed since they were converted
+        for file_name in sorted(os.listdir(directory)):
+
+            if ExtractedData.isTextFile(directory, file_name) == False:
+                continue
+
+            columns_path = ExtractedData.columnsPath(file_name, columns_directory)
+
+            if os.path.exists(columns_path) == False or os.path.getmtime(columns_path) < os.path.getmtime(os.path.join(directory, file_name)):
+                session_list.append(file_name)
+
+        print(f'Converting {len(session_list)} text file(s) into {columns_directory}...')
+
+        if len(session_list) == 0:
+            return outcome_dictionary
+
+        # Converting one text file at a time in this process if there is only one worker or one text file
+        if worker_count <= 1 or len(session_list) == 1:
+            future_list = None
+
+        else:
+            executor = ProcessPoolExecutor(max_workers = min(worker_count, len(session_list)), mp_context = multiprocessing.get_context('spawn'))
+            future_list = [executor.submit(ExtractedData.convertFile, os.path.join(directory, session), columns_directory) for session in session_list]
+
+        try:
+            for position, session in enumerate(session_list):
+
+                try:
+                    if future_list == None:
+                        outcome_dictionary['converted'][session] = ExtractedData.convertFile(os.path.join(directory, session), columns_directory)
+
+                    else:
+                        outcome_dictionary['converted'][session] = future_list[position].result()
+
+                # A text file that can not be read is reported, and the other text files are still converted
+                except Exception as error:
+                    print(f'{session} could not be converted: {error}')
+                    outcome_dictionary['failed'][session] = str(error)
+
+        finally:
+            if future_list != None:
+                executor.shutdown(wait = True, cancel_futures = True)
+
+        print(f'{len(outcome_dictionary["converted"])} text file(s) converted and {len(outcome_dictionary["failed"])} text file(s) failed')
+
+        return outcome_dictionary
+
+    '''
+    @get_text_file_path: grabs the path to the text file
+
+    @param self: instance variable of the class, ExtractedData
+    @return: path to the text file
+    '''
+    def get_text_file_path(self):
+        return self.text_file_path
+
+    '''
+    @get_column_dictionary: grabs the columns of the text file
+
+    @param self: instance variable of the class, ExtractedData
+    @return: dictionary of the headers to the array of each column
+    '''
+    def get_column_dictionary(self):
+        return self.column_dictionary
+
+    path = property(get_text_file_path)
+    columns = property(get_column_dictionary)
@@ -1,33 +1,58 @@
-#!/usr/bin/env python
-# -*- coding: utf-8 -*-
-'''
-@author: Zachary Allen
-@supervisor: Tiege McCarthy
-@function: Takes individual data lists and header names, and turns the data into a txt file
-'''
-
-import os
-import pandas as pd
-
-class CreateTextFile:
-
-    '''
-    @__init__: CreateTextFile class constructor
-
-    @param self: instance variable of the class, CreateTextFile
-    @param data: data to be formatted into a txt file
-    @param path_to_directory: path of the directory of the intended file
-    @param file_name: intended name of the file
-    @param header: the header of the data
-    '''
-    def __init__(self, data, path_to_directory, file_name, header = None):
-        
-        # Converting the data into a dataframe using pandas
-        data_frame = pd.DataFrame(data, columns = header)
-
-        # Creating the full txt file path
-        write_path = os.path.join(path_to_directory, file_name )
-
-        # Writing the dataframe as a text file under the name of the session code, and placing it into the Extracted Data directory
-        with open(write_path, 'w') as data_file:
-            data_file.write(data_frame.to_string(index=False))
\ No newline at end of file
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Takes individual data lists and header names, and turns the data into a txt file
+'''
+
+import os
+import pandas as pd
+
+class CreateTextFile:
+
+    '''
+    @__init__: CreateTextFile class constructor
+
+    @param self: instance variable of the class, CreateTextFile
+    @param data: data to be formatted into a txt file
+    @param path_to_directory: path of the directory of the intended file
+    @param file_name: intended name of the file
+    @param header: the header of the data
+    @param append: whether the data is appended to an existing file (without the header) rather than overwriting it
+    @param column_width: minimum width of every column, or the width of each column of the rows already written when appending, 
+        needed so that columns of appended data line up with the rows already written
+    '''
+    def __init__(self, data, path_to_directory, file_name, header = None, append = False, column_width = None):
+        
+        # Converting the data into a dataframe using pandas
+        data_frame = pd.DataFrame(data, columns = header)
+
+        # Creating the full txt file path
+        write_path = os.path.join(path_to_directory, file_name )
+
+        # Width of each column as written, which data appended later is written with
+        self.column_widths = None
+
+        # Writing the dataframe as a text file under the name of the session code, and placing it into the Extracted Data directory
+        if append == False:
+            with open(write_path, 'w') as data_file:
+                data_file.write(data_frame.to_string(index=False, col_space=column_width))
+
+            # Measuring each column on its own, as pandas formats each column independently of the others
+            if column_width != None:
+                self.column_widths = [len(data_frame.iloc[:, [position]].to_string(index=False, col_space=column_width).split('\n', 1)[0]) for position in range(len(data_frame.columns))]
+
+        # Appending the dataframe to the end of the existing text file, the header has already been written with the first rows
+        else:
+            data_text = data_frame.to_string(index=False, header=False, col_space=column_width)
+
+            # A value wider than its column widens the column, which would shift the columns of the appended rows out from under the header. 
+            # The text file is read by the position of its columns (see ExtractedData), so the rows are refused rather than appended out of line
+            if isinstance(column_width, list) and len(data_text.split('\n', 1)[0]) != sum(column_width) + len(column_width) - 1:
+                raise ValueError(f'The appended rows of {file_name} have a value wider than its column, so they would not line up with the rows already written. Increase CHUNK_COLUMN_WIDTH or process the session without chunks')
+
+            with open(write_path, 'a') as data_file:
+                data_file.write('\n' + data_text)
+
+            self.column_widths = column_width
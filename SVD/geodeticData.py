@@ -1,193 +1,876 @@
-#!/usr/bin/env python
-# -*- coding: utf-8 -*-
-'''
-@author: Zachary Allen
-@supervisor: Tiege McCarthy
-@function: Extracts relevant geodetic radio telescope and source data into python lists
-'''
-
-import os
-from astropy.table import Table
-from numerical import NumberMethods
-
-number_functions = NumberMethods()
-
-STATION_DATA_FILE = os.path.join(os.path.dirname(__file__),'geodetic.station.catalogue')
-SOURCE_DATA_FILE = os.path.join(os.path.dirname(__file__), 'geodetic.source.catalogue')
-STATION_CHARACTER_LENGTH = 8
-SOURCE_CHARACTER_LENGTH = 8
-
-class ExtractStationCatalogue:
-
-    '''
-    @__init__: ExtractStationCatalogue class constructor
-
-    @param self: instance variable of the class, ExtractStationCatalogue
-    '''
-    def __init__(self):
-
-        self.station_name_list = []
-        self.station_cartesian_coordinates_list = []
-        self.station_geographic_coordinates_list = []
-
-        # Converting the STATION_DATA_FILE ascii table to a data frame
-        station_info = Table.read(
-            STATION_DATA_FILE, 
-            format='ascii.csv', 
-            delimiter=' ', 
-            comment='*',
-            data_start= 0, 
-            names=['ID', 'Name', 'X (m)', 'Y (m)', 'Z (m)', 'Occ.Code', 'Longitude', 'Latitude', 'Origin', '']
-            )
-        
-        for station in station_info:
-            
-            # Extracting station name
-            station_name = str(station[1])
-
-            # Adding necessary whitespace for station name to be 8 characters long
-            for i in range(len(station[1]), STATION_CHARACTER_LENGTH):
-                station_name += ' '
-
-            self.station_name_list.append(station_name)
-
-            # Extracting the cartesian coordinates
-            self.station_cartesian_coordinates_list.append([
-                float(station[2]),
-                float(station[3]),
-                float(station[4])
-            ])
-
-            # Extracting the geographic coordinates
-            self.station_geographic_coordinates_list.append([
-                float(station[6]),
-                float(station[7])
-            ])
-
-    '''
-    @get_station_name_list: grabs list of station names
-
-    @param self: instance variable of the class, ExtractStationCatalogue
-    @return: list of station names
-    '''
-    def get_station_name_list(self):
-        return self.station_name_list
-    
-    '''
-    @get_cartesian_station_coordinates_list: grabs list of cartesian station coordinates
-
-    @param self: instance variable of the class, ExtractStationCatalogue
-    @return: list of station coordinates
-    '''
-    def get_cartesian_station_coordinates_list(self):
-        return self.station_cartesian_coordinates_list
-    
-    '''
-    @get_geographic_station_coordinates_list: grabs list of geographic station coordinates
-
-    @param self: instance variable of the class, ExtractStationCatalogue
-    @return: list of geographic station coordinates
-    '''
-    def get_geographic_station_coordinates_list(self):
-        return self.station_geographic_coordinates_list
-    
-    name = property(get_station_name_list)
-    cartesian = property(get_cartesian_station_coordinates_list)
-    geographic = property(get_geographic_station_coordinates_list)
-
-class ExtractSourceCatalogue:
-    
-    '''
-    @__init__: ExtractSourceCatalogue class constructor
-
-    @param self: instance variable of the class, ExtractSourceCatalogue
-    '''
-    def __init__(self):
-        self.source_IAU_name_list=[]
-        self.source_common_name_list = []
-        self.declination_list=[]
-        self.right_ascension_list=[]
-        
-        # Converting the SOURCE_DATA_FILE ascii table to a data frame
-        source_info = Table.read(
-            SOURCE_DATA_FILE, 
-            format='ascii.csv', 
-            delimiter=' ', 
-            comment='*', 
-            data_start= 0, 
-            names=['IAU-Name', 'Common', 'RA hh', 'RA mm', 'RA ss.ssss', 'DC sdd', 'DC mm', 'DC ss.sssss', 'epoch year', 'epoch time', '0.0', 'source']
-            )
-        
-        for source in source_info:
-            
-            # Extracting source IAU and common name and formatting with the correct amout of whitespace
-            for name in range(2):
-
-                # Extracting the selected source name
-                source_name = source[name]
-
-                # Checking the source is not a null entry ($)
-                if source_name != '$':
-
-                    # Adding necessary whitespace for source name to be 8 characters long
-                    for i in range(len(source_name), SOURCE_CHARACTER_LENGTH):
-                        source_name += ' '
-
-                else:
-                    source_name = ' ' * SOURCE_CHARACTER_LENGTH
-
-                # Adding the source name to the appropriate list
-                if name == 0:
-                    self.source_IAU_name_list.append(source_name)
-
-                else:
-                    self.source_common_name_list.append(source_name)
-
-            # Extracting right ascension and converting from hours-minutes-seconds to decimal degrees
-            self.right_ascension_list.append(
-                number_functions.hmsDecimal(*source[2:5]))
-
-            # Extracting declination and converting from degrees-minutes-seconds to decimal degrees
-            self.declination_list.append(
-                number_functions.dmsDecimal(*source[5:8]))
-
-    '''
-    @get_source_IAU_name_list: grabs list of source names
-
-    @param self: instance variable of the class, ExtractSourceCatalogue
-    @return: list of source names
-    '''
-    def get_source_IAU_name_list(self):
-        return self.source_IAU_name_list
-    
-    '''
-    @get_source_common_name_list: grabs list of source common names
-
-    @param self: instance variable of the class, ExtractSourceCatalogue
-    @return: list of source names
-    '''
-    def get_source_common_name_list(self):
-        return self.source_common_name_list
-    
-    '''
-    @get_right_ascension_list: grabs list of source right ascensions
-
-    @param self: instance variable of the class, ExtractSourceCatalogue
-    @return: list of sources right ascension angles
-    '''
-    def get_right_ascension_list(self):
-        return self.right_ascension_list
-    
-    '''
-    @get_right_declination_list: grabs list of source declinations
-
-    @param self: instance variable of the class, SourceData
-    @return: list of sources declination angles
-    '''
-    def get_declination_list(self):
-        return self.declination_list
-    
-    name = property(get_source_IAU_name_list)
-    common = property(get_source_common_name_list)
-    right_ascension = property(get_right_ascension_list)
-    declination = property(get_declination_list)
\ No newline at end of file
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Extracts relevant geodetic radio telescope and source data into python lists
+'''
+
+import os
+import json
+import time
+import uuid
+import shutil
+import socket
+import tempfile
+import threading
+import numpy as np
+from datetime import datetime
+from astropy.table import Table
+from numerical import NumberMethods
+from sharedArrays import SharedArrays, SharedIndex
+
+number_functions = NumberMethods()
+
+STATION_DATA_FILE = os.path.join(os.path.dirname(__file__),'geodetic.station.catalogue')
+SOURCE_DATA_FILE = os.path.join(os.path.dirname(__file__), 'geodetic.source.catalogue')
+STATION_CHARACTER_LENGTH = 8
+SOURCE_CHARACTER_LENGTH = 8
+
+# Seconds to wait for another process to finish updating a catalogue, and the age after which a left over lock file is ignored
+CATALOGUE_LOCK_TIMEOUT = 60
+CATALOGUE_LOCK_STALE = 300
+CATALOGUE_LOCK_POLL = 0.05
+
+# Seconds between the process holding the lock of a catalogue touching the lock file, which keeps the lock from becoming stale while it is held
+CATALOGUE_LOCK_HEARTBEAT = 10
+
+# Environment variable holding the descriptor of the catalogues shared by the process that started this one, which are attached to rather than read again
+SHARED_CATALOGUE_VARIABLE = 'SVD_SHARED_CATALOGUE'
+
+class CatalogueFile:
+
+    '''
+    @__init__: CatalogueFile class constructor, keeps track of how much of a catalogue file has been read and of its version, 
+        so that rows added by other SVD processes are found by reading a small version file rather than the whole catalogue
+
+    @param self: instance variable of the class, CatalogueFile
+    @param path: path to the catalogue file
+    '''
+    def __init__(self, path):
+
+        self.path = path
+        self.lock_path = path + '.lock'
+        self.version_path = path + '.version'
+
+        # Version of the catalogue and number of bytes of it that have been read
+        self.version = 0
+        self.offset = 0
+
+        # Token written into the lock by this process while it holds the lock, and the event that stops the heartbeat of the lock once it is released
+        self.lock_token = None
+        self.heartbeat_stop = None
+
+    '''
+    @readVersion: reads the version of the catalogue, which is increased by one every time rows are added to the catalogue
+
+    @param self: instance variable of the class, CatalogueFile
+    @return: version of the catalogue, 0 if it has never been updated
+    '''
+    def readVersion(self):
+
+        try:
+            with open(self.version_path, 'r') as version_file:
+                return int(version_file.read().split()[0])
+
+        except (FileNotFoundError, IndexError, ValueError):
+            return 0
+
+    '''
+    @read: reads the whole catalogue file
+
+    @param self: instance variable of the class, CatalogueFile
+    @return: text of the catalogue file
+    '''
+    def read(self):
+
+        # The version is read before the catalogue, so that a catalogue updated in between is at worst read again
+        self.version = CatalogueFile.readVersion(self)
+
+        with open(self.path, 'rb') as catalogue_file:
+            contents = catalogue_file.read()
+
+        self.offset = len(contents)
+
+        return contents.decode()
+
+    '''
+    @readNewRows: reads the rows that other processes have added to the catalogue since it was last read
+
+    @param self: instance variable of the class, CatalogueFile
+    @return: list of the columns of each new row, None if the catalogue was changed in some other way and needs to be read again
+    '''
+    def readNewRows(self):
+
+        version = CatalogueFile.readVersion(self)
+
+        # Nothing has been added if the version has not changed
+        if version == self.version:
+            return []
+
+        with open(self.path, 'rb') as catalogue_file:
+            contents = catalogue_file.read()
+
+        # The catalogue has been rewritten rather than added to
+        if len(contents) < self.offset:
+            return None
+
+        new_contents = contents[self.offset:].decode()
+
+        self.version = version
+        self.offset = len(contents)
+
+        # Splitting each row into its columns, skipping comments and empty lines in the same way as the catalogue is first read
+        return [line.split() for line in new_contents.splitlines() if line.strip() != '' and not line.lstrip().startswith('*')]
+
+    '''
+    @append: adds text to the end of the catalogue by writing a new copy of the catalogue and renaming it over the old one, 
+        so that other processes never read a partly written catalogue, and then increases the version. 
+        Must be called while holding the lock of the catalogue
+
+    @param self: instance variable of the class, CatalogueFile
+    @param text: text to add, with lines ending in a newline
+    '''
+    def append(self, text):
+
+        # Refusing to update the catalogue if another process has broken the lock and taken it (e.g. after this process was paused)
+        if self.lock_token == None or CatalogueFile.readLock(self.lock_path) != self.lock_token:
+            raise RuntimeError(f'The lock of {os.path.basename(self.path)} was taken by another process, so {os.path.basename(self.path)} was not updated')
+
+        with open(self.path, 'rb') as catalogue_file:
+            contents = catalogue_file.read()
+
+        # Keeping the line endings already used by the catalogue
+        if b'\r\n' in contents:
+            text = text.replace('\n', '\r\n')
+
+        contents += text.encode()
+
+        CatalogueFile.replace(self, self.path, contents)
+
+        self.version = CatalogueFile.readVersion(self) + 1
+        self.offset = len(contents)
+
+        CatalogueFile.replace(self, self.version_path, f'{self.version}\n'.encode())
+
+    '''
+    @replace: writes a file to a temporary file in the same directory and renames it over the file in one step
+
+    @param self: instance variable of the class, CatalogueFile
+    @param path: path to the file
+    @param contents: bytes written to the file
+    '''
+    def replace(self, path, contents):
+
+        temporary_file, temporary_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', dir=os.path.dirname(path))
+
+        try:
+            with os.fdopen(temporary_file, 'wb') as temporary_file:
+                temporary_file.write(contents)
+                temporary_file.flush()
+                os.fsync(temporary_file.fileno())
+
+            # Keeping the permissions of the file being replaced
+            if os.path.exists(path):
+                shutil.copymode(path, temporary_path)
+
+            os.replace(temporary_path, path)
+
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+    '''
+    @__enter__: takes the lock of the catalogue, waiting for any other process updating the catalogue to finish. 
+        The lock is a file created only if it does not already exist, which works the same on every platform, 
+        holding a token unique to this process and lock so that the lock is only released or touched by its holder
+
+    @param self: instance variable of the class, CatalogueFile
+    @return: instance variable of the class, CatalogueFile
+    '''
+    def __enter__(self):
+
+        wait_start = time.monotonic()
+
+        while True:
+            try:
+                lock_token = f'{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}'
+
+                lock_file = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(lock_file, lock_token.encode())
+                os.close(lock_file)
+
+                self.lock_token = lock_token
+
+                # Touching the lock while the catalogue is updated, so that the lock only becomes stale once its process has stopped
+                self.heartbeat_stop = threading.Event()
+                threading.Thread(target = CatalogueFile.heartbeat, args = (self, lock_token, self.heartbeat_stop), daemon = True).start()
+
+                return self
+
+            except FileExistsError:
+
+                # Breaking a lock left behind by a process that stopped while updating the catalogue
+                try:
+                    if time.time() - os.path.getmtime(self.lock_path) > CATALOGUE_LOCK_STALE:
+                        CatalogueFile.breakLock(self)
+                        continue
+
+                except FileNotFoundError:
+                    continue
+
+                if time.monotonic() - wait_start > CATALOGUE_LOCK_TIMEOUT:
+                    raise TimeoutError(f'Timed out waiting for another process to finish updating {os.path.basename(self.path)}, remove {self.lock_path} if no other SVD process is running')
+
+                time.sleep(CATALOGUE_LOCK_POLL)
+
+    '''
+    @readLock: reads the token of the process holding a lock
+
+    @param lock_path: path to the lock file
+    @return: the token, None if there is no lock
+    '''
+    def readLock(lock_path):
+
+        try:
+            with open(lock_path, 'r') as lock_file:
+                return lock_file.read().strip()
+
+        except FileNotFoundError:
+            return None
+
+    '''
+    @breakLock: removes a stale lock by moving it aside, which only one process can do, and checking its token and age again once it has been moved, 
+        as its process may have touched it, or another process may have broken it and taken a fresh lock, in between
+
+    @param self: instance variable of the class, CatalogueFile
+    '''
+    def breakLock(self):
+
+        stale_path = f'{self.lock_path}.{socket.gethostname()}.{os.getpid()}.stale'
+        stale_token = CatalogueFile.readLock(self.lock_path)
+
+        os.rename(self.lock_path, stale_path)
+
+        if CatalogueFile.readLock(stale_path) != stale_token or time.time() - os.path.getmtime(stale_path) <= CATALOGUE_LOCK_STALE:
+
+            # Putting the fresh lock back, unless another process has taken the lock since
+            try:
+                os.link(stale_path, self.lock_path)
+
+            except FileExistsError:
+                pass
+
+        os.remove(stale_path)
+
+    '''
+    @heartbeat: touches the lock of the catalogue until it is released, stopping if the lock is no longer held by this process
+
+    @param self: instance variable of the class, CatalogueFile
+    @param lock_token: token written into the lock when it was taken
+    @param heartbeat_stop: event that is set when the lock is released
+    '''
+    def heartbeat(self, lock_token, heartbeat_stop):
+
+        while heartbeat_stop.wait(CATALOGUE_LOCK_HEARTBEAT) == False:
+
+            if CatalogueFile.readLock(self.lock_path) != lock_token:
+                return
+
+            try:
+                os.utime(self.lock_path)
+
+            except FileNotFoundError:
+                return
+
+    '''
+    @__exit__: stops the heartbeat of the lock and releases the lock of the catalogue, unless another process has broken the lock and taken it
+
+    @param self: instance variable of the class, CatalogueFile
+    '''
+    def __exit__(self, exception_type, exception, traceback):
+
+        if self.heartbeat_stop != None:
+            self.heartbeat_stop.set()
+
+        if self.lock_token != None and CatalogueFile.readLock(self.lock_path) == self.lock_token:
+
+            try:
+                os.remove(self.lock_path)
+
+            except FileNotFoundError:
+                pass
+
+        self.lock_token = None
+
+class ExtractStationCatalogue:
+
+    '''
+    @__init__: ExtractStationCatalogue class constructor
+
+    @param self: instance variable of the class, ExtractStationCatalogue
+    @param shared_arrays: arrays of the station catalogue shared by another process from its sharedArrays, the catalogue file is read if None
+    '''
+    def __init__(self, shared_arrays = None):
+
+        self.station_name_list = []
+        self.station_cartesian_coordinates_list = []
+        self.station_geographic_coordinates_list = []
+
+        # Index of each station name in the lists, so that stations are found without searching the lists
+        self.station_index = {}
+
+        # Whether or not the lists and index are read only arrays shared with other processes, which are copied before any station is added
+        self.shared = False
+
+        self.catalogue_file = CatalogueFile(STATION_DATA_FILE)
+
+        # Using the catalogue already read by another process, from the same point in the catalogue file
+        if shared_arrays != None:
+
+            self.shared = True
+            self.station_name_list = shared_arrays['station_name']
+            self.station_cartesian_coordinates_list = shared_arrays['station_cartesian']
+            self.station_geographic_coordinates_list = shared_arrays['station_geographic']
+            self.station_index = SharedIndex(shared_arrays['station_index_name'], shared_arrays['station_index_position'])
+            self.catalogue_file.version, self.catalogue_file.offset = [int(value) for value in shared_arrays['station_catalogue_state']]
+
+            return
+
+        # Converting the STATION_DATA_FILE ascii table to a data frame
+        station_info = Table.read(
+            self.catalogue_file.read(), 
+            format='ascii.csv', 
+            delimiter=' ', 
+            comment='*',
+            data_start= 0, 
+            names=['ID', 'Name', 'X (m)', 'Y (m)', 'Z (m)', 'Occ.Code', 'Longitude', 'Latitude', 'Origin', '']
+            )
+        
+        for station in station_info:
+            ExtractStationCatalogue.addStationRow(self, station)
+
+    '''
+    @addStationRow: adds a row of the station catalogue to the lists of station data
+
+    @param self: instance variable of the class, ExtractStationCatalogue
+    @param station: the columns of the catalogue row
+    '''
+    def addStationRow(self, station):
+
+        if self.shared == True:
+            ExtractStationCatalogue.unshare(self)
+            
+        # Extracting station name
+        station_name = str(station[1])
+
+        # Adding necessary whitespace for station name to be 8 characters long
+        for i in range(len(station[1]), STATION_CHARACTER_LENGTH):
+            station_name += ' '
+
+        self.station_index[station_name] = len(self.station_name_list)
+        self.station_name_list.append(station_name)
+
+        # Extracting the cartesian coordinates
+        self.station_cartesian_coordinates_list.append([
+            float(station[2]),
+            float(station[3]),
+            float(station[4])
+        ])
+
+        # Extracting the geographic coordinates
+        self.station_geographic_coordinates_list.append([
+            float(station[6]),
+            float(station[7])
+        ])
+
+    '''
+    @sharedArrays: converts the station catalogue into arrays that can be shared with other processes
+
+    @param self: instance variable of the class, ExtractStationCatalogue
+    @return: dictionary of names to the arrays of the catalogue
+    '''
+    def sharedArrays(self):
+
+        station_index_name, station_index_position = SharedIndex.createArrays(list(self.station_index.keys()), list(self.station_index.values()))
+
+        return {
+            'station_name': np.array(self.station_name_list, dtype = str),
+            'station_cartesian': np.array(self.station_cartesian_coordinates_list, dtype = float).reshape(-1, 3),
+            'station_geographic': np.array(self.station_geographic_coordinates_list, dtype = float).reshape(-1, 2),
+            'station_index_name': station_index_name,
+            'station_index_position': station_index_position,
+            'station_catalogue_state': np.array([self.catalogue_file.version, self.catalogue_file.offset], dtype = np.int64)
+        }
+
+    '''
+    @unshare: copies the shared arrays of the catalogue into lists of this process, so that stations can be added to them
+
+    @param self: instance variable of the class, ExtractStationCatalogue
+    '''
+    def unshare(self):
+
+        self.station_name_list = self.station_name_list.tolist()
+        self.station_cartesian_coordinates_list = self.station_cartesian_coordinates_list.tolist()
+        self.station_geographic_coordinates_list = self.station_geographic_coordinates_list.tolist()
+        self.station_index = {name: index for index, name in enumerate(self.station_name_list)}
+        self.shared = False
+
+    '''
+    @refresh: adds the stations that other SVD processes have added to the catalogue file since it was read
+
+    @param self: instance variable of the class, ExtractStationCatalogue
+    '''
+    def refresh(self):
+
+        new_rows = self.catalogue_file.readNewRows()
+
+        # Reading the whole catalogue again if it was changed other than by adding rows
+        if new_rows == None:
+            ExtractStationCatalogue.__init__(self)
+
+        else:
+            for station in new_rows:
+                ExtractStationCatalogue.addStationRow(self, station)
+
+    '''
+    @addStations: adds the stations of a session that are missing from the catalogue to the catalogue file and to the lists of station data
+
+    @param self: instance variable of the class, ExtractStationCatalogue
+    @param station_names: list of the names of the stations in the session
+    @param station_cartesian_coordinates: list of the cartesian coordinates of the stations in the session
+    @return: list of the names of the stations that were added
+    '''
+    def addStations(self, station_names, station_cartesian_coordinates):
+
+        # Holding the lock of the catalogue while checking for and adding missing stations, so that parallel processes do not add the same station twice
+        with self.catalogue_file:
+
+            # Stations added by other processes are no longer missing
+            ExtractStationCatalogue.refresh(self)
+
+            return ExtractStationCatalogue.appendStations(self, station_names, station_cartesian_coordinates)
+
+    '''
+    @appendStations: adds the missing stations to the catalogue file and to the lists of station data, must be called while holding the lock of the catalogue
+
+    @param self: instance variable of the class, ExtractStationCatalogue
+    @param station_names: list of the names of the stations in the session
+    @param station_cartesian_coordinates: list of the cartesian coordinates of the stations in the session
+    @return: list of the names of the stations that were added
+    '''
+    def appendStations(self, station_names, station_cartesian_coordinates):
+
+        # Index of the first entry of each station name in the session
+        session_index = {}
+        for index, name in enumerate(station_names):
+            session_index.setdefault(name, index)
+
+        # Finding the stations that are missing from the catalogue in one set operation, keeping the order of the session
+        missing_station_indices = sorted(session_index[name] for name in session_index.keys() - self.station_index.keys())
+
+        if len(missing_station_indices) == 0:
+            return []
+
+        names = np.array([station_names[index] for index in missing_station_indices], dtype=str)
+        cartesian = np.array([station_cartesian_coordinates[index] for index in missing_station_indices], dtype=float)
+
+        # Converting the cartesian coordinates to geodetic coordinates
+        latitude = np.degrees(np.arctan2(cartesian[:, 2], np.hypot(cartesian[:, 0], cartesian[:, 1])))
+        longitude = np.degrees(np.arctan2(cartesian[:, 1], cartesian[:, 0])) % 360
+
+        # Formatting every column of the new rows at once in the fixed widths of the catalogue
+        formatted_name = np.char.ljust(names, STATION_CHARACTER_LENGTH)
+        formatted_x, formatted_y, formatted_z = [np.char.mod('%13.4f', cartesian[:, axis]) for axis in range(3)]
+        formatted_longitude = np.char.mod('%6.2f', longitude)
+        formatted_latitude = np.char.mod('%7.2f', latitude)
+
+        formatted_rows = np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(
+            '-- ', formatted_name), '    '), formatted_x), '   '), formatted_y), '   '), formatted_z), '   --------  '), formatted_longitude), ' ')
+        formatted_rows = np.char.add(np.char.add(formatted_rows, formatted_latitude), ' -------\n')
+
+        # Appending the new rows to the station catalogue file
+        self.catalogue_file.append(''.join(formatted_rows))
+
+        # Adding the new rows to the lists in the same way as if the catalogue file was read again
+        for row in range(len(names)):
+            ExtractStationCatalogue.addStationRow(self, ['--', names[row], formatted_x[row], formatted_y[row], formatted_z[row], '--------', formatted_longitude[row], formatted_latitude[row]])
+
+        return names.tolist()
+
+    '''
+    @get_station_name_list: grabs list of station names
+
+    @param self: instance variable of the class, ExtractStationCatalogue
+    @return: list of station names
+    '''
+    def get_station_name_list(self):
+        return self.station_name_list
+    
+    '''
+    @get_cartesian_station_coordinates_list: grabs list of cartesian station coordinates
+
+    @param self: instance variable of the class, ExtractStationCatalogue
+    @return: list of station coordinates
+    '''
+    def get_cartesian_station_coordinates_list(self):
+        return self.station_cartesian_coordinates_list
+    
+    '''
+    @get_geographic_station_coordinates_list: grabs list of geographic station coordinates
+
+    @param self: instance variable of the class, ExtractStationCatalogue
+    @return: list of geographic station coordinates
+    '''
+    def get_geographic_station_coordinates_list(self):
+        return self.station_geographic_coordinates_list
+
+    '''
+    @get_station_index: grabs the index of each station name in the lists
+
+    @param self: instance variable of the class, ExtractStationCatalogue
+    @return: dictionary of station names to their index
+    '''
+    def get_station_index(self):
+        return self.station_index
+    
+    name = property(get_station_name_list)
+    cartesian = property(get_cartesian_station_coordinates_list)
+    geographic = property(get_geographic_station_coordinates_list)
+    index = property(get_station_index)
+
+class ExtractSourceCatalogue:
+    
+    '''
+    @__init__: ExtractSourceCatalogue class constructor
+
+    @param self: instance variable of the class, ExtractSourceCatalogue
+    @param shared_arrays: arrays of the source catalogue shared by another process from its sharedArrays, the catalogue file is read if None
+    '''
+    def __init__(self, shared_arrays = None):
+        self.source_IAU_name_list=[]
+        self.source_common_name_list = []
+        self.declination_list=[]
+        self.right_ascension_list=[]
+
+        # Index of each source IAU and common name in the lists, so that sources are found without searching the lists
+        self.source_IAU_name_index = {}
+        self.source_common_name_index = {}
+
+        # Whether or not the lists and indexes are read only arrays shared with other processes, which are copied before any source is added
+        self.shared = False
+        
+        self.catalogue_file = CatalogueFile(SOURCE_DATA_FILE)
+
+        # Using the catalogue already read by another process, from the same point in the catalogue file
+        if shared_arrays != None:
+
+            self.shared = True
+            self.source_IAU_name_list = shared_arrays['source_name']
+            self.source_common_name_list = shared_arrays['source_common']
+            self.right_ascension_list = shared_arrays['source_right_ascension']
+            self.declination_list = shared_arrays['source_declination']
+            self.source_IAU_name_index = SharedIndex(shared_arrays['source_name_index_name'], shared_arrays['source_name_index_position'])
+            self.source_common_name_index = SharedIndex(shared_arrays['source_common_index_name'], shared_arrays['source_common_index_position'])
+            self.catalogue_file.version, self.catalogue_file.offset = [int(value) for value in shared_arrays['source_catalogue_state']]
+
+            return
+
+        # Converting the SOURCE_DATA_FILE ascii table to a data frame
+        source_info = Table.read(
+            self.catalogue_file.read(), 
+            format='ascii.csv', 
+            delimiter=' ', 
+            comment='*', 
+            data_start= 0, 
+            names=['IAU-Name', 'Common', 'RA hh', 'RA mm', 'RA ss.ssss', 'DC sdd', 'DC mm', 'DC ss.sssss', 'epoch year', 'epoch time', '0.0', 'source']
+            )
+        
+        for source in source_info:
+            ExtractSourceCatalogue.addSourceRow(self, source)
+
+    '''
+    @addSourceRow: adds a row of the source catalogue to the lists of source data
+
+    @param self: instance variable of the class, ExtractSourceCatalogue
+    @param source: the columns of the catalogue row
+    '''
+    def addSourceRow(self, source):
+
+        if self.shared == True:
+            ExtractSourceCatalogue.unshare(self)
+
+        source_index = len(self.source_IAU_name_list)
+            
+        # Extracting source IAU and common name and formatting with the correct amout of whitespace
+        for name in range(2):
+
+            # Extracting the selected source name
+            source_name = str(source[name])
+
+            # Checking the source is not a null entry ($)
+            if source_name != '$':
+
+                # Adding necessary whitespace for source name to be 8 characters long
+                for i in range(len(source_name), SOURCE_CHARACTER_LENGTH):
+                    source_name += ' '
+
+            else:
+                source_name = ' ' * SOURCE_CHARACTER_LENGTH
+
+            # Adding the source name to the appropriate list
+            if name == 0:
+                self.source_IAU_name_index[source_name] = source_index
+                self.source_IAU_name_list.append(source_name)
+
+            else:
+                # Null common names are not indexed
+                if source_name.strip() != '':
+                    self.source_common_name_index[source_name] = source_index
+
+                self.source_common_name_list.append(source_name)
+
+        # Extracting right ascension and converting from hours-minutes-seconds to decimal degrees
+        self.right_ascension_list.append(
+            number_functions.hmsDecimal(*source[2:5]))
+
+        # Extracting declination and converting from degrees-minutes-seconds to decimal degrees
+        self.declination_list.append(
+            number_functions.dmsDecimal(*source[5:8]))
+
+    '''
+    @sharedArrays: converts the source catalogue into arrays that can be shared with other processes
+
+    @param self: instance variable of the class, ExtractSourceCatalogue
+    @return: dictionary of names to the arrays of the catalogue
+    '''
+    def sharedArrays(self):
+
+        source_name_index_name, source_name_index_position = SharedIndex.createArrays(list(self.source_IAU_name_index.keys()), list(self.source_IAU_name_index.values()))
+        source_common_index_name, source_common_index_position = SharedIndex.createArrays(list(self.source_common_name_index.keys()), list(self.source_common_name_index.values()))
+
+        return {
+            'source_name': np.array(self.source_IAU_name_list, dtype = str),
+            'source_common': np.array(self.source_common_name_list, dtype = str),
+            'source_right_ascension': np.array(self.right_ascension_list, dtype = float),
+            'source_declination': np.array(self.declination_list, dtype = float),
+            'source_name_index_name': source_name_index_name,
+            'source_name_index_position': source_name_index_position,
+            'source_common_index_name': source_common_index_name,
+            'source_common_index_position': source_common_index_position,
+            'source_catalogue_state': np.array([self.catalogue_file.version, self.catalogue_file.offset], dtype = np.int64)
+        }
+
+    '''
+    @unshare: copies the shared arrays of the catalogue into lists of this process, so that sources can be added to them
+
+    @param self: instance variable of the class, ExtractSourceCatalogue
+    '''
+    def unshare(self):
+
+        self.source_IAU_name_list = self.source_IAU_name_list.tolist()
+        self.source_common_name_list = self.source_common_name_list.tolist()
+        self.right_ascension_list = self.right_ascension_list.tolist()
+        self.declination_list = self.declination_list.tolist()
+        self.source_IAU_name_index = {name: index for index, name in enumerate(self.source_IAU_name_list)}
+        self.source_common_name_index = {name: index for index, name in enumerate(self.source_common_name_list) if name.strip() != ''}
+        self.shared = False
+
+    '''
+    @refresh: adds the sources that other SVD processes have added to the catalogue file since it was read
+
+    @param self: instance variable of the class, ExtractSourceCatalogue
+    '''
+    def refresh(self):
+
+        new_rows = self.catalogue_file.readNewRows()
+
+        # Reading the whole catalogue again if it was changed other than by adding rows
+        if new_rows == None:
+            ExtractSourceCatalogue.__init__(self)
+
+        else:
+            for source in new_rows:
+                ExtractSourceCatalogue.addSourceRow(self, source)
+
+    '''
+    @addSources: adds the sources of a session that are missing from the catalogue to the catalogue file and to the lists of source data
+
+    @param self: instance variable of the class, ExtractSourceCatalogue
+    @param source_names: list of the names of the sources in the session
+    @param source_right_ascensions: list of the right ascensions of the sources in the session in radians
+    @param source_declinations: list of the declinations of the sources in the session in radians
+    @param source_references: list of the references of the sources in the session
+    @param session: name of the session, used in the title line of the new rows
+    @return: list of the names of the sources that were added
+    '''
+    def addSources(self, source_names, source_right_ascensions, source_declinations, source_references, session):
+
+        # Holding the lock of the catalogue while checking for and adding missing sources, so that parallel processes do not add the same source twice
+        with self.catalogue_file:
+
+            # Sources added by other processes are no longer missing
+            ExtractSourceCatalogue.refresh(self)
+
+            return ExtractSourceCatalogue.appendSources(self, source_names, source_right_ascensions, source_declinations, source_references, session)
+
+    '''
+    @appendSources: adds the missing sources to the catalogue file and to the lists of source data, must be called while holding the lock of the catalogue
+
+    @param self: instance variable of the class, ExtractSourceCatalogue
+    @param source_names: list of the names of the sources in the session
+    @param source_right_ascensions: list of the right ascensions of the sources in the session in radians
+    @param source_declinations: list of the declinations of the sources in the session in radians
+    @param source_references: list of the references of the sources in the session
+    @param session: name of the session, used in the title line of the new rows
+    @return: list of the names of the sources that were added
+    '''
+    def appendSources(self, source_names, source_right_ascensions, source_declinations, source_references, session):
+
+        # Index of the first entry of each source name in the session
+        session_index = {}
+        for index, name in enumerate(source_names):
+            session_index.setdefault(name, index)
+
+        # Finding the sources that are missing from the catalogue in one set operation, keeping the order of the session
+        missing_source_indices = sorted(session_index[name] for name in session_index.keys() - self.source_IAU_name_index.keys() - self.source_common_name_index.keys())
+
+        if len(missing_source_indices) == 0:
+            return []
+
+        names = np.array([source_names[index] for index in missing_source_indices], dtype=str)
+        right_ascensions = np.degrees(np.array([source_right_ascensions[index] for index in missing_source_indices], dtype=float))
+        declinations = np.degrees(np.array([source_declinations[index] for index in missing_source_indices], dtype=float))
+        references = [source_references[index].replace(' ','').replace('-',' ') for index in missing_source_indices]
+
+        # Note that the common name will be used as the IAU name if only the common name is specified
+        formatted_IAU_name = np.char.ljust(names, SOURCE_CHARACTER_LENGTH)
+
+        # Adding the common name if the source name is labelled under the common name, otherwise '$' is added
+        common_name = (np.char.find(names, '-') == -1) & (np.char.find(names, '+') == -1)
+        formatted_common_name = np.where(common_name, formatted_IAU_name, '$' + ' '*7)
+
+        # Converting right ascension to hours-minutes-seconds, rounding the seconds to 6 decimal places before splitting so that rounding carries into the minutes and hours
+        right_ascension_seconds = np.round(right_ascensions / 15 * 3600, 6)
+        right_ascension_hour = (right_ascension_seconds // 3600).astype(int)
+        right_ascension_minute = ((right_ascension_seconds - right_ascension_hour * 3600) // 60).astype(int)
+        right_ascension_second = np.abs(right_ascension_seconds - right_ascension_hour * 3600 - right_ascension_minute * 60)
+
+        # Converting declination to degrees-minutes-seconds, rounding the seconds to 5 decimal places
+        declination_seconds = np.round(np.abs(declinations) * 3600, 5)
+        declination_degree = (declination_seconds // 3600).astype(int)
+        declination_minute = ((declination_seconds - declination_degree * 3600) // 60).astype(int)
+        declination_second = np.abs(declination_seconds - declination_degree * 3600 - declination_minute * 60)
+
+        # Formatting every column of the new rows at once in the fixed widths of the catalogue
+        formatted_right_ascension_hour = np.char.mod('%02d', right_ascension_hour % 24)
+        formatted_right_ascension_minute = np.char.mod('%02d', right_ascension_minute)
+        formatted_right_ascension_second = np.char.mod('%09.6f', right_ascension_second)
+        formatted_declination_degree = np.char.add(np.where(declinations < 0, '-', '+'), np.char.mod('%02d', declination_degree))
+        formatted_declination_minute = np.char.mod('%02d', declination_minute)
+        formatted_declination_second = np.char.mod('%08.5f', declination_second)
+
+        formatted_rows = np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(
+            ' ', formatted_IAU_name), ' '), formatted_common_name), '  '), formatted_right_ascension_hour), ' '), formatted_right_ascension_minute), ' '), formatted_right_ascension_second), '     ')
+        formatted_rows = np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(np.char.add(
+            formatted_rows, formatted_declination_degree), ' '), formatted_declination_minute), ' '), formatted_declination_second), ' 2000.0 0.0  '), np.array(references, dtype=str)), '\n')
+
+        # Appending a title line and the new rows to the source catalogue file
+        self.catalogue_file.append(f'* Sources used in {session[9:].upper()}/{session[:4]} added {datetime.now().strftime('%d/%m/%Y')}\n' + ''.join(formatted_rows))
+
+        # Adding the new rows to the lists in the same way as if the catalogue file was read again
+        for row in range(len(names)):
+            ExtractSourceCatalogue.addSourceRow(self, [
+                names[row], 
+                formatted_common_name[row].strip(), 
+                formatted_right_ascension_hour[row], 
+                formatted_right_ascension_minute[row], 
+                formatted_right_ascension_second[row], 
+                formatted_declination_degree[row], 
+                formatted_declination_minute[row], 
+                formatted_declination_second[row]
+            ])
+
+        return names.tolist()
+
+    '''
+    @get_source_IAU_name_list: grabs list of source names
+
+    @param self: instance variable of the class, ExtractSourceCatalogue
+    @return: list of source names
+    '''
+    def get_source_IAU_name_list(self):
+        return self.source_IAU_name_list
+    
+    '''
+    @get_source_common_name_list: grabs list of source common names
+
+    @param self: instance variable of the class, ExtractSourceCatalogue
+    @return: list of source names
+    '''
+    def get_source_common_name_list(self):
+        return self.source_common_name_list
+    
+    '''
+    @get_right_ascension_list: grabs list of source right ascensions
+
+    @param self: instance variable of the class, ExtractSourceCatalogue
+    @return: list of sources right ascension angles
+    '''
+    def get_right_ascension_list(self):
+        return self.right_ascension_list
+    
+    '''
+    @get_right_declination_list: grabs list of source declinations
+
+    @param self: instance variable of the class, SourceData
+    @return: list of sources declination angles
+    '''
+    def get_declination_list(self):
+        return self.declination_list
+
+    '''
+    @get_source_IAU_name_index: grabs the index of each source IAU name in the lists
+
+    @param self: instance variable of the class, ExtractSourceCatalogue
+    @return: dictionary of source IAU names to their index
+    '''
+    def get_source_IAU_name_index(self):
+        return self.source_IAU_name_index
+
+    '''
+    @get_source_common_name_index: grabs the index of each source common name in the lists
+
+    @param self: instance variable of the class, ExtractSourceCatalogue
+    @return: dictionary of source common names to their index
+    '''
+    def get_source_common_name_index(self):
+        return self.source_common_name_index
+    
+    name = property(get_source_IAU_name_list)
+    common = property(get_source_common_name_list)
+    right_ascension = property(get_right_ascension_list)
+    declination = property(get_declination_list)
+    name_index = property(get_source_IAU_name_index)
+    common_index = property(get_source_common_name_index)
+
+# Geodetic source and station data shared by all of SVD, so that sources and stations added to the catalogues are seen everywhere without reloading.
+# A worker process attaches to the catalogues shared by the process that started it rather than reading them again
+source_data = None
+station_data = None
+
+if os.environ.get(SHARED_CATALOGUE_VARIABLE) != None:
+
+    try:
+        shared_catalogue = SharedArrays(descriptor = json.loads(os.environ[SHARED_CATALOGUE_VARIABLE]))
+        source_data = ExtractSourceCatalogue(shared_catalogue.arrays)
+        station_data = ExtractStationCatalogue(shared_catalogue.arrays)
+
+    # Reading the catalogues if the process that shared them has ended
+    except (FileNotFoundError, ValueError, KeyError):
+        source_data = None
+
+if source_data == None:
+    source_data = ExtractSourceCatalogue()
+    station_data = ExtractStationCatalogue()
\ No newline at end of file
@@ -0,0 +1,587 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Processes a single session VgosDB into a text file of source variability data, optionally a chunk of observations at a time
+'''
+
+import os
+import time
+from pathlib import Path
+from geodeticData import source_data, station_data
+from extractData import ReadNetCDF4
+from secondaryData import ToBandwiseSNR, FindProjection, ToTimeMJD
+from formatData import CreateTextFile
+from sessionSummary import SessionSummary
+
+# Path to the folder containing the text files of extracted data
+EXTRACTED_DATA_DIRECTORY = os.path.join(os.path.dirname(__file__), 'Extracted Data')
+
+# Minimum width of each column when a session is written a chunk at a time. The later chunks are written with the widths of the columns 
+# of the first chunk written, so that the columns of all the chunks line up
+CHUNK_COLUMN_WIDTH = 20
+
+class ProcessSession:
+
+    '''
+    @__init__: ProcessSession class constructor
+
+    @param self: instance variable of the class, ProcessSession
+    @param session_directory: path to the sessions VgosDB directory
+    @param calculate_projection: whether or not to calculate the projected baseline lengths and angles
+    @param chunk_size: number of observations read, calculated and written at a time, the whole session is processed at once if None
+    @param observation_filter: ObservationFilter of the observations to process, all observations are processed if None
+    @param shared_extract: the session already read by another process, from readSession, which is processed all at once
+    @param output_directory: path to the folder the text file is written to
+    '''
+    def __init__(self, session_directory, calculate_projection = False, chunk_size = None, observation_filter = None, shared_extract = None, output_directory = EXTRACTED_DATA_DIRECTORY):
+
+        # Path to the text file the data is written to, and the folder it is written in
+        self.text_file_path = ''
+        self.output_directory = output_directory
+
+        # Whether or not the missing sources and stations of the session have already been added to the catalogues
+        self.catalogue_updated = False
+
+        # Width of each column of the text file written a chunk at a time, once the first chunk has been written
+        self.column_widths = None
+
+        # Observing mode and number of observations of the session, and the most severe status code of each extracted list across all chunks
+        self.observing_mode = None
+        self.observation_number = None
+        self.status_code_dictionary = {}
+
+        # Summary of the observations of the session across all chunks, which is recorded so that sessions are found by their sources and stations.
+        # A filtered run only writes some of the observations, so it is not summarised and the summary of an unfiltered run is kept
+        self.session_summary = SessionSummary() if observation_filter == None else None
+
+        # Seconds the session took to read and process, including reading it in another process, from which later runs estimate how long sessions take
+        self.process_seconds = None
+        process_start = time.perf_counter()
+
+        # Picking up sources and stations that other SVD processes have added to the catalogues, which only reads the catalogue versions if nothing was added
+        source_data.refresh()
+        station_data.refresh()
+
+        print(f'Extracting data from {Path(session_directory).name}...')
+
+        # Processing all the observations of the session at once
+        if chunk_size == None or shared_extract != None:
+            ProcessSession.processObservations(self, session_directory, calculate_projection, observation_filter = observation_filter, shared_extract = shared_extract)
+
+        # Processing the session a chunk of observations at a time, so that the memory used is proportional to the chunk size rather than the session size
+        else:
+            chunk_start = 0
+            observation_number = None
+
+            # The number of observations is only known once the first chunk has been read
+            while observation_number == None or chunk_start < observation_number:
+
+                observation_number = ProcessSession.processObservations(
+                    self,
+                    session_directory,
+                    calculate_projection,
+                    slice(chunk_start, chunk_start + chunk_size),
+                    append = self.text_file_path != '',
+                    column_width = CHUNK_COLUMN_WIDTH if self.column_widths == None else self.column_widths,
+                    observation_filter = observation_filter
+                )
+
+                chunk_start += chunk_size
+
+        self.process_seconds = time.perf_counter() - process_start + (0 if shared_extract == None else shared_extract.get('read_seconds', 0))
+
+        # No text file is written if no observations met the filter
+        if self.text_file_path == '':
+            print(f'No observations of {Path(session_directory).name} met the filter, so no text file was written')
+
+        else:
+            print(f'The path to the text file is: {self.text_file_path}')
+
+    '''
+    @processObservations: extracts, calculates, formats and writes the data of the selected observations of a session
+
+    @param self: instance variable of the class, ProcessSession
+    @param session_directory: path to the sessions VgosDB directory
+    @param calculate_projection: whether or not to calculate the projected baseline lengths and angles
+    @param observation_range: slice of the observations to process, all observations are processed if None
+    @param append: whether or not the data is appended to the text file written by a previous chunk
+    @param column_width: minimum width of the columns in the text file, or the width of each column when appending
+    @param observation_filter: ObservationFilter of the observations to process, all observations are processed if None
+    @param shared_extract: the session already read by another process, from readSession
+    @return: the total number of observations in the session
+    '''
+    def processObservations(self, session_directory, calculate_projection, observation_range = None, append = False, column_width = None, observation_filter = None, shared_extract = None):
+
+        # Finding the relevant files in the sessions VgosDB and the observations that meet the filter, the data of each file is only read when it is needed
+        extract = ReadNetCDF4(session_directory, observation_range, observation_filter = observation_filter, shared_extract = shared_extract)
+
+        try:
+            return ProcessSession.processExtract(self, extract, session_directory, calculate_projection, observation_range, append, column_width)
+
+        # Closing the files of the session, and removing the shared memory of a session read by another process
+        finally:
+            extract.close()
+
+    '''
+    @observationVariables: finds the variables that are written or used in calculations, the channel information is only needed for the bandwise SNR of VGOS sessions
+
+    @param observing_mode: observing mode of the session (S/X or VGOS)
+    @return: list of the names of the variables
+    '''
+    def observationVariables(observing_mode):
+
+        variables = ['time_utc', 'duration_bX', 'source', 'baseline', 'qc_bX', 'snr_bX']
+
+        if observing_mode == 'S/X':
+            variables += ['qc_bS', 'snr_bS']
+
+        elif observing_mode == 'VGOS':
+            variables += ['chan_amp']
+
+        return variables
+
+    '''
+    @readSession: reads all the observations of a session that are processed into shared memory, so that another process can process the session without reading
+        or copying them again
+
+    @param session_directory: path to the sessions VgosDB directory
+    @param observation_filter: ObservationFilter of the observations to read, all observations are read if None
+    @return: the descriptor of the shared memory and what has been read, to process with ProcessSession as shared_extract
+    '''
+    def readSession(session_directory, observation_filter = None):
+
+        print(f'Reading {Path(session_directory).name}...')
+
+        read_start = time.perf_counter()
+
+        extract = ReadNetCDF4(session_directory, observation_filter = observation_filter)
+
+        try:
+            extract.load(*ProcessSession.observationVariables(extract.mode))
+
+            shared_extract = extract.shareArrays()
+
+        finally:
+            extract.close()
+        shared_extract['read_seconds'] = time.perf_counter() - read_start
+
+        return shared_extract
+
+    '''
+    @processExtract: calculates, formats and writes the data of the observations read by a ReadNetCDF4
+
+    @param self: instance variable of the class, ProcessSession
+    @param extract: ReadNetCDF4 of the observations
+    @param session_directory: path to the sessions VgosDB directory
+    @param calculate_projection: whether or not to calculate the projected baseline lengths and angles
+    @param observation_range: slice of the observations that were read, all observations were read if None
+    @param append: whether or not the data is appended to the text file written by a previous chunk
+    @param column_width: minimum width of the columns in the text file, or the width of each column when appending
+    @return: the total number of observations in the session
+    '''
+    def processExtract(self, extract, session_directory, calculate_projection, observation_range, append, column_width):
+
+        # Extracting the data from the files concurrently, which were already read if the session was read by another process
+        extract.load(*ProcessSession.observationVariables(extract.mode))
+
+        # Displaying the progress through the session if only a chunk of observations is processed
+        if observation_range != None:
+            print(f'Processing observations {observation_range.start} to {min(observation_range.stop, extract.observations)} of {extract.observations}...')
+
+        self.observing_mode = extract.mode
+        self.observation_number = extract.observations
+
+        # Skipping the extraction and calculations if no observations met the filter
+        if extract.selected == 0:
+            return extract.observations
+
+        # Keeping the most severe status code of each list, the missing data codes of missing sources (3) and missing stations (4) combine into both (5)
+        for status_code_name, status_code in extract.status_code.items():
+
+            previous_status_code = self.status_code_dictionary.get(status_code_name)
+
+            if status_code_name == 'missing data' and {previous_status_code, status_code} == {'3', '4'}:
+                self.status_code_dictionary[status_code_name] = '5'
+
+            elif status_code != None and (previous_status_code == None or status_code > previous_status_code):
+                self.status_code_dictionary[status_code_name] = status_code
+
+        # Scanning through all the status codes of the extracted lists to check if the data was all extracted successfully
+        for status_code_name in extract.status_code:
+            
+            # An error message is displayed if a fatal error occoured in the data extraction
+            if extract.status_code[status_code_name] == '2':
+                print(f'Error! SVD could not extract the {status_code_name} data')
+
+            # A warning message is displayed if some entries were errors
+            elif extract.status_code[status_code_name] == '1':
+                print(f'Warning! SVD detected invalid entries in the {status_code_name} data')
+            
+        # If a missing source was found adding it to the catalogue file, only once per session as the apriori data is the same for every chunk
+        if (extract.status_code['missing data'] == '3' or extract.status_code['missing data'] == '5') and self.catalogue_updated == False:
+
+            # Extracting the source information of the session
+            extract.load('source_name')
+            
+            # Only proceeding if all the data was successfully extracted
+            if extract.status_code['missing source name'] == '0' and extract.status_code['missing source right ascension'] == '0' and extract.status_code['missing source declination'] == '0' and extract.status_code['missing source reference'] == '0':
+                
+                print('Formatting the missing sources...')
+
+                # Adding the missing sources to the catalogue file and the catalogue lists
+                source_data.addSources(extract.source_name, extract.source_ra, extract.source_dc, extract.source_ref, extract.session)
+
+            # If errors occoured in data extraction
+            else:
+                print('Error! could not formatt missing sources')
+
+        # If a missing station was found adding it to the catalogue file, only once per session as the apriori data is the same for every chunk
+        if (extract.status_code['missing data'] == '4' or extract.status_code['missing data'] == '5') and self.catalogue_updated == False:
+
+            # Extracting the station information of the session
+            extract.load('station_name')
+            
+            # Only proceeding if all the data was successfully extracted
+            if extract.status_code['missing station name'] == '0' and extract.status_code['missing station coordinate'] == '0':
+
+                print('Formatting the missing stations...')
+
+                # Adding the missing stations to the catalogue file and the catalogue lists
+                station_data.addStations(extract.station_name, extract.station_xyz)
+
+            # If errors occoured in data extraction
+            else:
+                print('Error! could not formatt missing stations')
+        
+        # The missing sources and stations of the session have now been added to the catalogues
+        if extract.status_code['missing data'] != '0':
+            self.catalogue_updated = True
+
+        # Only calculating bandwise SNR if the bands have not already been separated
+        if extract.mode == 'VGOS':
+
+            print('Calculating bandwise SNR...')
+
+            # Only proceeding if some of the required data exists
+            if extract.status_code['signal to noise ratio (X)'] != '2' and extract.status_code['channelwise amplitude'] != '2' and extract.status_code['channelwise phase'] != '2':
+            
+                # Calculating a list of bandwise SNR for each observation
+                snr = ToBandwiseSNR(
+                    extract.snr_bX,
+                    extract.chan_amp,
+                    extract.chan_phase,
+                    extract.chan_valid
+                )
+
+                # Giving a warning message if not all values were successfully calculated
+                if extract.status_code['signal to noise ratio (X)'] == '1' or extract.status_code['channelwise amplitude'] == '1' or extract.status_code['channelwise phase'] == '1':
+                    print('Warning! SVD detected invalid entries in the bandwise signal to noise ratio data')
+
+            else:
+                print('Error! insufficient data to calculate bandwise SNR')
+        
+        # Calculating projections only if specified
+        if calculate_projection == True:
+            
+            print('Calculating projection angles and lengths...')
+
+            # Only proceeding if some of the required data exists
+            if extract.status_code['UTC time'] != '2' and extract.status_code['source'] != '2' and extract.status_code['baseline'] != '2':
+                
+                # Calculating a list of projected baseline length and projected angle for each observation
+                projection = FindProjection(
+                    extract.time_utc,
+                    extract.source,
+                    extract.baseline
+                )
+
+                # Giving a warning message if not all values were successfully calculated
+                if extract.status_code['UTC time'] == '1' or extract.status_code['source'] == '1' or extract.status_code['baseline'] == '1':
+                    print('Warning! SVD detected invalid entries in the projection data')
+
+            else:
+                print('Error! insufficient data to calculate projections')
+
+        print('Converting UTC time to MJD time...')
+
+        # Only proceeding if some of the required data exists
+        if extract.status_code['UTC time'] != '2':
+            
+            # Converting the UTC time into MJD time
+            mjd = ToTimeMJD(
+                extract.time_utc
+            )
+
+            # Giving a warning message if not all values were successfully calculated
+            if extract.status_code['UTC time'] == '1':
+                print('Warning! SVD detected invalid entries in the MJD time data')
+
+        else:
+            print('Error! insufficient data to convert time into MJD format')
+
+        # Adding the observations to the summary of the session
+        if self.session_summary != None:
+            self.session_summary.addObservations(extract.mode, extract.source, extract.baseline, mjd.time if extract.status_code['UTC time'] != '2' else [])
+
+        # Calculating the number of observations in the session
+        observation_number = len(extract.source)
+
+        # Creating list of data
+        data_list = []
+
+        # Creating header row
+        header_row = []
+
+        print('Formatting data...')
+        
+        # Formatting data into a list of lists
+        for observation in range(observation_number):
+
+            # Creating a new row for the data list
+            data_row = []
+
+            # Adding the session name
+            try: 
+                data_row.append(extract.session)
+
+                # Adding the entry to the header
+                if observation == 0:
+                    header_row.append('SESSION')
+
+            except Exception: 
+                pass
+            
+            # Adding the observation time in mjd format
+            try: 
+                data_row.append(mjd.time[observation])
+
+                # Adding the entry to the header
+                if observation == 0:
+                    header_row.append('TIME (MJD)')
+                
+            except Exception: 
+                pass
+
+            # Adding the X band observation duration
+            try: 
+                data_row.append(extract.duration_bX[observation])
+
+                # Adding the entry to the header
+                if observation == 0:
+                    header_row.append('DURATION (s)')
+
+            except Exception: 
+                pass
+
+            # Adding the source observed for the observation
+            try: 
+
+                data_row.append(extract.source[observation])
+
+                # Adding the entry to the header
+                if observation == 0:
+                    header_row.append('SOURCE')
+
+            except Exception: 
+                pass
+            
+            # Adding the baseline of the observation
+            for telescope in range(2):
+
+                try: 
+
+                    data_row.append(extract.baseline[observation][telescope])
+
+                    # Adding the entry to the header
+                    if observation == 0:
+                        header_row.append(f'STATION {telescope + 1}')
+
+                except Exception: 
+                    pass
+
+            
+            # Adding the X band quality code
+            try: 
+                data_row.append(extract.qc_bX[observation])
+
+                # Adding the entry to the header
+                if observation == 0:
+                    if extract.mode == 'S/X':
+                        header_row.append('QC [X]')
+                    else:
+                        header_row.append('QC')
+
+            except Exception: 
+                pass
+
+            # Adding bandwise quality code depending on the format
+            if extract.mode == 'S/X':
+
+                # Adding the S band quality code
+                try: 
+                    data_row.append(extract.qc_bS[observation])
+
+                    # Adding the entry to the header
+                    if observation == 0:
+                        header_row.append('QC [S] (s)')
+
+                except Exception: 
+                    pass
+
+            # Adding the X band SNR
+            try: 
+                data_row.append(extract.snr_bX[observation])
+
+                # Adding the entry to the header
+                if observation == 0:
+                    if extract.mode == 'S/X':
+                        header_row.append('SNR [X]')
+                    else:
+                        header_row.append('SNR [TOTAL]')
+
+            except Exception: 
+                pass
+
+            # Adding bandwise quality code depending on the format
+            if extract.mode == 'S/X':
+
+                # Adding the S band SNR
+                try: 
+                    data_row.append(extract.snr_bS[observation])
+
+                    # Adding the entry to the header
+                    if observation == 0:
+                        header_row.append('SNR [S]')
+
+                except Exception: 
+                    pass
+
+            else:
+
+                for band in range(4):
+
+                    # Adding the S band SNR
+                    try: 
+                        data_row.append(snr.bandwise[observation][band])
+
+                        # Adding the entry to the header
+                        if observation == 0:
+                            header_row.append(f'SNR [{['a', 'b', 'c', 'd'][band]}]')
+
+                    except Exception: 
+                        pass
+
+            # Adding the projections if calculated
+            if calculate_projection == True:
+
+                # Adding projected baseline length
+                try: 
+                    data_row.append(projection.baseline[observation])
+
+                    # Adding the entry to the header
+                    if observation == 0:
+                        header_row.append('BASELINE [PROJ.]')
+
+                except Exception: 
+                    pass
+                
+                # Adding projected baseline angle
+                try: 
+                    data_row.append(projection.angle[observation])
+
+                    # Adding the entry to the header
+                    if observation == 0:
+                        header_row.append('ANGLE [PROJ.]')
+
+                except Exception: 
+                    pass
+
+            # Adding the data row to the data list
+            data_list.append(data_row)
+
+        # Only writing the text file if there is data, or if it is the start of the file
+        if len(data_list) != 0 or append == False:
+
+            print(f'Writing data from {Path(session_directory).name} to a text file...')
+
+            # Writing the data to a text file
+            text_file = CreateTextFile(
+                data_list,
+                self.output_directory,
+                extract.session,
+                header = header_row,
+                append = append,
+                column_width = column_width
+            )
+
+            self.text_file_path = os.path.join(self.output_directory, extract.session)
+            self.column_widths = text_file.column_widths
+
+        return extract.observations
+
+    '''
+    @get_text_file_path: grabs the path to the written text file
+
+    @param self: instance variable of the class, ProcessSession
+    @return: path to the text file
+    '''
+    def get_text_file_path(self):
+        return self.text_file_path
+
+    '''
+    @get_observing_mode: grabs the observing mode of the session
+
+    @param self: instance variable of the class, ProcessSession
+    @return: VGOS or S/X
+    '''
+    def get_observing_mode(self):
+        return self.observing_mode
+
+    '''
+    @get_observation_number: grabs the number of observations of the session
+
+    @param self: instance variable of the class, ProcessSession
+    @return: number of observations
+    '''
+    def get_observation_number(self):
+        return self.observation_number
+
+    '''
+    @get_process_seconds: grabs the seconds the session took to read and process
+
+    @param self: instance variable of the class, ProcessSession
+    @return: seconds
+    '''
+    def get_process_seconds(self):
+        return self.process_seconds
+
+    '''
+    @get_status_code_dictionary: grabs the most severe status code of each extracted list across all chunks of the session
+
+    @param self: instance variable of the class, ProcessSession
+    @return: dictionary of the names of the lists to their status code
+    '''
+    def get_status_code_dictionary(self):
+        return self.status_code_dictionary
+
+    '''
+    @get_summary_record: grabs the summary of the observations of the session, with the status codes of the session
+
+    @param self: instance variable of the class, ProcessSession
+    @return: dictionary of the summary, from SessionSummary.summaryRecord, None if the observations were filtered
+    '''
+    def get_summary_record(self):
+
+        if self.session_summary == None:
+            return None
+
+        return self.session_summary.summaryRecord(self.status_code_dictionary)
+
+    path = property(get_text_file_path)
+    mode = property(get_observing_mode)
+    observations = property(get_observation_number)
+    status_code = property(get_status_code_dictionary)
+    seconds = property(get_process_seconds)
+    summary = property(get_summary_record)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Runs SVD as a service that keeps its catalogues and caches loaded between requests, accepting requests to process sessions over a local
+    Unix socket or an HTTP endpoint on localhost and returning the outcome and text file of each session
+'''
+
+import os
+import json
+import stat
+import threading
+import socketserver
+from wsgiref.simple_server import make_server
+
+# Address the HTTP endpoint is served on, which only accepts requests from the same machine
+SERVICE_HOST = '127.0.0.1'
+
+# Largest request in bytes that is read
+SERVICE_REQUEST_LIMIT = 1024 ** 2
+
+# Commands a request can make, processing sessions by default
+SERVICE_COMMANDS = ['process', 'status', 'stop']
+
+class SVDService:
+
+    '''
+    @__init__: SVDService class constructor, which opens the HTTP endpoint or Unix socket
+
+    @param self: instance variable of the class, SVDService
+    @param request_handler: function called with the list of session codes and list of command line arguments of each request, returning the outcome of the sessions
+    @param address: port of the HTTP endpoint on localhost if a number, otherwise path to the Unix socket
+    '''
+    def __init__(self, request_handler, address):
+
+        self.request_handler = request_handler
+        self.address = str(address)
+
+        # Number of requests to process sessions that have been handled
+        self.request_count = 0
+
+        # Serving HTTP on localhost if the address is a port
+        if self.address.isdigit():
+
+            self.socket_path = None
+            self.server = make_server(SERVICE_HOST, int(self.address), self.application)
+            self.description = f'http://{SERVICE_HOST}:{self.server.server_port}/'
+
+        # Otherwise serving newline delimited JSON over a Unix socket
+        else:
+
+            if hasattr(socketserver, 'UnixStreamServer') == False:
+                raise OSError('Unix sockets are not supported on this platform, serve on a port of localhost instead')
+
+            self.socket_path = os.path.abspath(self.address)
+
+            # Removing the socket left behind by a service that was not stopped, but never another kind of file
+            if os.path.exists(self.socket_path):
+
+                if stat.S_ISSOCK(os.stat(self.socket_path).st_mode) == False:
+                    raise FileExistsError(f'{self.socket_path} exists and is not a socket')
+
+                os.remove(self.socket_path)
+
+            self.server = socketserver.UnixStreamServer(self.socket_path, self.handleConnection)
+            self.description = f'the Unix socket {self.socket_path}'
+
+    '''
+    @serve: handles requests one at a time until the service is stopped by a request or interrupted
+
+    @param self: instance variable of the class, SVDService
+    '''
+    def serve(self):
+
+        print(f'SVD is serving requests on {self.description}, send {{"command": "stop"}} or press Ctrl+C to stop')
+
+        try:
+            self.server.serve_forever()
+
+        except KeyboardInterrupt:
+            pass
+
+        finally:
+            self.server.server_close()
+
+            if self.socket_path != None and os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+        print('SVD has stopped serving requests')
+
+    '''
+    @handleRequest: carries out the command of a request
+
+    @param self: instance variable of the class, SVDService
+    @param request: the decoded request, {"sessions": [...], "arguments": [...]} to process sessions with the command line arguments of SVD,
+        {"command": "status"} or {"command": "stop"}
+    @return: the response, which has an "error" if the request could not be carried out
+    '''
+    def handleRequest(self, request):
+
+        if isinstance(request, dict) == False:
+            return {'error': 'the request must be a JSON object'}
+
+        command = request.get('command', 'process')
+
+        if command not in SERVICE_COMMANDS:
+            return {'error': f'unknown command {command}, the commands are {", ".join(SERVICE_COMMANDS)}'}
+
+        if command == 'status':
+            return {'status': 'ready', 'address': self.description, 'requests': self.request_count}
+
+        # Stopping from another thread, as the server waits for the request to finish before it stops
+        if command == 'stop':
+            threading.Thread(target = self.server.shutdown).start()
+            return {'status': 'stopping'}
+
+        session_list = request.get('sessions')
+        argument_list = request.get('arguments', [])
+
+        if isinstance(session_list, list) == False or len(session_list) == 0 or all(isinstance(session, str) for session in session_list) == False:
+            return {'error': 'the request must have a non-empty list of session codes, "sessions"'}
+
+        if isinstance(argument_list, list) == False or all(isinstance(argument, str) for argument in argument_list) == False:
+            return {'error': '"arguments" must be a list of command line arguments'}
+
+        self.request_count += 1
+
+        try:
+            return self.request_handler(session_list, argument_list)
+
+        # Argument errors end SVD, which must not end the service
+        except SystemExit as error:
+            return {'error': f'SVD ended with exit code {error.code}, check the arguments of the request'}
+
+        except Exception as error:
+            return {'error': f'{type(error).__name__}: {error}'}
+
+    '''
+    @application: WSGI application of the HTTP endpoint, where a GET request returns the status of the service and a POST request carries out the JSON request in its body
+
+    @param self: instance variable of the class, SVDService
+    @param environ: WSGI environment of the HTTP request
+    @param start_response: WSGI function that starts the HTTP response
+    @return: list of the encoded body of the response
+    '''
+    def application(self, environ, start_response):
+
+        http_status = '200 OK'
+
+        if environ['REQUEST_METHOD'] == 'GET':
+            response = SVDService.handleRequest(self, {'command': 'status'})
+
+        elif environ['REQUEST_METHOD'] == 'POST':
+
+            content_length = int(environ.get('CONTENT_LENGTH') or 0)
+
+            if content_length > SERVICE_REQUEST_LIMIT:
+                http_status = '413 Content Too Large'
+                response = {'error': f'the request is larger than {SERVICE_REQUEST_LIMIT} bytes'}
+
+            else:
+                try:
+                    response = SVDService.handleRequest(self, json.loads(environ['wsgi.input'].read(content_length)))
+
+                except ValueError:
+                    response = {'error': 'the request is not valid JSON'}
+
+                if 'error' in response:
+                    http_status = '400 Bad Request'
+
+        else:
+            http_status = '405 Method Not Allowed'
+            response = {'error': 'only GET and POST requests are accepted'}
+
+        body = json.dumps(response).encode()
+
+        start_response(http_status, [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))])
+
+        return [body]
+
+    '''
+    @handleConnection: carries out each line of a Unix socket connection as a JSON request, and writes each response as a line of JSON,
+        until the connection is closed
+
+    @param self: instance variable of the class, SVDService
+    @param connection: socket of the connection
+    @param client_address: address of the client, which is unused for Unix sockets
+    @param server: the server the connection was accepted by
+    '''
+    def handleConnection(self, connection, client_address, server):
+
+        with connection.makefile('rb') as request_file, connection.makefile('wb') as response_file:
+
+            for line in request_file:
+
+                if line.strip() == b'':
+                    continue
+
+                try:
+                    response = SVDService.handleRequest(self, json.loads(line))
+
+                except ValueError:
+                    response = {'error': 'the request is not valid JSON'}
+
+                response_file.write(json.dumps(response).encode() + b'\n')
+                response_file.flush()
+
+                if response.get('status') == 'stopping':
+                    break
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Estimates how long each session takes to process from the size of its VgosDB or archive, its number of observations, its observing mode
+    and whether projections are calculated, refined by the times recorded for sessions processed by earlier runs, so that the longest sessions
+    can be handed to the workers first
+'''
+
+import os
+
+# Seconds each observation takes to process by observing mode and whether or not projections are calculated, until sessions have been timed
+SECONDS_PER_OBSERVATION = {
+    ('VGOS', False): 0.0006,
+    ('VGOS', True): 0.0018,
+    ('S/X', False): 0.0005,
+    ('S/X', True): 0.0017
+}
+
+# Seconds each session takes to process regardless of its size (e.g. to open its files)
+SECONDS_PER_SESSION = 0.1
+
+# Bytes of an extracted VgosDB and of an archive per observation, until sessions have been timed
+BYTES_PER_OBSERVATION = {'directory_size': 1000, 'archive_size': 300}
+
+# Number of observations the defaults count as, so that the timings of a few small sessions only gradually replace them
+PRIOR_OBSERVATIONS = 10000
+
+class SessionCost:
+
+    '''
+    @__init__: SessionCost class constructor, which fits the rates of the estimates to the timed sessions of the session state database
+
+    @param self: instance variable of the class, SessionCost
+    @param session_state: SessionState of the sessions
+    @param calculate_projection: whether or not projections are calculated
+    @param options_digest: digest of the options of the run, a session timed with the same options is estimated by its own time
+    '''
+    def __init__(self, session_state, calculate_projection = False, options_digest = None):
+
+        self.session_state = session_state
+        self.calculate_projection = calculate_projection == True
+        self.options_digest = options_digest
+
+        timed_session_list = session_state.timedSessions()
+
+        # Seconds per observation of each observing mode, and of a session whose observing mode is not known yet
+        self.rate_dictionary = {}
+
+        for mode in ['VGOS', 'S/X', None]:
+
+            mode_session_list = [record for record in timed_session_list if (mode == None or record.get('mode') == mode) and bool(record.get('projection')) == self.calculate_projection]
+
+            if mode == None:
+                default_rate = sum(rate for (rate_mode, projection), rate in SECONDS_PER_OBSERVATION.items() if projection == self.calculate_projection) / 2
+            else:
+                default_rate = SECONDS_PER_OBSERVATION[(mode, self.calculate_projection)]
+
+            self.rate_dictionary[mode] = (
+                (sum(max(record['process_seconds'] - SECONDS_PER_SESSION, 0) for record in mode_session_list) + default_rate * PRIOR_OBSERVATIONS) /
+                (sum(record['observations'] for record in mode_session_list) + PRIOR_OBSERVATIONS)
+            )
+
+        # Observations per byte of an extracted VgosDB and of an archive
+        self.density_dictionary = {}
+
+        for size_column, default_bytes in BYTES_PER_OBSERVATION.items():
+
+            size_session_list = [record for record in timed_session_list if record.get(size_column, 0) > 0]
+
+            self.density_dictionary[size_column] = (
+                (sum(record['observations'] for record in size_session_list) + PRIOR_OBSERVATIONS) /
+                (sum(record[size_column] for record in size_session_list) + default_bytes * PRIOR_OBSERVATIONS)
+            )
+
+    '''
+    @estimate: estimates the seconds a session takes to process
+
+    @param self: instance variable of the class, SessionCost
+    @param session: name of the session
+    @param directory_path: path to the extracted VgosDB of the session, which is measured if its size has not been recorded
+    @return: the estimated seconds
+    '''
+    def estimate(self, session, directory_path = None):
+
+        record = self.session_state.getRecord(session)
+
+        # A session processed before with the same options takes as long as it did then
+        if record.get('process_seconds') != None and self.options_digest != None and record.get('options_digest') == self.options_digest:
+            return record['process_seconds']
+
+        observations = record.get('observations')
+
+        # Otherwise estimating the number of observations from the size of the VgosDB, or of its archive if it has not been extracted
+        if observations == None:
+
+            if record.get('directory_size') == None and directory_path != None and os.path.isdir(directory_path):
+                record['directory_size'] = self.session_state.directoryDigest(directory_path)[1]
+
+            for size_column in BYTES_PER_OBSERVATION:
+                if record.get(size_column, 0) > 0:
+                    observations = record[size_column] * self.density_dictionary[size_column]
+                    break
+
+            # Nothing is known of the session, which is estimated as a typical session
+            else:
+                observations = PRIOR_OBSERVATIONS
+
+        return SECONDS_PER_SESSION + observations * self.rate_dictionary[record.get('mode') if record.get('mode') in self.rate_dictionary else None]
+
+    '''
+    @order: orders sessions from the longest to the shortest estimated time, so that workers that take the next session as they finish
+        end at about the same time (longest processing time first), sessions estimated to take equally long keep their order
+
+    @param self: instance variable of the class, SessionCost
+    @param session_list: names of the sessions, or paths to their extracted VgosDB's
+    @return: list of the sessions in the order to process them
+    '''
+    def order(self, session_list):
+
+        cost_dictionary = {session: SessionCost.estimate(self, os.path.basename(session), session if os.path.isdir(session) else None) for session in session_list}
+
+        return sorted(session_list, key = lambda session: -cost_dictionary[session])
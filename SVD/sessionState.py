@@ -0,0 +1,556 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Keeps the state of every session (server name, local paths, sizes, digests, stage times and last status) in a SQLite database,
+    so that planning a run is one indexed query rather than a scan of the VgosDB and Extracted Data folders, and an interrupted run resumes
+    each session at its first incomplete stage
+'''
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+
+# Path to the session state database in the SVD application folder
+SESSION_STATE_FILE = os.path.join(os.path.dirname(__file__), 'session.state.db')
+
+# Stages of a session in the order they are reached
+STAGES = ['downloaded', 'extracted', 'processed', 'written']
+
+# Columns recorded by each stage, which are cleared when an earlier stage is recorded again as they are then out of date
+STAGE_COLUMNS = {
+    'downloaded': ['year', 'server_name', 'archive_path', 'archive_size', 'archive_digest', 'downloaded_time'],
+    'extracted': ['directory_path', 'directory_size', 'extracted_digest', 'extracted_time'],
+    'processed': ['options_digest', 'processed_digest', 'mode', 'observations', 'status_codes', 'projection', 'process_seconds', 'processed_time'],
+    'written': ['text_file_path', 'text_file_size', 'text_file_digest', 'written_time']
+}
+
+# Columns of the session state table after the session name and code, and their types
+SESSION_STATE_COLUMNS = [
+    ('stage', 'TEXT'),
+    ('status', 'TEXT'),
+    ('failed_stage', 'TEXT'),
+    ('error', 'TEXT'),
+    ('status_time', 'REAL'),
+    ('year', 'INTEGER'),
+    ('server_name', 'TEXT'),
+    ('archive_path', 'TEXT'),
+    ('archive_size', 'INTEGER'),
+    ('archive_digest', 'TEXT'),
+    ('downloaded_time', 'REAL'),
+    ('directory_path', 'TEXT'),
+    ('directory_size', 'INTEGER'),
+    ('extracted_digest', 'TEXT'),
+    ('extracted_time', 'REAL'),
+    ('options_digest', 'TEXT'),
+    ('processed_digest', 'TEXT'),
+    ('mode', 'TEXT'),
+    ('observations', 'INTEGER'),
+    ('status_codes', 'TEXT'),
+    ('projection', 'INTEGER'),
+    ('process_seconds', 'REAL'),
+    ('processed_time', 'REAL'),
+    ('text_file_path', 'TEXT'),
+    ('text_file_size', 'INTEGER'),
+    ('text_file_digest', 'TEXT'),
+    ('written_time', 'REAL'),
+    ('last_used_time', 'REAL')
+]
+
+# Columns of the session summary table after the session name, and their types, where the sources, stations, baselines and status codes are JSON
+SESSION_SUMMARY_COLUMNS = [
+    ('mode', 'TEXT'),
+    ('observations', 'INTEGER'),
+    ('mjd_start', 'REAL'),
+    ('mjd_end', 'REAL'),
+    ('sources', 'TEXT'),
+    ('stations', 'TEXT'),
+    ('baselines', 'TEXT'),
+    ('status_codes', 'TEXT'),
+    ('summarised_time', 'REAL')
+]
+
+# Columns of the session summary table that are stored as JSON
+SESSION_SUMMARY_JSON_COLUMNS = ['sources', 'stations', 'baselines', 'status_codes']
+
+# Size of the blocks files are read in when calculating their digest
+DIGEST_BLOCK_SIZE = 1024 * 1024
+
+# Seconds to wait for another SVD process to finish writing to the database
+SESSION_STATE_TIMEOUT = 60
+
+class SessionState:
+
+    '''
+    @__init__: SessionState class constructor, opens the session state database and creates its table and indexes if they do not exist
+
+    @param self: instance variable of the class, SessionState
+    @param database_path: path to the database file
+    '''
+    def __init__(self, database_path = SESSION_STATE_FILE):
+
+        self.database_path = database_path
+
+        # Each statement is committed as soon as it runs, so that the state of a session is never lost when a run is interrupted
+        self.connection = sqlite3.connect(self.database_path, timeout = SESSION_STATE_TIMEOUT, isolation_level = None)
+        self.connection.row_factory = sqlite3.Row
+
+        self.connection.execute(f'CREATE TABLE IF NOT EXISTS session_state (session TEXT PRIMARY KEY, code TEXT NOT NULL, {", ".join(" ".join(column) for column in SESSION_STATE_COLUMNS)})')
+
+        # Adding the columns of newer versions of SVD to a database created by an older version
+        existing_column_list = [row['name'] for row in self.connection.execute('PRAGMA table_info(session_state)')]
+
+        for column_name, column_type in SESSION_STATE_COLUMNS:
+            if column_name not in existing_column_list:
+                self.connection.execute(f'ALTER TABLE session_state ADD COLUMN {column_name} {column_type}')
+
+        # Carrying over a database created before the session codes were recorded, where the code is the name after the date
+        # and the VgosDB was processed as it was extracted
+        if 'code' not in existing_column_list:
+            self.connection.execute('ALTER TABLE session_state ADD COLUMN code TEXT')
+            self.connection.execute("UPDATE session_state SET code = upper(substr(session, instr(session, '-') + 1))")
+            self.connection.execute("UPDATE session_state SET processed_digest = extracted_digest WHERE stage IN ('processed', 'written')")
+
+        self.connection.execute('CREATE INDEX IF NOT EXISTS session_state_code ON session_state (code)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS session_state_stage ON session_state (stage, status)')
+
+        # Summary of each processed session, and the sessions of each source, station and baseline, keyed by the name so that the sessions are found by one index lookup
+        self.connection.execute(f'CREATE TABLE IF NOT EXISTS session_summary (session TEXT PRIMARY KEY, {", ".join(" ".join(column) for column in SESSION_SUMMARY_COLUMNS)})')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS session_source (source TEXT NOT NULL, session TEXT NOT NULL, observations INTEGER, PRIMARY KEY (source, session))')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS session_station (station TEXT NOT NULL, session TEXT NOT NULL, PRIMARY KEY (station, session))')
+        self.connection.execute('CREATE TABLE IF NOT EXISTS session_baseline (station_1 TEXT NOT NULL, station_2 TEXT NOT NULL, session TEXT NOT NULL, PRIMARY KEY (station_1, station_2, session))')
+
+        # Indexes by session, so that the rows of a session are replaced when it is summarised again
+        self.connection.execute('CREATE INDEX IF NOT EXISTS session_source_session ON session_source (session)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS session_station_session ON session_station (session)')
+        self.connection.execute('CREATE INDEX IF NOT EXISTS session_baseline_session ON session_baseline (session)')
+
+        # Archives whose digest has already been checked, by their path, size and modification time, so that each archive is only read once
+        self.verified_archive_set = set()
+
+    '''
+    @sessionCode: grabs the session code from a session name (e.g. VO0009 from 20200109-VO0009)
+
+    @param self: instance variable of the class, SessionState
+    @param session: name of the session
+    @return: upper case session code
+    '''
+    def sessionCode(self, session):
+        return session.split('-', 1)[-1].upper()
+
+    '''
+    @fileDigest: calculates the SHA-256 digest of the contents of a file
+
+    @param self: instance variable of the class, SessionState
+    @param file_path: path to the file
+    @return: hexadecimal digest of the file, None if the file can not be read
+    '''
+    def fileDigest(self, file_path):
+
+        digest = hashlib.sha256()
+
+        try:
+            with open(file_path, 'rb') as file:
+                for block in iter(lambda: file.read(DIGEST_BLOCK_SIZE), b''):
+                    digest.update(block)
+
+        except OSError:
+            return None
+
+        return digest.hexdigest()
+
+    '''
+    @directoryDigest: calculates a digest of an extracted VgosDB from the path, size and modification time of every file in it,
+        which changes if any file is added, removed or rewritten without reading the contents of every file
+
+    @param self: instance variable of the class, SessionState
+    @param directory_path: path to the directory
+    @return: hexadecimal digest of the directory and the total size of its files in bytes, None and 0 if the directory does not exist
+    '''
+    def directoryDigest(self, directory_path):
+
+        if not os.path.isdir(directory_path):
+            return None, 0
+
+        digest = hashlib.sha256()
+        directory_size = 0
+
+        for root, directories, files in os.walk(directory_path):
+
+            # Walking the directory in the same order every time
+            directories.sort()
+
+            for file_name in sorted(files):
+                file_path = os.path.join(root, file_name)
+                file_status = os.stat(file_path)
+                directory_size += file_status.st_size
+                digest.update(f'{os.path.relpath(file_path, directory_path)}\0{file_status.st_size}\0{file_status.st_mtime_ns}\n'.encode())
+
+        return digest.hexdigest(), directory_size
+
+    '''
+    @optionsDigest: calculates a digest of the options that change the text file of a session
+
+    @param self: instance variable of the class, SessionState
+    @param options: dictionary of the options
+    @return: hexadecimal digest of the options
+    '''
+    def optionsDigest(self, options):
+        return hashlib.sha256(json.dumps(options, sort_keys = True, default = str).encode()).hexdigest()
+
+    '''
+    @getRecord: grabs the state of a session
+
+    @param self: instance variable of the class, SessionState
+    @param session: name of the session
+    @return: dictionary of the columns of the session, empty if the session has not been recorded
+    '''
+    def getRecord(self, session):
+
+        row = self.connection.execute('SELECT * FROM session_state WHERE session = ?', (session.upper(),)).fetchone()
+
+        if row == None:
+            return {}
+
+        return {column: row[column] for column in row.keys() if row[column] != None}
+
+    '''
+    @planSessions: grabs the state of the sessions of the session codes of a run in one indexed query
+
+    @param self: instance variable of the class, SessionState
+    @param session_code_list: list of session codes
+    @return: dictionary of upper case session codes to the state of their session, codes that have not been recorded are left out
+    '''
+    def planSessions(self, session_code_list):
+
+        session_code_list = list({session_code.upper() for session_code in session_code_list})
+
+        plan = {}
+
+        # Querying in batches, as SQLite limits the number of parameters of a query
+        for batch_start in range(0, len(session_code_list), 500):
+
+            batch = session_code_list[batch_start:batch_start + 500]
+
+            for row in self.connection.execute(f'SELECT * FROM session_state WHERE code IN ({", ".join("?" * len(batch))})', batch):
+                plan[row['code']] = {column: row[column] for column in row.keys() if row[column] != None}
+
+        return plan
+
+    '''
+    @hasReached: determines whether or not a session has reached a stage
+
+    @param self: instance variable of the class, SessionState
+    @param session: name of the session, or the state of the session from getRecord or planSessions
+    @param stage: name of the stage, from STAGES
+    @return: whether or not the session has reached the stage
+    '''
+    def hasReached(self, session, stage):
+
+        record = session if isinstance(session, dict) else SessionState.getRecord(self, session)
+
+        if record.get('stage') not in STAGES:
+            return False
+
+        return STAGES.index(record['stage']) >= STAGES.index(stage)
+
+    '''
+    @recordStage: records that a session has reached a stage, along with the values of the stage, and clears the values of the later stages,
+        as they are out of date
+
+    @param self: instance variable of the class, SessionState
+    @param session: name of the session
+    @param stage: name of the stage, from STAGES
+    @param **values: values of the columns of the stage (STAGE_COLUMNS) to record
+    '''
+    def recordStage(self, session, stage, **values):
+
+        values.setdefault(f'{stage}_time', time.time())
+
+        columns = {column: None for later_stage in STAGES[STAGES.index(stage) + 1:] for column in STAGE_COLUMNS[later_stage]}
+        columns.update({column: value for column, value in values.items() if column in STAGE_COLUMNS[stage]})
+        columns.update({'stage': stage, 'status': 'completed', 'failed_stage': None, 'error': None, 'status_time': time.time()})
+
+        SessionState.update(self, session, columns)
+
+    '''
+    @recordUse: records that a session was used by a run, which orders the sessions of the VgosDB cache from least to most recently used
+
+    @param self: instance variable of the class, SessionState
+    @param session: name of the session
+    '''
+    def recordUse(self, session):
+        SessionState.update(self, session, {'last_used_time': time.time()})
+
+    '''
+    @rollBack: records that a session is back at an earlier stage (e.g. its extracted VgosDB was removed but its archive kept), 
+        clearing the values of the later stages
+
+    @param self: instance variable of the class, SessionState
+    @param session: name of the session
+    @param stage: name of the stage the session is back at, from STAGES, or None if nothing of the session is left
+    '''
+    def rollBack(self, session, stage):
+
+        later_stage_list = STAGES if stage == None else STAGES[STAGES.index(stage) + 1:]
+
+        columns = {column: None for later_stage in later_stage_list for column in STAGE_COLUMNS[later_stage]}
+        columns['stage'] = stage
+
+        SessionState.update(self, session, columns)
+
+    '''
+    @cachedSessions: grabs the sessions that have a downloaded archive or an extracted VgosDB, from least to most recently used
+
+    @param self: instance variable of the class, SessionState
+    @return: list of dictionaries of the state of each session
+    '''
+    def cachedSessions(self):
+
+        rows = self.connection.execute(f'''
+            SELECT * FROM session_state
+            WHERE stage IN ({", ".join("?" * len(STAGES))})
+            ORDER BY COALESCE(last_used_time, processed_time, extracted_time, downloaded_time, 0)
+        ''', STAGES)
+
+        return [{column: row[column] for column in row.keys() if row[column] != None} for row in rows]
+
+    '''
+    @timedSessions: grabs the sessions whose processing was timed, from which the time sessions take to process is estimated
+
+    @param self: instance variable of the class, SessionState
+    @return: list of dictionaries of the state of each session
+    '''
+    def timedSessions(self):
+
+        rows = self.connection.execute('SELECT * FROM session_state WHERE process_seconds IS NOT NULL AND observations > 0')
+
+        return [{column: row[column] for column in row.keys() if row[column] != None} for row in rows]
+
+    '''
+    @recordFailure: records that a session failed at a stage, keeping the stages it had already reached
+
+    @param self: instance variable of the class, SessionState
+    @param session: name of the session
+    @param stage: stage of the run the session failed at (download, extract or process)
+    @param error: the error that occoured
+    '''
+    def recordFailure(self, session, stage, error):
+        SessionState.update(self, session, {'status': 'failed', 'failed_stage': stage, 'error': str(error), 'status_time': time.time()})
+
+    '''
+    @update: sets columns of a session, adding the session if it has not been recorded
+
+    @param self: instance variable of the class, SessionState
+    @param session: name of the session
+    @param columns: dictionary of column names to values
+    '''
+    def update(self, session, columns):
+
+        # Adding and updating the session in one transaction, so that other SVD processes never see it half updated
+        self.connection.execute('BEGIN IMMEDIATE')
+
+        try:
+            self.connection.execute('INSERT OR IGNORE INTO session_state (session, code) VALUES (?, ?)', (session.upper(), SessionState.sessionCode(self, session)))
+            self.connection.execute(
+                f'UPDATE session_state SET {", ".join(column + " = ?" for column in columns)} WHERE session = ?',
+                list(columns.values()) + [session.upper()]
+            )
+
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+
+        self.connection.execute('COMMIT')
+
+    '''
+    @isDownloaded: determines whether or not the archive of a session was completely downloaded and has not changed since
+
+    @param self: instance variable of the class, SessionState
+    @param session: name of the session
+    @param archive_path: path to the archive
+    @return: whether or not the archive is complete
+    '''
+    def isDownloaded(self, session, archive_path):
+
+        record = SessionState.getRecord(self, session)
+
+        if record.get('archive_digest') == None or not os.path.isfile(archive_path):
+            return False
+
+        archive_status = os.stat(archive_path)
+
+        # Checking the size first, which is enough to find an archive cut short
+        if archive_status.st_size != record.get('archive_size'):
+            return False
+
+        verified_archive = (archive_path, archive_status.st_size, archive_status.st_mtime_ns, record['archive_digest'])
+
+        if verified_archive not in self.verified_archive_set:
+
+            if SessionState.fileDigest(self, archive_path) != record['archive_digest']:
+                return False
+
+            self.verified_archive_set.add(verified_archive)
+
+        return True
+
+    '''
+    @isExtracted: determines whether or not a session was completely extracted. An extracted VgosDB that has not been recorded
+        (e.g. extracted before the session state database existed) is recorded as extracted, as long as its archive is not still waiting to be extracted
+
+    @param self: instance variable of the class, SessionState
+    @param session: name of the session
+    @param directory_path: path to the extracted VgosDB
+    @param archive_path: path to the archive of the VgosDB
+    @return: whether or not the VgosDB is completely extracted
+    '''
+    def isExtracted(self, session, directory_path, archive_path):
+
+        if not os.path.isdir(directory_path):
+            return False
+
+        # An extraction that was interrupted leaves the archive next to the directory
+        if SessionState.hasReached(self, session, 'extracted') == False:
+
+            if SessionState.getRecord(self, session).get('stage') != None or os.path.isfile(archive_path):
+                return False
+
+            extracted_digest, directory_size = SessionState.directoryDigest(self, directory_path)
+
+            SessionState.recordStage(self, session, 'extracted', directory_path = directory_path, directory_size = directory_size, extracted_digest = extracted_digest)
+
+        # Keeping the recorded path up to date if the VgosDB folder has moved
+        elif SessionState.getRecord(self, session).get('directory_path') != directory_path:
+            SessionState.update(self, session, {'directory_path': directory_path})
+
+        return True
+
+    '''
+    @isWritten: determines whether or not the text file of a session was written from the same VgosDB with the same options, and has not changed since
+
+    @param self: instance variable of the class, SessionState
+    @param session: name of the session
+    @param directory_path: path to the extracted VgosDB
+    @param options_digest: digest of the options of the run
+    @return: whether or not processing the session can be skipped
+    '''
+    def isWritten(self, session, directory_path, options_digest):
+
+        record = SessionState.getRecord(self, session)
+
+        if SessionState.hasReached(self, record, 'written') == False or record.get('options_digest') != options_digest:
+            return False
+
+        if record.get('processed_digest') != SessionState.directoryDigest(self, directory_path)[0]:
+            return False
+
+        return record.get('text_file_digest') != None and SessionState.fileDigest(self, record.get('text_file_path', '')) == record['text_file_digest']
+
+    '''
+    @recordSummary: records the summary of a processed session, replacing the summary of when it was processed before
+
+    @param self: instance variable of the class, SessionState
+    @param session: name of the session
+    @param summary_record: the summary of the session, from SessionSummary.summaryRecord
+    '''
+    def recordSummary(self, session, summary_record):
+
+        session = session.upper()
+
+        columns = {column: json.dumps(summary_record.get(column)) if column in SESSION_SUMMARY_JSON_COLUMNS else summary_record.get(column) for column, column_type in SESSION_SUMMARY_COLUMNS}
+        columns['summarised_time'] = time.time()
+
+        # Replacing the summary and its index rows in one transaction, so that other SVD processes never find the session half summarised
+        self.connection.execute('BEGIN IMMEDIATE')
+
+        try:
+            for table in ['session_summary', 'session_source', 'session_station', 'session_baseline']:
+                self.connection.execute(f'DELETE FROM {table} WHERE session = ?', (session,))
+
+            self.connection.execute(f'INSERT INTO session_summary (session, {", ".join(columns)}) VALUES (?, {", ".join("?" * len(columns))})', [session] + list(columns.values()))
+            self.connection.executemany('INSERT INTO session_source (source, session, observations) VALUES (?, ?, ?)', [(source, session, count) for source, count in summary_record['sources'].items()])
+            self.connection.executemany('INSERT INTO session_station (station, session) VALUES (?, ?)', [(station, session) for station in summary_record['stations']])
+            self.connection.executemany('INSERT INTO session_baseline (station_1, station_2, session) VALUES (?, ?, ?)', [(station_1, station_2, session) for station_1, station_2 in summary_record['baselines']])
+
+        except BaseException:
+            self.connection.execute('ROLLBACK')
+            raise
+
+        self.connection.execute('COMMIT')
+
+    '''
+    @summaryRow: converts a row of the session summary table into the summary of the session
+
+    @param self: instance variable of the class, SessionState
+    @param row: the row
+    @return: dictionary of the session name and its summary
+    '''
+    def summaryRow(self, row):
+        return {column: json.loads(row[column]) if column in SESSION_SUMMARY_JSON_COLUMNS and row[column] != None else row[column] for column in row.keys()}
+
+    '''
+    @getSummary: grabs the summary of a processed session
+
+    @param self: instance variable of the class, SessionState
+    @param session: name of the session
+    @return: dictionary of the summary, empty if the session has not been summarised
+    '''
+    def getSummary(self, session):
+
+        row = self.connection.execute('SELECT * FROM session_summary WHERE session = ?', (session.upper(),)).fetchone()
+
+        if row == None:
+            return {}
+
+        return SessionState.summaryRow(self, row)
+
+    '''
+    @findSessions: finds the summarised sessions that observed any of the sources and any of the stations, from the index of each source and station,
+        without reading the text files of the sessions
+
+    @param self: instance variable of the class, SessionState
+    @param sources: source names, a session must have observed one of them, sessions are not selected by source if None
+    @param stations: station names, a session must have had one of them observing, sessions are not selected by station if None
+    @return: list of the summaries of the sessions, from the earliest to the latest
+    '''
+    def findSessions(self, sources = None, stations = None):
+
+        condition_list = []
+        parameter_list = []
+
+        for table, column, names in [('session_source', 'source', sources), ('session_station', 'station', stations)]:
+
+            if names != None:
+                names = sorted(set(names))
+                condition_list.append(f'session IN (SELECT session FROM {table} WHERE {column} IN ({", ".join("?" * len(names))}))')
+                parameter_list += names
+
+        rows = self.connection.execute(
+            f'SELECT * FROM session_summary {"WHERE " + " AND ".join(condition_list) if len(condition_list) != 0 else ""} ORDER BY mjd_start, session',
+            parameter_list
+        )
+
+        return [SessionState.summaryRow(self, row) for row in rows]
+
+    '''
+    @close: closes the connection to the database
+
+    @param self: instance variable of the class, SessionState
+    '''
+    def close(self):
+        self.connection.close()
+
+    '''
+    @get_database_path: grabs the path to the session state database
+
+    @param self: instance variable of the class, SessionState
+    @return: path to the database file
+    '''
+    def get_database_path(self):
+        return self.database_path
+
+    path = property(get_database_path)
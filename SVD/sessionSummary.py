@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Summarises the observations of a processed session (observing mode, MJD span, number of observations, and the sources, stations
+    and baselines observed), which is recorded in the session state database so that the sessions observing a source or station are found
+    without reading their text files
+'''
+
+import numpy as np
+from collections import Counter
+
+class SessionSummary:
+
+    '''
+    @__init__: SessionSummary class constructor, a summary with no observations, which observations are added to a chunk at a time
+
+    @param self: instance variable of the class, SessionSummary
+    '''
+    def __init__(self):
+
+        self.observing_mode = None
+        self.observation_number = 0
+
+        # Earliest and latest observation time in MJD, None until an observation with a valid time is added
+        self.mjd_start = None
+        self.mjd_end = None
+
+        # Number of observations of each source, the stations observing, and the baselines as pairs of stations in alphabetical order
+        self.source_counter = Counter()
+        self.station_set = set()
+        self.baseline_set = set()
+
+    '''
+    @addObservations: adds observations to the summary, where sources, stations and times that could not be extracted (Err) are left out
+
+    @param self: instance variable of the class, SessionSummary
+    @param observing_mode: observing mode of the session (S/X or VGOS)
+    @param source_list: source of each observation
+    @param baseline_list: pair of stations of each observation
+    @param mjd_list: time of each observation in MJD, empty if the times could not be extracted
+    '''
+    def addObservations(self, observing_mode, source_list, baseline_list, mjd_list):
+
+        self.observing_mode = observing_mode
+        self.observation_number += len(source_list)
+
+        # Names are padded with spaces to 8 characters in the VgosDB, which are left out so that names are found as they are entered
+        self.source_counter.update(source.strip() for source in source_list if source != 'Err')
+
+        for baseline in dict.fromkeys(tuple(baseline) for baseline in baseline_list):
+
+            stations = tuple(sorted(station.strip() for station in baseline))
+
+            if 'Err' in stations or len(stations) != 2:
+                continue
+
+            self.station_set.update(stations)
+            self.baseline_set.add(stations)
+
+        mjd_array = np.array([time for time in mjd_list if isinstance(time, float)], dtype = float)
+
+        if len(mjd_array) != 0:
+            self.mjd_start = float(mjd_array.min()) if self.mjd_start == None else min(self.mjd_start, float(mjd_array.min()))
+            self.mjd_end = float(mjd_array.max()) if self.mjd_end == None else max(self.mjd_end, float(mjd_array.max()))
+
+    '''
+    @summaryRecord: grabs the summary as a record of plain values, as it is stored in the session state database
+
+    @param self: instance variable of the class, SessionSummary
+    @param status_code_dictionary: the most severe status code of each extracted list of the session
+    @return: dictionary of the observing mode, MJD span, number of observations, number of observations of each source, stations, baselines and status codes
+    '''
+    def summaryRecord(self, status_code_dictionary = None):
+
+        return {
+            'mode': self.observing_mode,
+            'observations': self.observation_number,
+            'mjd_start': self.mjd_start,
+            'mjd_end': self.mjd_end,
+            'sources': dict(sorted(self.source_counter.items())),
+            'stations': sorted(self.station_set),
+            'baselines': [list(baseline) for baseline in sorted(self.baseline_set)],
+            'status_codes': {} if status_code_dictionary == None else dict(status_code_dictionary)
+        }
+
+    '''
+    @get_source_counter: grabs the number of observations of each source
+
+    @param self: instance variable of the class, SessionSummary
+    @return: counter of the source names
+    '''
+    def get_source_counter(self):
+        return self.source_counter
+
+    '''
+    @get_station_set: grabs the stations observing in the session
+
+    @param self: instance variable of the class, SessionSummary
+    @return: set of the station names
+    '''
+    def get_station_set(self):
+        return self.station_set
+
+    '''
+    @get_baseline_set: grabs the baselines of the session
+
+    @param self: instance variable of the class, SessionSummary
+    @return: set of the pairs of stations, in alphabetical order
+    '''
+    def get_baseline_set(self):
+        return self.baseline_set
+
+    sources = property(get_source_counter)
+    stations = property(get_station_set)
+    baselines = property(get_baseline_set)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Splits the sessions of a run into shards that separate machines process without talking to each other, each into its own
+    folder of the Extracted Data folder with a manifest of its sessions, and merges the finished shards into one result
+'''
+
+import os
+import re
+import json
+import time
+import zlib
+from processData import EXTRACTED_DATA_DIRECTORY
+
+# Name of the folder a shard writes its text files and manifest to, within the Extracted Data folder
+SHARD_DIRECTORY_FORMAT = 'shard-{index}-of-{count}'
+SHARD_DIRECTORY_PATTERN = re.compile(r'^shard-(\d+)-of-(\d+)$')
+
+# Name of the manifest of each shard, written once the shard has finished, and of the manifest of the merged shards
+SHARD_MANIFEST = 'shard.manifest.json'
+MERGED_MANIFEST = 'merged.manifest.json'
+
+class ShardRun:
+
+    '''
+    @__init__: ShardRun class constructor, which creates the folder of the shard
+
+    @param self: instance variable of the class, ShardRun
+    @param shard_index: number of this shard, from 1 to shard_count
+    @param shard_count: number of shards the sessions are split into
+    @param balanced: whether or not the shards are balanced by the size of the archives
+    '''
+    def __init__(self, shard_index, shard_count, balanced = False):
+
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.balanced = balanced
+
+        # Sessions of this shard
+        self.session_list = []
+
+        self.output_directory = os.path.join(EXTRACTED_DATA_DIRECTORY, SHARD_DIRECTORY_FORMAT.format(index = shard_index, count = shard_count))
+
+        os.makedirs(self.output_directory, exist_ok = True)
+
+    '''
+    @parseShard: reads a shard from the command line
+
+    @param shard: the shard as text, i/N for the i'th of N shards (e.g. 2/4)
+    @return: number of the shard and number of shards
+    '''
+    def parseShard(shard):
+
+        shard_index, shard_count = (int(number) for number in shard.split('/'))
+
+        if shard_count < 1 or shard_index < 1 or shard_index > shard_count:
+            raise ValueError(f'{shard} is not a shard, which must be i/N with i from 1 to N')
+
+        return shard_index, shard_count
+
+    '''
+    @assignShards: splits sessions into the shards, which only depends on the sessions themselves, so that every machine given the same sessions
+        assigns them to the same shards. Without sizes, each session is assigned by a hash of its name. With sizes, the largest sessions are
+        assigned first, each to the shard with the least bytes so far, so that every shard downloads and processes about the same amount
+
+    @param session_list: names of the sessions
+    @param shard_count: number of shards
+    @param size_dictionary: size in bytes of the archive of each session, unknown sizes count as empty, the shards are not balanced if None
+    @return: dictionary of the names of the sessions to the number of their shard
+    '''
+    def assignShards(session_list, shard_count, size_dictionary = None):
+
+        session_list = sorted(set(session_list))
+
+        if size_dictionary == None:
+            return {session: zlib.crc32(session.upper().encode()) % shard_count + 1 for session in session_list}
+
+        shard_dictionary = {}
+        shard_sizes = [0] * shard_count
+
+        # Ties are broken by the name of the session and the number of the shard, so that the assignment never depends on the order of the sessions
+        for session in sorted(session_list, key = lambda session: (-size_dictionary.get(session, 0), session)):
+
+            shard = shard_sizes.index(min(shard_sizes))
+
+            shard_dictionary[session] = shard + 1
+            shard_sizes[shard] += size_dictionary.get(session, 0)
+
+        return shard_dictionary
+
+    '''
+    @selectSessions: keeps the sessions of this shard
+
+    @param self: instance variable of the class, ShardRun
+    @param session_list: names of all the sessions of the run
+    @param size_dictionary: size in bytes of the archive of each session, the shards are not balanced if None
+    @return: list of the sessions of this shard, in the order they were given
+    '''
+    def selectSessions(self, session_list, size_dictionary = None):
+
+        shard_dictionary = ShardRun.assignShards(session_list, self.shard_count, size_dictionary)
+
+        self.session_list = [session for session in dict.fromkeys(session_list) if shard_dictionary[session] == self.shard_index]
+
+        return self.session_list
+
+    '''
+    @writeManifest: writes the manifest of the shard once it has finished, replacing the manifest of an earlier run of the shard in one step,
+        so that a merge never reads a partly written manifest
+
+    @param self: instance variable of the class, ShardRun
+    @param outcome_dictionary: the text file, observing mode, number of observations and status codes of each completed session,
+        and the stage and error of each failed session
+    '''
+    def writeManifest(self, outcome_dictionary):
+
+        manifest = {
+            'shard': self.shard_index,
+            'shards': self.shard_count,
+            'balanced': self.balanced,
+            'sessions': self.session_list,
+            'finished_time': time.time(),
+            'completed': {},
+            'failed': outcome_dictionary['failed']
+        }
+
+        # Text files are recorded by name, as the shards may be written from machines that mount the Extracted Data folder at different paths
+        for session, outcome in outcome_dictionary['completed'].items():
+            manifest['completed'][session] = {**outcome, 'text_file_path': None if outcome['text_file_path'] == None else os.path.basename(outcome['text_file_path'])}
+
+        manifest_path = os.path.join(self.output_directory, SHARD_MANIFEST)
+
+        with open(manifest_path + '.partial', 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent = 1)
+
+        os.replace(manifest_path + '.partial', manifest_path)
+
+        print(f'The manifest of shard {self.shard_index} of {self.shard_count} is: {manifest_path}')
+
+    '''
+    @merge: moves the text files of every finished shard into the Extracted Data folder and combines their manifests into one manifest.
+        Shards that have not finished are left for a later merge, which adds them to the merged manifest
+
+    @return: the merged manifest, None if there are no shards to merge
+    '''
+    def merge():
+
+        # Folders of the shards, by the number of shards the run was split into
+        shard_directory_dictionary = {}
+
+        for directory_name in sorted(os.listdir(EXTRACTED_DATA_DIRECTORY)):
+
+            match = SHARD_DIRECTORY_PATTERN.match(directory_name)
+
+            if match != None and os.path.isdir(os.path.join(EXTRACTED_DATA_DIRECTORY, directory_name)):
+                shard_directory_dictionary.setdefault(int(match.group(2)), {})[int(match.group(1))] = os.path.join(EXTRACTED_DATA_DIRECTORY, directory_name)
+
+        if len(shard_directory_dictionary) == 0:
+            print('There are no shards to merge in the Extracted Data folder')
+            return None
+
+        if len(shard_directory_dictionary) > 1:
+            raise ValueError(f'the Extracted Data folder has shards of runs split {", ".join(str(shard_count) for shard_count in sorted(shard_directory_dictionary))} ways, which can not be merged together')
+
+        shard_count, shard_directories = next(iter(shard_directory_dictionary.items()))
+
+        merged_manifest_path = os.path.join(EXTRACTED_DATA_DIRECTORY, MERGED_MANIFEST)
+
+        # Adding to the manifest of an earlier merge of the same run
+        merged_manifest = {'shards': shard_count, 'merged_shards': [], 'missing_shards': [], 'completed': {}, 'failed': {}}
+
+        if os.path.exists(merged_manifest_path):
+
+            with open(merged_manifest_path) as manifest_file:
+                earlier_manifest = json.load(manifest_file)
+
+            if earlier_manifest.get('shards') == shard_count:
+                merged_manifest = earlier_manifest
+
+        for shard_index in range(1, shard_count + 1):
+
+            manifest_path = os.path.join(shard_directories.get(shard_index, ''), SHARD_MANIFEST)
+
+            if shard_index not in shard_directories or os.path.exists(manifest_path) == False:
+                continue
+
+            with open(manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+
+            for session, outcome in manifest['completed'].items():
+
+                # Moving the text file into the Extracted Data folder, a session skipped as already processed may already be there
+                if outcome['text_file_path'] != None:
+
+                    text_file_path = os.path.join(EXTRACTED_DATA_DIRECTORY, outcome['text_file_path'])
+
+                    if os.path.exists(os.path.join(shard_directories[shard_index], outcome['text_file_path'])):
+                        os.replace(os.path.join(shard_directories[shard_index], outcome['text_file_path']), text_file_path)
+
+                    outcome = {**outcome, 'text_file_path': text_file_path}
+
+                merged_manifest['completed'][session] = {**outcome, 'shard': shard_index}
+                merged_manifest['failed'].pop(session, None)
+
+            for session, failure in manifest['failed'].items():
+
+                if session not in merged_manifest['completed']:
+                    merged_manifest['failed'][session] = {**failure, 'shard': shard_index}
+
+            merged_manifest['merged_shards'] = sorted(set(merged_manifest['merged_shards']) | {shard_index})
+
+            os.remove(manifest_path)
+
+            # Removing the folder of the shard, unless something other than its text files was left in it
+            try:
+                os.rmdir(shard_directories[shard_index])
+
+            except OSError:
+                pass
+
+        merged_manifest['missing_shards'] = [shard_index for shard_index in range(1, shard_count + 1) if shard_index not in merged_manifest['merged_shards']]
+
+        with open(merged_manifest_path + '.partial', 'w') as manifest_file:
+            json.dump(merged_manifest, manifest_file, indent = 1)
+
+        os.replace(merged_manifest_path + '.partial', merged_manifest_path)
+
+        print(f'{len(merged_manifest["merged_shards"])} of {shard_count} shard(s) merged, with {len(merged_manifest["completed"])} session(s) completed and {len(merged_manifest["failed"])} session(s) failed')
+
+        if len(merged_manifest['missing_shards']) != 0:
+            print(f'Shard(s) {", ".join(str(shard_index) for shard_index in merged_manifest["missing_shards"])} have not finished, merge again once they have')
+
+        print(f'The merged manifest is: {merged_manifest_path}')
+
+        return merged_manifest
+
+    '''
+    @get_output_directory: grabs the path to the folder the text files of the shard are written to
+
+    @param self: instance variable of the class, ShardRun
+    @return: path to the folder
+    '''
+    def get_output_directory(self):
+        return self.output_directory
+
+    '''
+    @get_session_list: grabs the sessions of the shard
+
+    @param self: instance variable of the class, ShardRun
+    @return: list of session names
+    '''
+    def get_session_list(self):
+        return self.session_list
+
+    directory = property(get_output_directory)
+    sessions = property(get_session_list)
@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Places numpy arrays in one block of shared memory that other processes attach to by a small descriptor,
+    so that the arrays are neither copied nor pickled for each process
+'''
+
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+
+# Byte boundary each array in the block starts on
+SHARED_ARRAY_ALIGNMENT = 64
+
+class SharedArrays:
+
+    '''
+    @__init__: SharedArrays class constructor, which either creates a block of shared memory holding a copy of the arrays,
+        or attaches to the block of a descriptor. Attached arrays are read only
+
+    @param self: instance variable of the class, SharedArrays
+    @param arrays: dictionary of names to the arrays to place in shared memory
+    @param descriptor: descriptor of a block created by another process, from its descriptor or handOver
+    @param take_over: whether or not this process takes over removing the attached block from the process that handed it over
+    '''
+    def __init__(self, arrays = None, descriptor = None, take_over = False):
+
+        # Whether or not this process removes the block, which is the process that created it unless it was handed over
+        self.owner = descriptor == None or take_over == True
+
+        # Whether or not the block is tracked by hand, so that it is removed if this process ends without removing it
+        self.tracked = False
+
+        if descriptor == None:
+
+            arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+
+            # Name, data type, shape and offset of each array in the block
+            array_descriptors = {}
+            block_size = 0
+
+            for name, array in arrays.items():
+                block_size = -(-block_size // SHARED_ARRAY_ALIGNMENT) * SHARED_ARRAY_ALIGNMENT
+                array_descriptors[name] = [array.dtype.str, list(array.shape), block_size]
+                block_size += array.nbytes
+
+            # Shared memory can not be empty
+            self.shared_memory = shared_memory.SharedMemory(create = True, size = max(block_size, 1))
+            self.block_descriptor = {'name': self.shared_memory.name, 'arrays': array_descriptors}
+
+        else:
+            self.block_descriptor = descriptor
+
+            try:
+                self.shared_memory = shared_memory.SharedMemory(descriptor['name'], track = False)
+
+                if take_over == True:
+                    resource_tracker.register(self.shared_memory._name, 'shared_memory')
+                    self.tracked = True
+
+            # Before Python 3.13 attached blocks are always tracked, and would be removed when the attached process ends
+            except TypeError:
+                self.shared_memory = shared_memory.SharedMemory(descriptor['name'])
+
+                if take_over == False:
+                    resource_tracker.unregister(self.shared_memory._name, 'shared_memory')
+
+        # Views of the arrays in the block
+        self.array_dictionary = {}
+
+        for name, (dtype, shape, offset) in self.block_descriptor['arrays'].items():
+
+            self.array_dictionary[name] = np.ndarray(shape, dtype = np.dtype(dtype), buffer = self.shared_memory.buf, offset = offset)
+
+            if descriptor == None:
+                self.array_dictionary[name][...] = arrays[name]
+
+            else:
+                self.array_dictionary[name].flags.writeable = False
+
+    '''
+    @close: releases the arrays and the block of shared memory, and removes the block if this process created it
+
+    @param self: instance variable of the class, SharedArrays
+    '''
+    def close(self):
+
+        self.array_dictionary = {}
+
+        try:
+            self.shared_memory.close()
+
+        # Arrays taken from the block are still in use, the block is closed once they are released
+        except BufferError:
+            pass
+
+        if self.owner == True:
+            try:
+                self.shared_memory.unlink()
+
+            except FileNotFoundError:
+                pass
+
+            if self.tracked == True:
+                resource_tracker.unregister(self.shared_memory._name, 'shared_memory')
+
+    '''
+    @handOver: hands the block over to another process, which takes over removing it, and releases it in this process.
+        Must be called before the descriptor is sent, so that the block is never removed while the other process attaches to it
+
+    @param self: instance variable of the class, SharedArrays
+    @return: descriptor of the block, to attach to with take_over
+    '''
+    def handOver(self):
+
+        if self.owner == True:
+            resource_tracker.unregister(self.shared_memory._name, 'shared_memory')
+            self.owner = False
+            self.tracked = False
+
+        SharedArrays.close(self)
+
+        return self.block_descriptor
+
+    '''
+    @remove: removes a block that was handed over, if the process it was handed to could not remove it
+
+    @param descriptor: descriptor of the block
+    '''
+    def remove(descriptor):
+
+        try:
+            SharedArrays(descriptor = descriptor, take_over = True).close()
+
+        except FileNotFoundError:
+            pass
+
+    '''
+    @get_arrays: grabs the arrays in the block
+
+    @param self: instance variable of the class, SharedArrays
+    @return: dictionary of names to the arrays
+    '''
+    def get_arrays(self):
+        return self.array_dictionary
+
+    '''
+    @get_descriptor: grabs the descriptor of the block, which is small enough to send to other processes
+
+    @param self: instance variable of the class, SharedArrays
+    @return: dictionary of the name of the block and the data type, shape and offset of each array in it
+    '''
+    def get_descriptor(self):
+        return self.block_descriptor
+
+    arrays = property(get_arrays)
+    descriptor = property(get_descriptor)
+
+class SharedIndex:
+
+    '''
+    @__init__: SharedIndex class constructor, an index of names to their position in a list that is kept as sorted arrays,
+        so that it can be shared between processes, and is used in the same way as a dictionary
+
+    @param self: instance variable of the class, SharedIndex
+    @param sorted_names: array of the names in sorted order
+    @param name_positions: array of the position of each sorted name in the list
+    '''
+    def __init__(self, sorted_names, name_positions):
+
+        self.sorted_names = sorted_names
+        self.name_positions = name_positions
+
+        # Positions that have already been searched for, as the same few names are looked up for every observation of a session
+        self.found_positions = {}
+
+    '''
+    @createArrays: sorts names into the arrays of an index, where a name that appears more than once is indexed at its last position, as in a dictionary
+
+    @param names: list or array of names
+    @param positions: position of each name, the index of each name in names if None
+    @return: the sorted names and the position of each sorted name
+    '''
+    def createArrays(names, positions = None):
+
+        names = np.asarray(names, dtype = str)
+        positions = np.arange(len(names)) if positions is None else np.asarray(positions)
+
+        order = np.argsort(names, kind = 'stable')
+
+        return names[order], positions[order].astype(np.int64)
+
+    '''
+    @find: searches for the position of a name
+
+    @param self: instance variable of the class, SharedIndex
+    @param name: the name
+    @return: the position of the name, None if the name is not indexed
+    '''
+    def find(self, name):
+
+        if name in self.found_positions:
+            return self.found_positions[name]
+
+        position = None
+
+        # The last of equal names, which keeps their order in the list
+        sorted_index = int(np.searchsorted(self.sorted_names, name, side = 'right')) - 1
+
+        if sorted_index >= 0 and self.sorted_names[sorted_index] == name:
+            position = int(self.name_positions[sorted_index])
+
+        self.found_positions[name] = position
+
+        return position
+
+    '''
+    @get: grabs the position of a name
+
+    @param self: instance variable of the class, SharedIndex
+    @param name: the name
+    @param default: returned if the name is not indexed
+    @return: the position of the name
+    '''
+    def get(self, name, default = None):
+
+        position = SharedIndex.find(self, name)
+
+        return default if position == None else position
+
+    '''
+    @keys: grabs the indexed names
+
+    @param self: instance variable of the class, SharedIndex
+    @return: set of the names
+    '''
+    def keys(self):
+        return set(self.sorted_names.tolist())
+
+    '''
+    @__contains__: determines whether or not a name is indexed
+
+    @param self: instance variable of the class, SharedIndex
+    @param name: the name
+    @return: whether or not the name is indexed
+    '''
+    def __contains__(self, name):
+        return isinstance(name, str) and SharedIndex.find(self, name) != None
+
+    '''
+    @__getitem__: grabs the position of a name, raising a KeyError if the name is not indexed
+
+    @param self: instance variable of the class, SharedIndex
+    @param name: the name
+    @return: the position of the name
+    '''
+    def __getitem__(self, name):
+
+        position = SharedIndex.find(self, name) if isinstance(name, str) else None
+
+        if position == None:
+            raise KeyError(name)
+
+        return position
+
+    '''
+    @__iter__: iterates over the indexed names
+
+    @param self: instance variable of the class, SharedIndex
+    @return: iterator of the names
+    '''
+    def __iter__(self):
+        return iter(SharedIndex.keys(self))
+
+    '''
+    @__len__: counts the indexed names
+
+    @param self: instance variable of the class, SharedIndex
+    @return: number of names
+    '''
+    def __len__(self):
+        return len(SharedIndex.keys(self))
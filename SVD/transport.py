@@ -0,0 +1,581 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Lists and fetches the VgosDB archives of each year, either from the CDDIS server over FTPS or HTTPS, or from a local mirror of its VgosDB directory
+'''
+
+import os
+import re
+import netrc
+import base64
+import shutil
+import threading
+import http.client
+from ftplib import FTP_TLS
+from urllib.parse import urlsplit, urljoin, quote
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Server containing the VgosDB's
+SERVER = 'gdc.cddis.eosdis.nasa.gov'
+
+# Directory of VgosDB's per year in the server
+SERVER_DIRECTORY = 'pub/vlbi/ivsdata/vgosdb'
+
+# Local mirror of the VgosDB directory of the server (containing a folder of archives per year), the server is used if None
+VGOSDB_MIRROR = None
+
+# VgosDB directory of the server over HTTPS. Downloading over HTTPS needs an Earthdata login, which is read from the .netrc file of the user
+HTTPS_URL = 'https://cddis.nasa.gov/archive/vlbi/ivsdata/vgosdb/'
+
+# Number of connections an archive is downloaded over at once, and the size in bytes of the byte ranges it is split into
+HTTPS_CONNECTIONS = 4
+HTTPS_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Seconds to wait for a response, number of times a failed byte range is requested again, and largest number of redirects followed
+HTTPS_TIMEOUT = 60
+HTTPS_RETRIES = 2
+HTTPS_REDIRECTS = 10
+
+# Size of the blocks a response is read and written in
+HTTPS_BLOCK_SIZE = 1024 * 1024
+
+class FTPSTransport:
+
+    '''
+    @__init__: FTPSTransport class constructor, requests the server, logs in and navigates to the directory of VgosDB's
+
+    @param self: instance variable of the class, FTPSTransport
+    @param host: name of the server
+    '''
+    def __init__(self, host = SERVER):
+
+        self.host = host
+
+        # Requesting the server
+        self.ftps = FTP_TLS(host = self.host)
+
+        # Anonymously logging into the ftp server
+        self.ftps.login()
+
+        # Securing the data connection
+        self.ftps.prot_p()
+
+        # Sending a response string to the server, for all data to be converted to binary
+        self.ftps.sendcmd('TYPE I')
+
+        # Navigating to the directory of VgosDB's per year
+        self.ftps.cwd(SERVER_DIRECTORY)
+
+    '''
+    @listFiles: lists the files in the directory of a year
+
+    @param self: instance variable of the class, FTPSTransport
+    @param year: the year
+    @return: list of file names
+    '''
+    def listFiles(self, year):
+
+        # Navigating to that years directory in the server
+        self.ftps.cwd(str(year))
+
+        try:
+            return self.ftps.nlst()
+
+        finally:
+            # Changing the directory back from the specific year to the list of years
+            self.ftps.cwd('..')
+
+    '''
+    @archiveSizes: finds the sizes of archives in the directory of a year from one listing of the directory
+
+    @param self: instance variable of the class, FTPSTransport
+    @param year: the year
+    @param file_names: names of the archives in the server
+    @return: dictionary of the names of the archives that were found to their size in bytes
+    '''
+    def archiveSizes(self, year, file_names):
+
+        file_names = set(file_names)
+
+        return {file_name: int(facts['size']) for file_name, facts in self.ftps.mlsd(str(year), facts = ['size']) if file_name in file_names and 'size' in facts}
+
+    '''
+    @fetch: downloads an archive
+
+    @param self: instance variable of the class, FTPSTransport
+    @param year: year of the archive
+    @param file_name: name of the archive in the server
+    @param destination_path: path the archive is downloaded to
+    '''
+    def fetch(self, year, file_name, destination_path):
+
+        partial_path = destination_path + '.partial'
+
+        # Changing directory to the specified year
+        self.ftps.cwd(str(year))
+
+        try:
+            # Downloading the archive under a temporary name that then replaces the archive, so that an archive linked from the mirror is never written over
+            with open(partial_path, 'wb') as download:
+                self.ftps.retrbinary(f'RETR {file_name}', download.write)
+
+            os.replace(partial_path, destination_path)
+
+        finally:
+            # Removing what a failed download left behind
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+            # Changing the directory back from the specific year to the list of years, even if the download failed
+            self.ftps.cwd('..')
+
+    '''
+    @close: closes the connection to the server
+
+    @param self: instance variable of the class, FTPSTransport
+    '''
+    def close(self):
+
+        try:
+            self.ftps.quit()
+
+        except Exception:
+            self.ftps.close()
+
+    '''
+    @get_host: grabs the name of the server
+
+    @param self: instance variable of the class, FTPSTransport
+    @return: name of the server
+    '''
+    def get_host(self):
+        return self.host
+
+    name = property(get_host)
+
+class MirrorTransport:
+
+    '''
+    @__init__: MirrorTransport class constructor, checks that the mirror exists
+
+    @param self: instance variable of the class, MirrorTransport
+    @param mirror_path: path to the local mirror of the VgosDB directory of the server
+    '''
+    def __init__(self, mirror_path = VGOSDB_MIRROR):
+
+        self.mirror_path = mirror_path
+
+        if not os.path.isdir(self.mirror_path):
+            raise FileNotFoundError(f'[Errno 2] No such directory: {self.mirror_path}')
+
+    '''
+    @listFiles: lists the files in the directory of a year
+
+    @param self: instance variable of the class, MirrorTransport
+    @param year: the year
+    @return: list of file names
+    '''
+    def listFiles(self, year):
+        return sorted(os.listdir(os.path.join(self.mirror_path, str(year))))
+
+    '''
+    @archiveSizes: finds the sizes of archives in the directory of a year
+
+    @param self: instance variable of the class, MirrorTransport
+    @param year: the year
+    @param file_names: names of the archives in the mirror
+    @return: dictionary of the names of the archives that were found to their size in bytes
+    '''
+    def archiveSizes(self, year, file_names):
+
+        size_dictionary = {}
+
+        for file_name in file_names:
+            if os.path.isfile(os.path.join(self.mirror_path, str(year), file_name)):
+                size_dictionary[file_name] = os.path.getsize(os.path.join(self.mirror_path, str(year), file_name))
+
+        return size_dictionary
+
+    '''
+    @fetch: links an archive from the mirror into place, or copies it if it cannot be linked (e.g. the mirror is on another file system).
+        A hard link shares the data of the mirrors archive, so nothing is copied and removing the link leaves the mirror untouched. 
+        The other transports download into a new file that replaces the link, rather than writing through it into the mirror
+
+    @param self: instance variable of the class, MirrorTransport
+    @param year: year of the archive
+    @param file_name: name of the archive in the mirror
+    @param destination_path: path the archive is linked or copied to
+    '''
+    def fetch(self, year, file_name, destination_path):
+
+        source_path = os.path.join(self.mirror_path, str(year), file_name)
+
+        if os.path.exists(destination_path):
+            os.remove(destination_path)
+
+        try:
+            os.link(source_path, destination_path)
+
+        except FileNotFoundError:
+            raise
+
+        except OSError:
+            shutil.copyfile(source_path, destination_path)
+
+    '''
+    @close: nothing needs closing for a mirror
+
+    @param self: instance variable of the class, MirrorTransport
+    '''
+    def close(self):
+        pass
+
+    '''
+    @get_mirror_path: grabs the path to the mirror
+
+    @param self: instance variable of the class, MirrorTransport
+    @return: path to the mirror
+    '''
+    def get_mirror_path(self):
+        return self.mirror_path
+
+    name = property(get_mirror_path)
+
+class HTTPSTransport:
+
+    '''
+    @__init__: HTTPSTransport class constructor. Each download thread keeps its connections open between requests (keep-alive), 
+        and large archives are downloaded as byte ranges over several connections at once
+
+    @param self: instance variable of the class, HTTPSTransport
+    @param base_url: URL of the directory of VgosDB's per year
+    @param connections: number of connections an archive is downloaded over at once
+    @param chunk_size: size in bytes of the byte ranges an archive is split into
+    '''
+    def __init__(self, base_url = HTTPS_URL, connections = HTTPS_CONNECTIONS, chunk_size = HTTPS_CHUNK_SIZE):
+
+        self.base_url = base_url if base_url.endswith('/') else base_url + '/'
+        self.connections = max(1, connections)
+        self.chunk_size = chunk_size
+
+        # Cookies set by the server or its login (e.g. the Earthdata login session), sent with every request
+        self.cookie_dictionary = {}
+        self.cookie_lock = threading.Lock()
+
+        # Authorisation header of each host, so that the .netrc file is only read once per host
+        self.authorisation_dictionary = {}
+
+        # Open connections of each thread by scheme and host, and every connection so that they can all be closed
+        self.thread_connections = threading.local()
+        self.connection_list = []
+        self.connection_lock = threading.Lock()
+
+        # Threads that download the byte ranges, kept for the whole run so that their connections are reused
+        self.executor = ThreadPoolExecutor(max_workers = self.connections)
+
+        # Checking that the server can be requested
+        HTTPSTransport.request(self, 'HEAD', self.base_url).read()
+
+    '''
+    @connection: grabs the open connection of this thread to a host, opening one if there is none
+
+    @param self: instance variable of the class, HTTPSTransport
+    @param scheme: http or https
+    @param host: host and port
+    @param reconnect: whether or not to replace the connection, e.g. after the server closed it
+    @return: the connection
+    '''
+    def connection(self, scheme, host, reconnect = False):
+
+        if not hasattr(self.thread_connections, 'dictionary'):
+            self.thread_connections.dictionary = {}
+
+        connection = self.thread_connections.dictionary.get((scheme, host))
+
+        if connection == None or reconnect == True:
+
+            if connection != None:
+                connection.close()
+
+            if scheme == 'https':
+                connection = http.client.HTTPSConnection(host, timeout = HTTPS_TIMEOUT)
+
+            else:
+                connection = http.client.HTTPConnection(host, timeout = HTTPS_TIMEOUT)
+
+            self.thread_connections.dictionary[(scheme, host)] = connection
+
+            with self.connection_lock:
+                self.connection_list.append(connection)
+
+        return connection
+
+    '''
+    @authorisation: grabs the basic authorisation header of a host from the .netrc file of the user, if it has a login for the host
+
+    @param self: instance variable of the class, HTTPSTransport
+    @param host: host name
+    @return: value of the authorisation header, None if there is no login
+    '''
+    def authorisation(self, host):
+
+        if host not in self.authorisation_dictionary:
+
+            try:
+                login = netrc.netrc().authenticators(host)
+
+            except (OSError, netrc.NetrcParseError):
+                login = None
+
+            self.authorisation_dictionary[host] = None if login == None else 'Basic ' + base64.b64encode(f'{login[0]}:{login[2]}'.encode()).decode()
+
+        return self.authorisation_dictionary[host]
+
+    '''
+    @request: sends a request over the open connection of this thread, following redirects (e.g. to and from the Earthdata login)
+
+    @param self: instance variable of the class, HTTPSTransport
+    @param method: GET or HEAD
+    @param url: URL of the request
+    @param headers: dictionary of extra headers, None if there are none
+    @return: the response, whose body must be read before the next request on the connection
+    '''
+    def request(self, method, url, headers = None):
+
+        for redirect in range(HTTPS_REDIRECTS + 1):
+
+            split_url = urlsplit(url)
+            path = split_url.path + ('?' + split_url.query if split_url.query else '')
+
+            request_headers = dict(headers or {})
+
+            with self.cookie_lock:
+                if len(self.cookie_dictionary) != 0:
+                    request_headers['Cookie'] = '; '.join(f'{name}={value}' for name, value in self.cookie_dictionary.items())
+
+            authorisation = HTTPSTransport.authorisation(self, split_url.hostname)
+
+            if authorisation != None and split_url.scheme == 'https':
+                request_headers['Authorization'] = authorisation
+
+            # Requesting again over a new connection if the server closed the kept alive connection
+            for attempt in range(2):
+
+                connection = HTTPSTransport.connection(self, split_url.scheme, split_url.netloc, reconnect = attempt != 0)
+
+                try:
+                    connection.request(method, path, headers = request_headers)
+                    response = connection.getresponse()
+                    break
+
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    if attempt != 0:
+                        raise
+
+            # Keeping the cookies set by the response
+            for header, value in response.getheaders():
+                if header.lower() == 'set-cookie':
+                    name, _, cookie_value = value.split(';')[0].partition('=')
+
+                    with self.cookie_lock:
+                        self.cookie_dictionary[name.strip()] = cookie_value.strip()
+
+            if response.status in (301, 302, 303, 307, 308):
+                response.read()
+                url = urljoin(url, response.getheader('Location'))
+
+                if response.status == 303:
+                    method = 'GET'
+
+                continue
+
+            if response.status >= 400:
+                response.read()
+                raise ConnectionError(f'[HTTP {response.status}] {response.reason}: {url}')
+
+            return response
+
+        raise ConnectionError(f'Too many redirects requesting {url}')
+
+    '''
+    @listFiles: lists the archives in the directory of a year, from either a plain list or the HTML index of the directory
+
+    @param self: instance variable of the class, HTTPSTransport
+    @param year: the year
+    @return: list of file names
+    '''
+    def listFiles(self, year):
+
+        listing = HTTPSTransport.request(self, 'GET', urljoin(self.base_url, f'{year}/')).read().decode('utf-8', errors = 'replace')
+
+        # Names of the archives in the order they are listed, each only once
+        return list(dict.fromkeys(re.findall(r'([\w.\-]+\.tgz)\b', listing)))
+
+    '''
+    @archiveSizes: finds the sizes of archives in the directory of a year, requesting the headers of the archives over the connections of the download threads at once
+
+    @param self: instance variable of the class, HTTPSTransport
+    @param year: the year
+    @param file_names: names of the archives in the server
+    @return: dictionary of the names of the archives that were found to their size in bytes
+    '''
+    def archiveSizes(self, year, file_names):
+
+        future_dictionary = {file_name: self.executor.submit(HTTPSTransport.request, self, 'HEAD', urljoin(self.base_url, f'{year}/{quote(file_name)}')) for file_name in file_names}
+
+        size_dictionary = {}
+
+        for file_name, future in future_dictionary.items():
+
+            # Archives the server does not have are left out
+            try:
+                response = future.result()
+                response.read()
+
+            except ConnectionError:
+                continue
+
+            if response.getheader('Content-Length') != None:
+                size_dictionary[file_name] = int(response.getheader('Content-Length'))
+
+        return size_dictionary
+
+    '''
+    @fetch: downloads an archive. If the server accepts byte ranges and the archive is larger than one chunk, the chunks are 
+        downloaded over several connections at once and written in place, otherwise the archive is downloaded in one stream. 
+        The archive is downloaded under a temporary name that then replaces it, so that an archive linked from the mirror is never written over
+
+    @param self: instance variable of the class, HTTPSTransport
+    @param year: year of the archive
+    @param file_name: name of the archive in the server
+    @param destination_path: path the archive is downloaded to
+    '''
+    def fetch(self, year, file_name, destination_path):
+
+        url = urljoin(self.base_url, f'{year}/{quote(file_name)}')
+        partial_path = destination_path + '.partial'
+
+        # Finding the size of the archive and whether the server accepts byte ranges, downloading in one stream if the server does not answer
+        try:
+            response = HTTPSTransport.request(self, 'HEAD', url)
+            response.read()
+
+            file_size = response.getheader('Content-Length')
+            accepts_ranges = (response.getheader('Accept-Ranges') or '').lower() == 'bytes'
+
+        except ConnectionError:
+            file_size = None
+            accepts_ranges = False
+
+        try:
+            if file_size == None or accepts_ranges == False or int(file_size) <= self.chunk_size or self.connections == 1:
+                HTTPSTransport.fetchStream(self, url, partial_path)
+
+            else:
+                file_size = int(file_size)
+
+                # Making the file its full size, so that each chunk can be written in place
+                with open(partial_path, 'wb') as download:
+                    download.truncate(file_size)
+
+                chunk_list = [(chunk_start, min(chunk_start + self.chunk_size, file_size) - 1) for chunk_start in range(0, file_size, self.chunk_size)]
+
+                # Downloading the chunks over the connections of the download threads, raising the first error once no chunk is still being written
+                future_list = [self.executor.submit(HTTPSTransport.fetchRange, self, url, partial_path, chunk_start, chunk_end) for chunk_start, chunk_end in chunk_list]
+                wait(future_list)
+
+                for future in future_list:
+                    future.result()
+
+            os.replace(partial_path, destination_path)
+
+        finally:
+            # Removing what a failed download left behind
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+    '''
+    @fetchStream: downloads a file in one stream
+
+    @param self: instance variable of the class, HTTPSTransport
+    @param url: URL of the file
+    @param destination_path: path the file is downloaded to
+    '''
+    def fetchStream(self, url, destination_path):
+
+        response = HTTPSTransport.request(self, 'GET', url)
+
+        with open(destination_path, 'wb') as download:
+            for block in iter(lambda: response.read(HTTPS_BLOCK_SIZE), b''):
+                download.write(block)
+
+    '''
+    @fetchRange: downloads a byte range of a file and writes it in place, requesting it again if it fails or is cut short
+
+    @param self: instance variable of the class, HTTPSTransport
+    @param url: URL of the file
+    @param destination_path: path to the file, which is already its full size
+    @param range_start: first byte of the range
+    @param range_end: last byte of the range
+    '''
+    def fetchRange(self, url, destination_path, range_start, range_end):
+
+        for attempt in range(HTTPS_RETRIES + 1):
+
+            try:
+                response = HTTPSTransport.request(self, 'GET', url, {'Range': f'bytes={range_start}-{range_end}'})
+
+                # A server that ignores the range sends the whole file, which can not be written in place
+                if response.status != 206:
+                    response.read()
+                    raise ConnectionError(f'[HTTP {response.status}] The server did not send the requested byte range of {url}')
+
+                received = 0
+
+                with open(destination_path, 'r+b') as download:
+                    download.seek(range_start)
+
+                    for block in iter(lambda: response.read(HTTPS_BLOCK_SIZE), b''):
+                        download.write(block)
+                        received += len(block)
+
+                if received != range_end - range_start + 1:
+                    raise ConnectionError(f'Received {received} of {range_end - range_start + 1} bytes of a byte range of {url}')
+
+                return
+
+            except (OSError, http.client.HTTPException):
+                if attempt == HTTPS_RETRIES:
+                    raise
+
+                # Replacing the connection of this thread, which may be left part way through a response
+                split_url = urlsplit(url)
+                HTTPSTransport.connection(self, split_url.scheme, split_url.netloc, reconnect = True)
+
+    '''
+    @close: closes every connection and stops the download threads
+
+    @param self: instance variable of the class, HTTPSTransport
+    '''
+    def close(self):
+
+        self.executor.shutdown(wait = True)
+
+        with self.connection_lock:
+            for connection in self.connection_list:
+                connection.close()
+
+            self.connection_list = []
+
+    '''
+    @get_base_url: grabs the URL of the directory of VgosDB's
+
+    @param self: instance variable of the class, HTTPSTransport
+    @return: the URL
+    '''
+    def get_base_url(self):
+        return self.base_url
+
+    name = property(get_base_url)
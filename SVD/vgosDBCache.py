@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Keeps the downloaded archives and extracted VgosDB's in the VgosDB folder within a size budget, by removing the least recently used sessions,
+    which are downloaded or extracted again when they are next needed
+'''
+
+import os
+import shutil
+
+# Largest total size in bytes of the archives and extracted VgosDB's in the VgosDB folder, unbounded if None
+VGOSDB_CACHE_SIZE = None
+
+# What is kept of a session that is removed from the cache, either its archive (so it only needs extracting again) or nothing (so it needs downloading again)
+VGOSDB_CACHE_KEEP = 'archive'
+VGOSDB_CACHE_KEEP_OPTIONS = ['archive', 'nothing']
+
+# Multipliers of the size suffixes accepted for the size budget
+SIZE_SUFFIXES = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+class VgosDBCache:
+
+    '''
+    @__init__: VgosDBCache class constructor
+
+    @param self: instance variable of the class, VgosDBCache
+    @param session_state: SessionState of the sessions, which records the paths, sizes and last use of each session
+    @param size_budget: largest total size in bytes of the cached sessions, unbounded if None
+    @param keep: what is kept of a removed session, 'archive' or 'nothing'
+    '''
+    def __init__(self, session_state, size_budget = VGOSDB_CACHE_SIZE, keep = VGOSDB_CACHE_KEEP):
+
+        self.session_state = session_state
+        self.size_budget = size_budget
+        self.keep = keep
+
+        # Whether or not the cache has been reported as over its budget, so that the warning is only displayed once per run
+        self.over_budget_reported = False
+
+    '''
+    @parseSize: reads a size in bytes, or with a K, M, G or T suffix (e.g. 50G)
+
+    @param size: the size as text
+    @return: the size in bytes
+    '''
+    def parseSize(size):
+
+        size = size.strip().upper().removesuffix('B')
+
+        if size[-1:] in SIZE_SUFFIXES:
+            return int(float(size[:-1]) * SIZE_SUFFIXES[size[-1]])
+
+        return int(float(size))
+
+    '''
+    @formatSize: formats a size in bytes with the largest suffix that keeps it at least 1 (e.g. 1.50 G)
+
+    @param size: the size in bytes
+    @return: the size as text
+    '''
+    def formatSize(size):
+
+        for suffix, multiplier in reversed(SIZE_SUFFIXES.items()):
+            if size >= multiplier or multiplier == 1:
+                return f'{size / multiplier:.2f} {suffix}B'
+
+    '''
+    @keepArchive: determines whether or not archives are kept after they are extracted, which is only the case when there is a size budget
+        and removed sessions keep their archive, otherwise archives are removed once extracted as before
+
+    @param self: instance variable of the class, VgosDBCache
+    @return: whether or not to keep archives after extracting them
+    '''
+    def keepArchive(self):
+        return self.size_budget != None and self.keep == 'archive'
+
+    '''
+    @sessionSize: calculates the size of the archive and extracted VgosDB of a session that are still in the VgosDB folder
+
+    @param self: instance variable of the class, VgosDBCache
+    @param session_record: state of the session from SessionState
+    @return: size of the archive and size of the extracted VgosDB in bytes
+    '''
+    def sessionSize(self, session_record):
+
+        archive_size = 0
+        directory_size = 0
+
+        if os.path.isfile(session_record.get('archive_path', '')):
+            archive_size = session_record.get('archive_size', os.path.getsize(session_record['archive_path']))
+
+        if self.session_state.hasReached(session_record, 'extracted') and os.path.isdir(session_record.get('directory_path', '')):
+            directory_size = session_record.get('directory_size', 0)
+
+        return archive_size, directory_size
+
+    '''
+    @enforce: removes the least recently used sessions until the cached sessions fit the size budget
+
+    @param self: instance variable of the class, VgosDBCache
+    @param protected_sessions: names of the sessions that are still needed by the run, which are never removed
+    @return: list of the names of the removed sessions
+    '''
+    def enforce(self, protected_sessions = ()):
+
+        if self.size_budget == None:
+            return []
+
+        protected_sessions = {session.upper() for session in protected_sessions}
+
+        # Sessions from least to most recently used, and the size of each
+        cached_session_list = [(session_record, VgosDBCache.sessionSize(self, session_record)) for session_record in self.session_state.cachedSessions()]
+
+        cache_size = sum(archive_size + directory_size for session_record, (archive_size, directory_size) in cached_session_list)
+
+        removed_session_list = []
+
+        for session_record, (archive_size, directory_size) in cached_session_list:
+
+            if cache_size <= self.size_budget:
+                break
+
+            if session_record['session'] in protected_sessions:
+                continue
+
+            cache_size -= VgosDBCache.evict(self, session_record, archive_size, directory_size)
+            removed_session_list.append(session_record['session'])
+
+        if cache_size > self.size_budget and self.over_budget_reported == False:
+            print(f'Warning! the VgosDB cache is {VgosDBCache.formatSize(cache_size)}, over its budget of {VgosDBCache.formatSize(self.size_budget)}, as the sessions of this run are still needed')
+            self.over_budget_reported = True
+
+        return removed_session_list
+
+    '''
+    @evict: removes the extracted VgosDB of a session, and its archive unless archives are kept
+
+    @param self: instance variable of the class, VgosDBCache
+    @param session_record: state of the session from SessionState
+    @param archive_size: size of the archive of the session in bytes
+    @param directory_size: size of the extracted VgosDB of the session in bytes
+    @return: number of bytes freed
+    '''
+    def evict(self, session_record, archive_size, directory_size):
+
+        session = session_record['session']
+
+        # Keeping the archive if it is in the VgosDB folder and archives are kept
+        if self.keep == 'archive' and archive_size != 0:
+
+            print(f'Removing {session} from the VgosDB cache, keeping its archive...')
+
+            if directory_size != 0:
+                shutil.rmtree(session_record['directory_path'], ignore_errors = True)
+
+            self.session_state.rollBack(session, 'downloaded')
+
+            return directory_size
+
+        print(f'Removing {session} from the VgosDB cache...')
+
+        if directory_size != 0:
+            shutil.rmtree(session_record['directory_path'], ignore_errors = True)
+
+        if archive_size != 0:
+            os.remove(session_record['archive_path'])
+
+        self.session_state.rollBack(session, None)
+
+        return archive_size + directory_size
+
+    '''
+    @get_size_budget: grabs the size budget of the cache
+
+    @param self: instance variable of the class, VgosDBCache
+    @return: largest total size in bytes of the cached sessions, None if unbounded
+    '''
+    def get_size_budget(self):
+        return self.size_budget
+
+    budget = property(get_size_budget)
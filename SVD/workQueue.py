@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Shares the sessions of a run between SVD processes on any number of machines through a folder on shared storage. Each session is
+    claimed by creating its lease file, which is kept fresh while the session is processed and taken over by another process once it expires,
+    and its text file is moved into place only once it is complete, so that a process that crashes only loses the session it was processing
+'''
+
+import os
+import json
+import time
+import uuid
+import shutil
+import socket
+import threading
+from processData import EXTRACTED_DATA_DIRECTORY
+
+# Seconds after the last heartbeat that a lease expires and may be taken over, which must be far longer than the heartbeat interval,
+# and than the difference between the clocks of the machines sharing the queue
+LEASE_TIMEOUT = 300
+
+# Seconds between the heartbeats of a lease, and that a process waits for sessions leased by other processes
+HEARTBEAT_INTERVAL = 30
+
+class WorkQueue:
+
+    '''
+    @__init__: WorkQueue class constructor, which creates the folders of the queue if they do not exist
+
+    @param self: instance variable of the class, WorkQueue
+    @param queue_directory: path to the folder of the queue, on storage shared by every process of the run
+    @param output_directory: path to the folder the text files are moved into once complete
+    @param lease_timeout: seconds after the last heartbeat that a lease expires
+    @param heartbeat_interval: seconds between the heartbeats of a lease
+    '''
+    def __init__(self, queue_directory, output_directory = EXTRACTED_DATA_DIRECTORY, lease_timeout = LEASE_TIMEOUT, heartbeat_interval = HEARTBEAT_INTERVAL):
+
+        self.queue_directory = queue_directory
+        self.output_directory = output_directory
+        self.lease_timeout = lease_timeout
+        self.heartbeat_interval = heartbeat_interval
+
+        # Folders of the lease of each session being processed, and of the result of each session that has been processed
+        self.lease_directory = os.path.join(queue_directory, 'leases')
+        self.result_directory = os.path.join(queue_directory, 'results')
+
+        os.makedirs(self.lease_directory, exist_ok = True)
+        os.makedirs(self.result_directory, exist_ok = True)
+
+        # Name of this process in the leases, which is never reused by another process
+        self.worker_name = f'{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}'
+
+        # Session this process holds the lease of, the event that stops its heartbeat, and whether or not the lease was lost to another process
+        self.leased_session = None
+        self.heartbeat_stop = None
+        self.lease_lost = False
+
+    '''
+    @leasePath: grabs the path to the lease file of a session
+
+    @param self: instance variable of the class, WorkQueue
+    @param session: name of the session
+    @return: path to the lease file
+    '''
+    def leasePath(self, session):
+        return os.path.join(self.lease_directory, session + '.lease')
+
+    '''
+    @resultPath: grabs the path to the result file of a session
+
+    @param self: instance variable of the class, WorkQueue
+    @param session: name of the session
+    @return: path to the result file
+    '''
+    def resultPath(self, session):
+        return os.path.join(self.result_directory, session + '.json')
+
+    '''
+    @stagingDirectory: grabs the path to the folder a lease writes its text file to before it is moved into place, which is in the output folder
+        so that the text file is moved rather than copied
+
+    @param self: instance variable of the class, WorkQueue
+    @param session: name of the session
+    @param worker_name: name of the process holding the lease
+    @return: path to the folder
+    '''
+    def stagingDirectory(self, session, worker_name):
+        return os.path.join(self.output_directory, f'.{session}.{worker_name}')
+
+    '''
+    @readResult: reads the result of a session
+
+    @param self: instance variable of the class, WorkQueue
+    @param session: name of the session
+    @return: the result, None if the session has no result
+    '''
+    def readResult(self, session):
+
+        try:
+            with open(WorkQueue.resultPath(self, session)) as result_file:
+                return json.load(result_file)
+
+        except FileNotFoundError:
+            return None
+
+    '''
+    @readLease: reads the name of the process holding a lease and how long ago its last heartbeat was
+
+    @param lease_path: path to the lease file
+    @return: name of the process and seconds since its last heartbeat, None if there is no lease
+    '''
+    def readLease(lease_path):
+
+        try:
+            with open(lease_path) as lease_file:
+
+                lease_age = time.time() - os.fstat(lease_file.fileno()).st_mtime
+
+                # A lease that is being written is read without a process, and is aged from its modification time like any other lease,
+                # so that a lease left unreadable by a process that stopped while writing it still expires
+                try:
+                    return json.load(lease_file).get('worker'), lease_age
+
+                except ValueError:
+                    return None, lease_age
+
+        except FileNotFoundError:
+            return None
+
+    '''
+    @claim: claims a session by creating its lease file, which only one process can create, or by taking over the lease of another process
+        once it has expired. The heartbeat of the lease is started once it is claimed
+
+    @param self: instance variable of the class, WorkQueue
+    @param session: name of the session
+    @return: whether or not the session was claimed
+    '''
+    def claim(self, session):
+
+        lease_path = WorkQueue.leasePath(self, session)
+
+        lease = WorkQueue.readLease(lease_path)
+
+        if lease != None:
+
+            expired_worker, lease_age = lease
+
+            if lease_age < self.lease_timeout:
+                return False
+
+            # Moving the expired lease aside, which only one process can do. The lease is checked again once it has been moved,
+            # as another process may have taken it over and created a fresh lease in between
+            expired_path = f'{lease_path}.{self.worker_name}.expired'
+
+            try:
+                os.rename(lease_path, expired_path)
+
+            except FileNotFoundError:
+                return False
+
+            if time.time() - os.path.getmtime(expired_path) < self.lease_timeout:
+
+                # Putting the fresh lease back, unless its process has already lost it
+                try:
+                    os.link(expired_path, lease_path)
+
+                except FileExistsError:
+                    pass
+
+                os.remove(expired_path)
+
+                return False
+
+            os.remove(expired_path)
+
+            print(f'The lease of {session} held by {expired_worker} expired, taking it over')
+
+            # Removing the text file the expired process was writing
+            if expired_worker != None:
+                shutil.rmtree(WorkQueue.stagingDirectory(self, session, expired_worker), ignore_errors = True)
+
+        # Creating the lease, which fails if another process created it first
+        try:
+            lease_descriptor = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+
+        except FileExistsError:
+            return False
+
+        with os.fdopen(lease_descriptor, 'w') as lease_file:
+            json.dump({'worker': self.worker_name, 'host': socket.gethostname(), 'pid': os.getpid(), 'claimed_time': time.time()}, lease_file)
+
+        self.leased_session = session
+        self.lease_lost = False
+        self.heartbeat_stop = threading.Event()
+
+        threading.Thread(target = WorkQueue.heartbeat, args = (self, session, self.heartbeat_stop), daemon = True).start()
+
+        return True
+
+    '''
+    @heartbeat: keeps a lease fresh until it is released, and notes if the lease was taken over by another process (e.g. after this process was paused)
+
+    @param self: instance variable of the class, WorkQueue
+    @param session: name of the session
+    @param heartbeat_stop: event that is set when the lease is released
+    '''
+    def heartbeat(self, session, heartbeat_stop):
+
+        lease_path = WorkQueue.leasePath(self, session)
+
+        while heartbeat_stop.wait(self.heartbeat_interval) == False:
+
+            lease = WorkQueue.readLease(lease_path)
+
+            if lease == None or lease[0] != self.worker_name:
+                self.lease_lost = True
+                return
+
+            try:
+                os.utime(lease_path)
+
+            except FileNotFoundError:
+                self.lease_lost = True
+                return
+
+    '''
+    @release: stops the heartbeat of the lease and removes the lease, unless another process has taken it over
+
+    @param self: instance variable of the class, WorkQueue
+    '''
+    def release(self):
+
+        if self.leased_session == None:
+            return
+
+        self.heartbeat_stop.set()
+
+        lease_path = WorkQueue.leasePath(self, self.leased_session)
+        lease = WorkQueue.readLease(lease_path)
+
+        if lease != None and lease[0] == self.worker_name:
+            os.remove(lease_path)
+
+        shutil.rmtree(WorkQueue.stagingDirectory(self, self.leased_session, self.worker_name), ignore_errors = True)
+
+        self.leased_session = None
+
+    '''
+    @commit: moves the text file of the leased session into the output folder and writes its result, each in one step,
+        unless the lease was lost, in which case the process that took it over commits the session instead
+
+    @param self: instance variable of the class, WorkQueue
+    @param outcome: the text file, observing mode, number of observations and status codes of the session if it completed,
+        otherwise the stage and error it failed with
+    @return: the outcome with the path to the text file in the output folder, None if the lease was lost
+    '''
+    def commit(self, outcome):
+
+        session = self.leased_session
+
+        lease = WorkQueue.readLease(WorkQueue.leasePath(self, session))
+
+        if self.lease_lost == True or lease == None or lease[0] != self.worker_name:
+            print(f'The lease of {session} was taken over by another process, so its text file was not kept')
+            return None
+
+        # Moving the text file into place, a session that was already processed with the same options is already there
+        if outcome.get('text_file_path') != None:
+
+            staging_path = os.path.join(WorkQueue.stagingDirectory(self, session, self.worker_name), os.path.basename(outcome['text_file_path']))
+
+            if os.path.exists(staging_path):
+                outcome = {**outcome, 'text_file_path': os.path.join(self.output_directory, os.path.basename(staging_path))}
+                os.replace(staging_path, outcome['text_file_path'])
+
+        result_path = WorkQueue.resultPath(self, session)
+
+        with open(f'{result_path}.{self.worker_name}.partial', 'w') as result_file:
+            json.dump({'session': session, 'worker': self.worker_name, 'finished_time': time.time(), **outcome}, result_file, indent = 1)
+
+        os.replace(f'{result_path}.{self.worker_name}.partial', result_path)
+
+        return outcome
+
+    '''
+    @run: claims and processes sessions until every session has a result, waiting for sessions leased by other processes in case their leases expire.
+        Sessions that completed are never processed again, and sessions that failed are tried again by each process once
+
+    @param self: instance variable of the class, WorkQueue
+    @param session_list: names of the sessions
+    @param process_session: function called with the name of each claimed session and the folder its text file is written to,
+        returning the outcome of the session as for commit
+    @return: dictionary of the sessions processed by this process to their committed outcome
+    '''
+    def run(self, session_list, process_session):
+
+        outcome_dictionary = {}
+
+        # Sessions this process has tried, which it does not try again if they failed
+        tried_session_list = []
+
+        while True:
+
+            # Sessions without a completed result that other processes hold the lease of
+            leased_session_count = 0
+
+            for session in session_list:
+
+                result = WorkQueue.readResult(self, session)
+
+                if session in tried_session_list or (result != None and 'error' not in result):
+                    continue
+
+                if WorkQueue.claim(self, session) == False:
+                    leased_session_count += 1
+                    continue
+
+                tried_session_list.append(session)
+
+                try:
+                    staging_directory = WorkQueue.stagingDirectory(self, session, self.worker_name)
+                    os.makedirs(staging_directory, exist_ok = True)
+
+                    outcome = WorkQueue.commit(self, process_session(session, staging_directory))
+
+                    if outcome != None:
+                        outcome_dictionary[session] = outcome
+
+                finally:
+                    WorkQueue.release(self)
+
+            if leased_session_count == 0:
+                break
+
+            print(f'Waiting for {leased_session_count} session(s) leased by other processes...')
+            time.sleep(self.heartbeat_interval)
+
+        return outcome_dictionary
+
+    '''
+    @get_queue_directory: grabs the path to the folder of the queue
+
+    @param self: instance variable of the class, WorkQueue
+    @return: path to the folder
+    '''
+    def get_queue_directory(self):
+        return self.queue_directory
+
+    '''
+    @get_worker_name: grabs the name of this process in the leases
+
+    @param self: instance variable of the class, WorkQueue
+    @return: name of the process
+    '''
+    def get_worker_name(self):
+        return self.worker_name
+
+    directory = property(get_queue_directory)
+    worker = property(get_worker_name)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Processes sessions in parallel worker processes, which attach to the source and station catalogues shared in memory by this process
+    rather than each reading their own copy, so that the memory used by the catalogues does not grow with the number of workers.
+    Sessions can also be read by separate reader processes, which hand the observations to the workers through shared memory
+'''
+
+import os
+import json
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, Future
+from geodeticData import source_data, station_data, SHARED_CATALOGUE_VARIABLE
+from processData import ProcessSession, EXTRACTED_DATA_DIRECTORY
+from sharedArrays import SharedArrays
+
+# Number of worker processes the sessions are processed in, sessions are processed one at a time in the main process if 1
+WORKER_COUNT = 1
+
+# Number of reader processes the sessions are read in before they are handed to the workers, each worker reads its own sessions if 0
+READER_COUNT = 0
+
+# Number of sessions per worker that are read ahead into shared memory, bounding the memory used when the sessions are read faster than they are processed
+READ_AHEAD = 2
+
+class WorkerPool:
+
+    '''
+    @__init__: WorkerPool class constructor, which shares the catalogues and starts the worker processes
+
+    @param self: instance variable of the class, WorkerPool
+    @param worker_count: number of worker processes
+    @param reader_count: number of reader processes, each worker reads its own sessions if 0
+    '''
+    def __init__(self, worker_count = WORKER_COUNT, reader_count = READER_COUNT):
+
+        # Workers are started rather than forked on every platform, so that they only hold what they import. The executors are created 
+        # before the catalogues are shared, so that invalid counts fail before any shared memory exists, and only start their processes once a session is submitted
+        self.executor = ProcessPoolExecutor(max_workers = worker_count, mp_context = multiprocessing.get_context('spawn'))
+
+        self.reader_executor = None
+
+        # Reading the sessions in separate processes if specified, with only a bounded number of sessions in shared memory at once
+        if reader_count > 0:
+            self.reader_executor = ProcessPoolExecutor(max_workers = reader_count, mp_context = multiprocessing.get_context('spawn'))
+            self.read_ahead = threading.BoundedSemaphore(worker_count * READ_AHEAD)
+
+        # Picking up sources and stations that other SVD processes have added, so that the workers start from the latest catalogues
+        source_data.refresh()
+        station_data.refresh()
+
+        self.shared_catalogue = SharedArrays({**source_data.sharedArrays(), **station_data.sharedArrays()})
+
+        # The workers read the descriptor of the shared catalogues when they first import the catalogues
+        os.environ[SHARED_CATALOGUE_VARIABLE] = json.dumps(self.shared_catalogue.descriptor)
+
+    '''
+    @submit: processes a session in a worker process
+
+    @param self: instance variable of the class, WorkerPool
+    @param session_directory: path to the sessions VgosDB directory
+    @param calculate_projection: whether or not to calculate the projected baseline lengths and angles
+    @param chunk_size: number of observations processed at a time, all observations are processed at once if None
+    @param observation_filter: ObservationFilter of the observations to process, all observations are processed if None
+    @param output_directory: path to the folder the text file is written to
+    @return: future of the ProcessSession of the session
+    '''
+    def submit(self, session_directory, calculate_projection = False, chunk_size = None, observation_filter = None, output_directory = EXTRACTED_DATA_DIRECTORY):
+
+        # Sessions processed in chunks are read by the worker a chunk at a time, so that the memory used stays bounded by the chunk size
+        if self.reader_executor == None or chunk_size != None:
+            return self.executor.submit(ProcessSession, session_directory, calculate_projection, chunk_size, observation_filter, None, output_directory)
+
+        session_future = Future()
+
+        # Waiting for room in shared memory before the session is read
+        self.read_ahead.acquire()
+
+        try:
+            read_future = self.reader_executor.submit(ProcessSession.readSession, session_directory, observation_filter)
+
+        except BaseException:
+            self.read_ahead.release()
+            raise
+
+        read_future.add_done_callback(lambda read_future: WorkerPool.startProcessing(self, read_future, session_future, session_directory, calculate_projection, observation_filter, output_directory))
+
+        return session_future
+
+    '''
+    @startProcessing: hands a session that has been read to the next free worker, sending only the descriptor of its shared memory
+
+    @param self: instance variable of the class, WorkerPool
+    @param read_future: future of the descriptor of the read session
+    @param session_future: future of the ProcessSession of the session
+    @param session_directory: path to the sessions VgosDB directory
+    @param calculate_projection: whether or not to calculate the projected baseline lengths and angles
+    @param observation_filter: ObservationFilter of the observations to process, all observations are processed if None
+    @param output_directory: path to the folder the text file is written to
+    '''
+    def startProcessing(self, read_future, session_future, session_directory, calculate_projection, observation_filter, output_directory):
+
+        try:
+            shared_extract = read_future.result()
+
+        except BaseException as error:
+            self.read_ahead.release()
+            session_future.set_exception(error)
+            return
+
+        try:
+            process_future = self.executor.submit(ProcessSession, session_directory, calculate_projection, None, observation_filter, shared_extract, output_directory)
+
+        # The workers were stopped before the session could be processed
+        except BaseException as error:
+            WorkerPool.finishProcessing(self, None, session_future, shared_extract, error)
+            return
+
+        process_future.add_done_callback(lambda process_future: WorkerPool.finishProcessing(self, process_future, session_future, shared_extract))
+
+    '''
+    @finishProcessing: passes on the outcome of a session processed from shared memory, removing the shared memory if the worker could not
+
+    @param self: instance variable of the class, WorkerPool
+    @param process_future: future of the ProcessSession from the worker, None if the session was never processed
+    @param session_future: future of the ProcessSession of the session
+    @param shared_extract: the descriptor of the shared memory of the session and what has been read
+    @param error: the error that stopped the session from being processed, if it was never processed
+    '''
+    def finishProcessing(self, process_future, session_future, shared_extract, error = None):
+
+        if process_future != None:
+            error = process_future.exception() if process_future.cancelled() == False else Exception('The session was cancelled')
+
+        self.read_ahead.release()
+
+        if error != None:
+            try:
+                SharedArrays.remove(shared_extract['descriptor'])
+
+            # The outcome of the session is still passed on if the shared memory could not be removed
+            except Exception:
+                pass
+
+        if error != None:
+            session_future.set_exception(error)
+
+        else:
+            session_future.set_result(process_future.result())
+
+    '''
+    @close: waits for the workers to finish and removes the shared catalogues
+
+    @param self: instance variable of the class, WorkerPool
+    '''
+    def close(self):
+
+        if self.reader_executor != None:
+            self.reader_executor.shutdown(wait = True, cancel_futures = True)
+
+        self.executor.shutdown(wait = True, cancel_futures = True)
+
+        os.environ.pop(SHARED_CATALOGUE_VARIABLE, None)
+
+        self.shared_catalogue.close()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+'''
+@author: Zachary Allen
+@supervisor: Tiege McCarthy
+@function: Tests that HTTPSTransport downloads archives byte for byte from a local web server that stands in for the CDDIS server,
+    in one stream and as byte ranges over several connections at once
+'''
+
+import io
+import os
+import re
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'SVD'))
+
+from transport import HTTPSTransport
+
+# Size of the byte ranges the archives are split into by the tests, so that a small archive is split into many ranges
+TEST_CHUNK_SIZE = 64 * 1024
+
+# Seconds the server takes to send each byte range, so that the ranges downloaded at once overlap
+RANGE_DELAY = 0.05
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+
+    '''
+    @RangeRequestHandler: serves the files of a folder over keep-alive connections, sending the byte range of a file that is requested (206),
+        or the whole file (200) if the server was set to ignore byte ranges
+    '''
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *arguments):
+        pass
+
+    def send_head(self):
+
+        file_path = self.translate_path(self.path)
+
+        if os.path.isdir(file_path) or not os.path.isfile(file_path):
+            return super().send_head()
+
+        with open(file_path, 'rb') as file:
+            contents = file.read()
+
+        range_match = re.fullmatch(r'bytes=(\d+)-(\d+)', self.headers.get('Range', ''))
+
+        # Noting the range requests, the connections they came over and how many were being sent at once
+        if range_match != None and self.server.ignore_ranges == False:
+
+            range_start, range_end = int(range_match[1]), min(int(range_match[2]), len(contents) - 1)
+
+            with self.server.count_lock:
+                self.server.range_requests += 1
+                self.server.client_ports.add(self.client_address[1])
+                self.server.active_ranges += 1
+                self.server.most_active_ranges = max(self.server.most_active_ranges, self.server.active_ranges)
+
+            time.sleep(RANGE_DELAY)
+
+            with self.server.count_lock:
+                self.server.active_ranges -= 1
+
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {range_start}-{range_end}/{len(contents)}')
+            contents = contents[range_start:range_end + 1]
+
+        else:
+            self.send_response(200)
+
+        self.send_header('Content-Length', str(len(contents)))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+
+        return io.BytesIO(contents)
+
+class TestHTTPSTransport(unittest.TestCase):
+
+    def setUp(self):
+
+        self.served_directory = tempfile.mkdtemp()
+        self.download_directory = tempfile.mkdtemp()
+
+        os.makedirs(os.path.join(self.served_directory, '2020'))
+
+        # Archive of random bytes that is not a whole number of byte ranges long
+        self.archive_contents = os.urandom(TEST_CHUNK_SIZE * 10 + 1234)
+
+        with open(os.path.join(self.served_directory, '2020', '20JAN09VG.tgz'), 'wb') as archive:
+            archive.write(self.archive_contents)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), partial(RangeRequestHandler, directory = self.served_directory))
+        self.server.daemon_threads = True
+        self.server.ignore_ranges = False
+        self.server.count_lock = threading.Lock()
+        self.server.range_requests = 0
+        self.server.client_ports = set()
+        self.server.active_ranges = 0
+        self.server.most_active_ranges = 0
+
+        threading.Thread(target = self.server.serve_forever, daemon = True).start()
+
+        self.transport = HTTPSTransport(f'http://127.0.0.1:{self.server.server_address[1]}/', connections = 4, chunk_size = TEST_CHUNK_SIZE)
+
+    def tearDown(self):
+
+        self.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+        shutil.rmtree(self.served_directory, ignore_errors = True)
+        shutil.rmtree(self.download_directory, ignore_errors = True)
+
+    def readDownload(self, destination_path):
+
+        with open(destination_path, 'rb') as download:
+            return download.read()
+
+    def test_fetch_parallel_ranges(self):
+
+        destination_path = os.path.join(self.download_directory, '20200109-VO0009.tgz')
+
+        self.transport.fetch(2020, '20JAN09VG.tgz', destination_path)
+
+        self.assertEqual(self.readDownload(destination_path), self.archive_contents)
+
+        # Every byte range was requested once, over more than one connection, with more than one range being sent at once
+        self.assertEqual(self.server.range_requests, 11)
+        self.assertGreater(len(self.server.client_ports), 1)
+        self.assertGreater(self.server.most_active_ranges, 1)
+
+    def test_fetch_stream(self):
+
+        destination_path = os.path.join(self.download_directory, '20200109-VO0009.tgz')
+
+        # An archive no larger than one byte range is downloaded in one stream
+        self.transport.chunk_size = len(self.archive_contents)
+        self.transport.fetch(2020, '20JAN09VG.tgz', destination_path)
+
+        self.assertEqual(self.readDownload(destination_path), self.archive_contents)
+        self.assertEqual(self.server.range_requests, 0)
+
+    def test_fetch_range(self):
+
+        destination_path = os.path.join(self.download_directory, '20200109-VO0009.tgz')
+
+        with open(destination_path, 'wb') as download:
+            download.truncate(len(self.archive_contents))
+
+        # A byte range is written in place, leaving the rest of the file as it was
+        self.transport.fetchRange(f'{self.transport.name}2020/20JAN09VG.tgz', destination_path, TEST_CHUNK_SIZE, 2 * TEST_CHUNK_SIZE - 1)
+
+        download = self.readDownload(destination_path)
+
+        self.assertEqual(download[TEST_CHUNK_SIZE:2 * TEST_CHUNK_SIZE], self.archive_contents[TEST_CHUNK_SIZE:2 * TEST_CHUNK_SIZE])
+        self.assertEqual(download[:TEST_CHUNK_SIZE], bytes(TEST_CHUNK_SIZE))
+        self.assertEqual(download[2 * TEST_CHUNK_SIZE:], bytes(len(self.archive_contents) - 2 * TEST_CHUNK_SIZE))
+
+    def test_fetch_range_ignored(self):
+
+        destination_path = os.path.join(self.download_directory, '20200109-VO0009.tgz')
+
+        # A server that advertises byte ranges but sends the whole file is refused, rather than the file being written at the wrong place
+        self.server.ignore_ranges = True
+
+        with self.assertRaisesRegex(ConnectionError, 'did not send the requested byte range'):
+            self.transport.fetch(2020, '20JAN09VG.tgz', destination_path)
+
+        self.assertFalse(os.path.exists(destination_path + '.partial'))
+
+    def test_fetch_over_mirror_link(self):
+
+        destination_path = os.path.join(self.download_directory, '20200109-VO0009.tgz')
+        mirror_path = os.path.join(self.download_directory, 'mirror.tgz')
+        mirror_contents = os.urandom(TEST_CHUNK_SIZE * 3)
+
+        # An archive kept from a mirror is a hard link to the archive of the mirror
+        with open(mirror_path, 'wb') as mirror_archive:
+            mirror_archive.write(mirror_contents)
+
+        os.link(mirror_path, destination_path)
+
+        # Downloading the archive again replaces the link rather than writing through it, whether or not the download fails
+        self.server.ignore_ranges = True
+
+        with self.assertRaises(ConnectionError):
+            self.transport.fetch(2020, '20JAN09VG.tgz', destination_path)
+
+        self.assertEqual(self.readDownload(mirror_path), mirror_contents)
+
+        self.server.ignore_ranges = False
+        self.transport.fetch(2020, '20JAN09VG.tgz', destination_path)
+
+        self.assertEqual(self.readDownload(destination_path), self.archive_contents)
+        self.assertEqual(self.readDownload(mirror_path), mirror_contents)
+
+if __name__ == '__main__':
+    unittest.main()